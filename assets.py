@@ -0,0 +1,204 @@
+# assets.py
+#
+# 정적 에셋(로고 등) 레지스트리.
+# 각 파일은 프로세스당 한 번만 읽어 SHA-1 해시로 식별하고, 페이지에는 다음 중 하나로 넣습니다.
+#   - 작은 파일(INLINE_MAX_BYTES 이하): data URI로 인라인
+#   - 큰 파일: Streamlit 정적 파일 서빙 URL (app/static/...?v=<해시>)
+#
+# Streamlit의 정적 파일 핸들러(starlette)는 Cache-Control을 붙이지 않습니다. 장기 캐시는 serve.py로 띄울 때
+# BundleMiddleware가 ?v= 인자가 붙은 요청과 번들 요청에 붙이는 immutable 헤더(1년)로 받으며,
+# 해시가 주소에 들어 있으므로 파일이 바뀌면 주소도 바뀌어 새로 받습니다.
+# (streamlit run app.py 로 띄우면 ETag/Last-Modified에 따른 조건부 요청만 이루어집니다.)
+# .streamlit/config.toml 에서 server.enableStaticServing 이 꺼져 있으면 항상 data URI를 사용합니다.
+#
+# 대회 배경 이미지는 build_images.py가 만든 변형 중 카드 크기에 맞는 가장 작은 것을 고릅니다.
+#
+# bundle.py로 만든 번들에 같은 내용의 파일이 있으면 정적 파일 URL 대신 번들 주소
+# (app/static/bundle/<이름>.<해시>.<확장자>)를 사용합니다.
+
+import base64
+import hashlib
+import json
+import mimetypes
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+import streamlit as st
+
+from bundle import STYLESHEET_KEY, bundle_url, load_bundle_manifest
+from css_build import load_stylesheet_manifest
+from singleflight import SingleFlight
+
+STATIC_DIR = Path(__file__).parent / "static"
+STATIC_URL_PREFIX = "app/static"
+
+# 이 크기 이하의 파일만 data URI로 인라인합니다.
+INLINE_MAX_BYTES = 4 * 1024
+
+# build_images.py가 만드는 배경 이미지 변형 매니페스트
+IMAGE_MANIFEST_FILE = STATIC_DIR / "images" / "variants" / "manifest.json"
+
+# 카드 배경에 사용할 형식 (선호 순서).
+# Streamlit 정적 파일 핸들러는 파일 확장자(mimetypes)로 Content-Type을 정하므로 .avif는 image/avif로 갑니다.
+# image-set()의 type()을 보고 브라우저가 지원하는 첫 형식을 고르며, 빌드되지 않은 형식은 건너뜁니다.
+BACKGROUND_FORMATS = ("avif", "webp")
+BACKGROUND_FALLBACK_FORMAT = "jpg"
+
+Asset = namedtuple("Asset", ["path", "sha1", "size", "mime", "data"])
+
+
+class AssetRegistry:
+    """파일 경로 → Asset 을 한 번만 읽어 보관하는 레지스트리"""
+
+    def __init__(self, static_dir=STATIC_DIR, inline_max_bytes=INLINE_MAX_BYTES):
+        self.static_dir = Path(static_dir).resolve()
+        self.inline_max_bytes = inline_max_bytes
+        self._assets = {}
+        self._encoded = {}  # sha1 → Base64 문자열
+        self._image_manifest = None
+        # 정적 내보내기(export_site.py)처럼 Streamlit 서버 밖에서 쓸 때는 True로 두어
+        # 설정과 관계없이 항상 정적 파일 URL을 사용합니다.
+        self.force_static_urls = False
+        self._lock = threading.Lock()
+        # 같은 파일을 여러 세션이 동시에 처음 요청해도 읽기와 Base64 인코딩은 한 번만 합니다.
+        self._flight = SingleFlight()
+
+    def get(self, file_path):
+        """Asset을 반환하는 함수 (파일이 없으면 None)"""
+        path = Path(file_path).resolve()
+        asset = self._assets.get(path)
+        if asset is not None:
+            return asset
+        return self._flight.do(("read", path), lambda: self._read(path))
+
+    def _read(self, path):
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        mime = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        asset = Asset(path, hashlib.sha1(data).hexdigest(), len(data), mime, data)
+        with self._lock:
+            return self._assets.setdefault(path, asset)
+
+    def base64(self, file_path):
+        asset = self.get(file_path)
+        if asset is None:
+            return None
+        encoded = self._encoded.get(asset.sha1)
+        if encoded is None:
+            encoded = self._flight.do(("base64", asset.sha1), lambda: self._encoded.setdefault(
+                asset.sha1, base64.b64encode(asset.data).decode()))
+        return encoded
+
+    def data_uri(self, file_path):
+        asset = self.get(file_path)
+        return f"data:{asset.mime};base64,{self.base64(file_path)}" if asset else None
+
+    def static_url(self, file_path):
+        """정적 파일 서빙 URL (static/ 밖의 파일이면 None)"""
+        asset = self.get(file_path)
+        if asset is None:
+            return None
+        try:
+            relative = asset.path.relative_to(self.static_dir).as_posix()
+        except ValueError:
+            return None
+        return bundle_url(relative, asset.sha1) or f"{STATIC_URL_PREFIX}/{relative}?v={asset.sha1[:12]}"
+
+    def stylesheet_url(self, file_path):
+        """빌드된 스타일시트 주소 (번들, css_build.py가 만든 static/css/ 순으로 찾음)
+
+        빌드된 것이 없거나, 원본이 바뀌었거나, 정적 서빙이 꺼져 있으면 None을 반환합니다.
+        """
+        if not self._static_urls_enabled():
+            return None
+        try:
+            source_sha1 = hashlib.sha1(Path(file_path).read_bytes()).hexdigest()
+        except FileNotFoundError:
+            return None
+        entry = load_bundle_manifest().get(STYLESHEET_KEY)
+        if entry is not None and entry.get("source_sha1") == source_sha1:
+            return bundle_url(STYLESHEET_KEY)
+        built = load_stylesheet_manifest()
+        if built.get("source_sha1") == source_sha1:
+            return f"{STATIC_URL_PREFIX}/css/{built['file']}?v={built['sha1']}"
+        return None
+
+    def src(self, file_path):
+        """<img src>나 CSS url()에 넣을 주소를 반환하는 함수"""
+        asset = self.get(file_path)
+        if asset is None:
+            return None
+        if asset.size > self.inline_max_bytes and self._static_urls_enabled():
+            url = self.static_url(file_path)
+            if url:
+                return url
+        return self.data_uri(file_path)
+
+
+    def _static_urls_enabled(self):
+        return self.force_static_urls or _static_serving_enabled()
+
+    # --- 배경 이미지 변형 ---
+
+    @property
+    def image_manifest(self):
+        """build_images.py가 만든 변형 매니페스트 (없으면 빈 dict)"""
+        if self._image_manifest is None:
+            try:
+                self._image_manifest = json.loads(IMAGE_MANIFEST_FILE.read_text(encoding="utf-8"))
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._image_manifest = {}
+        return self._image_manifest
+
+    def pick_variant(self, name, display_width, fmt):
+        """display_width 이상인 변형 중 가장 작은 것 (없으면 가장 큰 것)"""
+        variants = [v for v in self.image_manifest.get(name, {}).get("variants", []) if v["format"] == fmt]
+        if not variants:
+            return None
+        fitting = [v for v in variants if v["width"] >= display_width]
+        return min(fitting, key=lambda v: v["width"]) if fitting else max(variants, key=lambda v: v["width"])
+
+    def background_image_css(self, name, display_width):
+        """카드 배경용 인라인 CSS (변형이 없거나 정적 서빙이 꺼져 있으면 None)
+
+        1x/2x 화면에 맞는 변형을 image-set()으로 고르고, image-set()을 모르는 브라우저는
+        앞에 선언한 JPEG url()을 사용합니다.
+        """
+        if not self.image_manifest.get(name) or not self._static_urls_enabled():
+            return None
+
+        def url(variant):
+            return bundle_url(variant["path"], variant["sha1"]) or f"{STATIC_URL_PREFIX}/{variant['path']}?v={variant['sha1']}"
+
+        declarations = []
+        fallback = self.pick_variant(name, display_width, BACKGROUND_FALLBACK_FORMAT)
+        if fallback:
+            declarations.append(f"background-image: url('{url(fallback)}');")
+
+        options = []
+        for fmt in BACKGROUND_FORMATS + (BACKGROUND_FALLBACK_FORMAT,):
+            picked = []
+            for density in (1, 2):
+                variant = self.pick_variant(name, display_width * density, fmt)
+                if variant and variant not in picked:
+                    picked.append(variant)
+                    options.append(f"url('{url(variant)}') type('{variant['mime']}') {density}x")
+        if options:
+            declarations.append(f"background-image: image-set({', '.join(options)});")
+        return " ".join(declarations) or None
+
+
+def _static_serving_enabled():
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except RuntimeError:
+        return False
+
+
+@st.cache_resource
+def get_asset_registry():
+    """프로세스 전체에서 공유하는 에셋 레지스트리"""
+    return AssetRegistry()
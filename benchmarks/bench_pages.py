@@ -0,0 +1,283 @@
+# benchmarks/bench_pages.py
+#
+# 합성 콘텐츠로 각 페이지의 rerun 비용을 재는 헤드리스 벤치마크.
+# Streamlit의 AppTest로 app.py / pages/1_Tournaments.py / pages/2_Levels.py를 직접 실행하고,
+# 시나리오(목록, 상세, 대회 필터, 검색, 정렬)마다 다음을 기록합니다.
+#   - rerun 시간 (첫 실행과 이어지는 rerun들의 중앙값/최댓값)
+#   - 델타(요소) 개수와 요소 프로토 바이트 합계 (브라우저로 보내는 양의 근사치)
+#   - rerun 중 최대 메모리 사용량 (tracemalloc)
+#
+# 사용법:
+#   python benchmarks/bench_pages.py [--sizes small,medium,large] [--reruns 5]
+#                                    [--output build/bench/pages.json]
+#                                    [--baseline 이전결과.json] [--threshold 1.25]
+# --baseline을 주면 같은 (크기, 시나리오)의 값이 threshold배를 넘게 나빠졌을 때 목록을 출력하고 1을 반환합니다.
+#
+# 콘텐츠 크기마다 별도 프로세스에서 실행합니다. (프로세스 전역 캐시와 콘텐츠 경로가 섞이지 않도록)
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT = ROOT_DIR / 'build' / 'bench' / 'pages.json'
+
+# 이름 → (대회 수, 레벨 수)
+SIZES = {
+    'small': (5, 10),
+    'medium': (5, 1000),
+    'large': (100, 10000),
+}
+
+# 비교할 지표와, 회귀로 보지 않을 최소 차이 (작은 값의 흔들림 무시)
+COMPARED_METRICS = {
+    'rerun_median_ms': 5.0,
+    'deltas': 0,
+    'payload_bytes': 1024,
+    'peak_memory_kb': 512,
+}
+
+# 합성 제목에 섞어 쓰는 유니코드 조각 (한글, 혼동 문자, 전각, 일본어, 이모지 등)
+TITLE_WORDS = ('∀nnihilation', 'LΛ8YRИTH', '다밍의 꿈', 'Ｓｅｒｒａｔｅ', '星の海', 'Chaos-Rybdis', 'Ωmega',
+               'Pure Black', '무지개 🌈', 'Ẽxtrème', '紅蓮', 'Static Stellarium')
+ARTISTS = ('Riya', 'Sydosys', '다밍', 'Camellia', 'かめりあ', 'Ψ Project', 'Nhato')
+CREATORS = ('AWC Chart Team 《Aisa》', 'Nephy', 'Pharah', '플래시', 'Ж-Team')
+
+TOURNAMENT_TEMPLATE = """title: "ADOFAI World Cup {year} «{i}»"
+minititle: "AWC {year}-{i}"
+year: "{year}"
+status: "종료됨"
+dates:
+  - label: "등록"
+    value: "TBD"
+prize_pool: "TBD"
+organizer: "ADOFAI.gg"
+players: "TBD"
+shortcut_links:
+  - label: "규칙"
+    url: "https://example.com/rules/{i}"
+    icon: "📜"
+  - label: "디스코드"
+    url: "https://example.com/discord"
+    icon: "💬"
+youtube_video_id: "UsGw9Q5gO3k"
+description: |
+  <h2>합성 대회 {i}</h2>
+"""
+
+LEVEL_TEMPLATE = """title: "{title}"
+artist: "{artist}"
+tournament_id: "{tournament_id}"
+minititle: "AWC {year}"
+creator: "{creator}"
+detail_creator: Nephy, Pharah, 다밍
+difficulty_rating: "{difficulty:.1f}"
+bpm: {bpm}
+tiles: {tiles}
+youtube_video_id: "Vf3csTYW3-U"
+download_url: https://api.adofai.gg/forum/v1/levels/{i}/file
+"""
+
+
+# --- 합성 콘텐츠 ---
+
+def make_synthetic_content(content_dir, tournament_count, level_count):
+    """tournaments/와 levels/에 합성 YAML을 만드는 함수"""
+    tournaments_dir = Path(content_dir) / 'tournaments'
+    levels_dir = Path(content_dir) / 'levels'
+    tournaments_dir.mkdir(parents=True)
+    levels_dir.mkdir(parents=True)
+
+    tournament_ids = []
+    for i in range(tournament_count):
+        tournament_id = f'awc{2000 + i}'
+        tournament_ids.append(tournament_id)
+        (tournaments_dir / f'{tournament_id}.yaml').write_text(
+            TOURNAMENT_TEMPLATE.format(i=i, year=2000 + i), encoding='utf-8')
+
+    for i in range(level_count):
+        tournament_id = tournament_ids[i % tournament_count]
+        (levels_dir / f'level_{i:05d}.yaml').write_text(LEVEL_TEMPLATE.format(
+            i=i,
+            title=f'{TITLE_WORDS[i % len(TITLE_WORDS)]} {TITLE_WORDS[i * 7 % len(TITLE_WORDS)]} {i}',
+            artist=ARTISTS[i % len(ARTISTS)],
+            creator=CREATORS[i % len(CREATORS)],
+            tournament_id=tournament_id,
+            year=tournament_id[3:],
+            difficulty=15 + (i * 13 % 80) / 10,
+            bpm=100 + i * 37 % 250,
+            tiles=500 + i * 7 % 6000,
+        ), encoding='utf-8')
+    return tournament_ids
+
+
+# --- 측정 (워커 프로세스) ---
+
+def _walk(node):
+    yield node
+    for child in getattr(node, 'children', {}).values():
+        yield from _walk(child)
+
+def _tree_stats(at):
+    elements = [node for node in _walk(at._tree) if getattr(node, 'proto', None) is not None]
+    return len(elements), sum(node.proto.ByteSize() for node in elements)
+
+def _timed_run(at, action=None):
+    started = time.perf_counter()
+    (action(at) if action else at).run()
+    elapsed = (time.perf_counter() - started) * 1000
+    if at.exception:
+        raise RuntimeError(f'페이지 실행 중 예외: {at.exception[0].value}')
+    return elapsed
+
+def _fresh_app(script, query_params, action):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT_DIR / script), default_timeout=120)
+    for key, value in (query_params or {}).items():
+        at.query_params[key] = value
+    if action is not None:
+        at.run()
+    return at
+
+def run_scenario(script, query_params=None, action=None, reruns=5):
+    """시나리오 하나를 실행해 지표 dict를 반환하는 함수
+
+    action이 없으면 같은 페이지를 다시 실행하는 시간을, 있으면 위젯 조작 후 rerun 시간을 잽니다.
+    tracemalloc은 실행을 크게 느리게 하므로 시간 측정이 끝난 뒤 한 번 더 실행해서 메모리만 잽니다.
+    """
+    at = _fresh_app(script, query_params, action)
+    first_ms = _timed_run(at, action)
+
+    timings = []
+    for _ in range(reruns):
+        if action is not None:
+            # 매번 같은 조작이 새로 일어나도록 처음 상태에서 시작합니다.
+            at = _fresh_app(script, query_params, action)
+        timings.append(_timed_run(at, action))
+    deltas, payload = _tree_stats(at)
+
+    at = _fresh_app(script, query_params, action)
+    tracemalloc.start()
+    _timed_run(at, action)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'first_run_ms': round(first_ms, 2),
+        'rerun_median_ms': round(statistics.median(timings), 2),
+        'rerun_max_ms': round(max(timings), 2),
+        'deltas': deltas,
+        'payload_bytes': payload,
+        'peak_memory_kb': round(peak / 1024),
+    }
+
+def scenarios(tournament_ids, first_level_id, first_tournament_title):
+    return {
+        'home': ('app.py', None, None),
+        'tournaments_list': ('pages/1_Tournaments.py', None, None),
+        'tournament_detail': ('pages/1_Tournaments.py', {'id': tournament_ids[0]}, None),
+        'levels_list': ('pages/2_Levels.py', None, None),
+        'level_detail': ('pages/2_Levels.py', {'id': first_level_id}, None),
+        'levels_filter': ('pages/2_Levels.py', None,
+                          lambda at: at.selectbox(key='tournament_filter').select(first_tournament_title)),
+        'levels_search': ('pages/2_Levels.py', None, lambda at: at.text_input[0].input('다밍')),
+        'levels_search_confusable': ('pages/2_Levels.py', None, lambda at: at.text_input[0].input('labyr')),
+        'levels_sort': ('pages/2_Levels.py', None,
+                        lambda at: at.multiselect(key='level_sort').select('난이도 높은순').select('BPM 낮은순')),
+        'levels_range': ('pages/2_Levels.py', None,
+                         lambda at: at.slider(key='level_range_difficulty').set_range(20.0, 21.0)),
+    }
+
+def worker(size_name, content_dir, reruns):
+    """AWC_CONTENT_DIR이 설정된 자식 프로세스에서 모든 시나리오를 실행하는 함수"""
+    os.chdir(ROOT_DIR)  # 페이지가 style.css 등을 상대 경로로 읽습니다.
+    sys.path.insert(0, str(ROOT_DIR))
+    from content_build import list_sources, parse_tournament
+
+    sources = list_sources(content_dir)
+    tournaments = [parse_tournament(p, p.read_bytes()) for p in sources['tournaments']]
+    first_level_id = sources['levels'][0].stem
+
+    results = {}
+    for name, (script, query_params, action) in scenarios(
+            [t.id for t in tournaments], first_level_id, tournaments[0].title).items():
+        results[name] = run_scenario(script, query_params, action, reruns)
+        print(f'  [{size_name}] {name:26s} {results[name]["rerun_median_ms"]:8.1f} ms  '
+              f'델타 {results[name]["deltas"]:4d}  {results[name]["payload_bytes"]:>9,} B', file=sys.stderr)
+    return results
+
+
+# --- 실행 / 비교 ---
+
+def compare(current, baseline, threshold):
+    """baseline보다 threshold배 넘게 나빠진 지표 목록을 반환하는 함수"""
+    regressions = []
+    for size_name, size_results in current['results'].items():
+        for scenario, metrics in size_results.items():
+            previous = baseline.get('results', {}).get(size_name, {}).get(scenario)
+            if not previous:
+                continue
+            for metric, slack in COMPARED_METRICS.items():
+                old, new = previous.get(metric), metrics.get(metric)
+                if old is None or new is None:
+                    continue
+                if new > old * threshold and new - old > slack:
+                    regressions.append(f'{size_name}/{scenario}/{metric}: {old} → {new}')
+    return regressions
+
+def _arg(argv, name, default):
+    return argv[argv.index(name) + 1] if name in argv else default
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    if argv and argv[0] == '--worker':
+        size_name, content_dir, reruns = argv[1], argv[2], int(argv[3])
+        print(json.dumps(worker(size_name, content_dir, reruns), ensure_ascii=False))
+        return 0
+
+    sizes = _arg(argv, '--sizes', ','.join(SIZES)).split(',')
+    reruns = int(_arg(argv, '--reruns', 5))
+    output = Path(_arg(argv, '--output', DEFAULT_OUTPUT))
+    baseline_file = _arg(argv, '--baseline', None)
+    threshold = float(_arg(argv, '--threshold', 1.25))
+
+    report = {'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'reruns': reruns, 'sizes': {}, 'results': {}}
+    for size_name in sizes:
+        tournament_count, level_count = SIZES[size_name]
+        with tempfile.TemporaryDirectory() as tmp:
+            content_dir = Path(tmp) / 'content'
+            make_synthetic_content(content_dir, tournament_count, level_count)
+            env = dict(os.environ, AWC_CONTENT_DIR=str(content_dir), AWC_SNAPSHOT_FILE=str(Path(tmp) / 'snapshot.pickle'))
+            print(f'{size_name}: 대회 {tournament_count}개, 레벨 {level_count}개', file=sys.stderr)
+            completed = subprocess.run(
+                [sys.executable, __file__, '--worker', size_name, str(content_dir), str(reruns)],
+                env=env, stdout=subprocess.PIPE, check=True)
+        report['sizes'][size_name] = {'tournaments': tournament_count, 'levels': level_count}
+        report['results'][size_name] = json.loads(completed.stdout.decode('utf-8').strip().splitlines()[-1])
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f'결과 저장: {output}')
+
+    if baseline_file:
+        baseline = json.loads(Path(baseline_file).read_text(encoding='utf-8'))
+        regressions = compare(report, baseline, threshold)
+        if regressions:
+            print(f'성능 회귀 {len(regressions)}건 (기준 x{threshold}):')
+            for line in regressions:
+                print(f'  {line}')
+            return 1
+        print(f'기준 결과 대비 회귀 없음 (기준 x{threshold})')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
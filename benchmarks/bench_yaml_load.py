@@ -0,0 +1,88 @@
+# benchmarks/bench_yaml_load.py
+#
+# 합성 레벨 YAML 파일로 콘텐츠 로딩 속도를 비교하는 벤치마크.
+#   1) 순수 파이썬 SafeLoader, 순차 파싱 (기존 방식)
+#   2) libyaml CSafeLoader, 순차 파싱
+#   3) libyaml CSafeLoader, 프로세스 풀 병렬 파싱
+#
+# 사용법:  python benchmarks/bench_yaml_load.py [레벨 개수=5000]
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import content_build
+from content_build import list_sources, parse_many
+
+LEVEL_TEMPLATE = """title: "Synthetic Level {i}"
+artist: "Artist {artist}"
+tournament_id: "awc{year}"
+minititle: "AWC{year}"
+creator: "AWC Chart Team 《Creator {creator}》"
+
+# 목록 페이지 표시용
+detail_creator: Nephy, Pharah, 다밍
+
+difficulty_rating: "{difficulty:.1f}"
+bpm: {bpm}
+tiles: {tiles}
+
+# 상세 페이지 표시용
+youtube_video_id: "Vf3csTYW3-U"
+download_url: https://api.adofai.gg/forum/v1/levels/{i}/file
+"""
+
+
+def make_synthetic_content(content_dir, level_count):
+    levels_dir = Path(content_dir) / 'levels'
+    levels_dir.mkdir(parents=True)
+    for i in range(level_count):
+        (levels_dir / f'level_{i:05d}.yaml').write_text(LEVEL_TEMPLATE.format(
+            i=i,
+            artist=i % 97,
+            creator=i % 31,
+            year=2023 + i % 4,
+            difficulty=15 + (i % 70) / 10,
+            bpm=120 + i % 200,
+            tiles=500 + i * 7 % 3000,
+        ), encoding='utf-8')
+
+
+def time_load(content_dir, loader, max_workers):
+    content_build.YAML_LOADER = loader
+    started = time.perf_counter()
+    jobs = [('levels', path, path.read_bytes()) for path in list_sources(content_dir)['levels']]
+    results = parse_many(jobs, max_workers=max_workers)
+    elapsed = time.perf_counter() - started
+    assert all(error is None for _, error in results)
+    return elapsed, [record for record, _ in results]
+
+
+def main():
+    level_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    workers = min(content_build.MAX_WORKERS, os.cpu_count() or 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_synthetic_content(tmp, level_count)
+        print(f'합성 레벨 {level_count}개, 워커 {workers}개')
+
+        baseline, expected = time_load(tmp, yaml.SafeLoader, max_workers=1)
+        print(f'  SafeLoader  순차: {baseline:7.3f}초')
+
+        if not hasattr(yaml, 'CSafeLoader'):
+            print('  libyaml이 없어 CSafeLoader 측정을 건너뜁니다.')
+            return
+
+        for label, max_workers in (('순차', 1), ('병렬', workers)):
+            elapsed, records = time_load(tmp, yaml.CSafeLoader, max_workers=max_workers)
+            assert records == expected, 'CSafeLoader 결과가 SafeLoader와 다릅니다'
+            print(f'  CSafeLoader {label}: {elapsed:7.3f}초  (x{baseline / elapsed:.1f})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+# benchmarks/load_sessions.py
+#
+# 동시 접속 부하 테스트. 실제 앱 서버(streamlit run)를 띄우고, 브라우저 대신 웹소켓(/_stcore/stream)으로
+# N개의 세션을 동시에 열어 실제 관람객처럼 다음 순서로 이동합니다.
+#   홈 → 대회 상세 → 레벨 목록 → 레벨 검색 → 레벨 상세
+# (검색 위젯이 fragment 안에 있으면 브라우저처럼 그 fragment만 다시 실행하도록 요청합니다)
+# 세션 수를 늘려 가며 다음을 기록합니다.
+#   - rerun 지연 시간 p50/p99 (rerun_script 전송 → script_finished 수신)
+#   - 처리량 (초당 rerun 수)
+#   - 서버 RSS 증가량 (세션당)
+# 한 프로세스가 이 페이지들로 버틸 수 있는 동시 세션 수를 가늠하는 용도입니다.
+#
+# 사용법:
+#   python benchmarks/load_sessions.py [--sessions 1,5,10,25,50] [--rounds 3]
+#                                      [--levels 1000 --tournaments 5] [--port 8599]
+#                                      [--output build/bench/sessions.json]
+# --levels를 주면 합성 콘텐츠(bench_pages.py와 같은 생성기)로, 주지 않으면 content/로 서버를 띄웁니다.
+# 서버 메모리는 /proc에서 읽으므로 RSS 측정은 Linux에서만 됩니다.
+
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+from benchmarks.bench_pages import make_synthetic_content
+from content_build import CONTENT_DIR, list_sources, parse_tournament
+
+DEFAULT_OUTPUT = ROOT_DIR / 'build' / 'bench' / 'sessions.json'
+SEARCH_TERM = '다밍'
+RERUN_TIMEOUT = 120
+
+
+# --- 서버 ---
+
+def start_server(port, env):
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', 'app.py', '--server.headless', 'true',
+         '--server.port', str(port), '--browser.gatherUsageStats', 'false', '--server.fileWatcherType', 'none'],
+        cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1) as response:
+                if response.status == 200:
+                    return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError('앱 서버가 60초 안에 시작되지 않았습니다.')
+
+def server_rss_kb(pid):
+    """서버 프로세스의 RSS (KB). /proc가 없으면 None"""
+    try:
+        for line in Path(f'/proc/{pid}/status').read_text().splitlines():
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+# --- 가상 세션 ---
+
+class Session:
+    """웹소켓 하나로 스크립트 rerun을 요청하고 끝날 때까지 기다리는 가상 브라우저 세션"""
+
+    def __init__(self, port):
+        self.url = f'ws://127.0.0.1:{port}/_stcore/stream'
+        self.ws = None
+        self.widget_ids = {}  # 위젯 라벨 → id (마지막 rerun 기준)
+        self.widget_fragments = {}  # 위젯 id → 그 위젯이 들어 있는 fragment id
+        self.latencies = []
+
+    async def connect(self):
+        self.ws = await websockets.connect(self.url, subprotocols=['streamlit'], max_size=None)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def rerun(self, page_name='', query_string='', widget_states=()):
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.page_name = page_name
+        state.query_string = query_string
+        for widget_id, value in widget_states:
+            widget = state.widget_states.widgets.add()
+            widget.id = widget_id
+            widget.string_value = value
+            # 브라우저처럼 fragment 안의 위젯이 바뀌면 그 fragment만 다시 실행하도록 요청합니다.
+            if widget_id in self.widget_fragments:
+                state.fragment_id = self.widget_fragments[widget_id]
+
+        if not state.fragment_id:
+            self.widget_ids, self.widget_fragments = {}, {}
+        started = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            raw = await asyncio.wait_for(self.ws.recv(), timeout=RERUN_TIMEOUT)
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            kind = forward.WhichOneof('type')
+            if kind == 'delta':
+                self._remember_widget(forward.delta)
+            elif kind == 'page_not_found':
+                raise RuntimeError(f'페이지를 찾을 수 없습니다: {page_name!r}')
+            elif kind == 'script_finished':
+                break
+        self.latencies.append((time.perf_counter() - started) * 1000)
+
+    def _remember_widget(self, delta):
+        if delta.WhichOneof('type') != 'new_element':
+            return
+        element = delta.new_element
+        kind = element.WhichOneof('type')
+        widget = getattr(element, kind, None) if kind else None
+        if widget is not None and hasattr(widget, 'id') and hasattr(widget, 'label'):
+            self.widget_ids[widget.label] = widget.id
+            if delta.fragment_id:
+                self.widget_fragments[widget.id] = delta.fragment_id
+
+    async def browse(self, tournament_id, level_id):
+        """홈 → 대회 상세 → 레벨 목록 → 검색 → 레벨 상세"""
+        await self.rerun()
+        await self.rerun('Tournaments', f'id={tournament_id}')
+        await self.rerun('Levels')
+        search_id = next((wid for label, wid in self.widget_ids.items() if '검색' in label), None)
+        if search_id is not None:
+            await self.rerun('Levels', widget_states=[(search_id, SEARCH_TERM)])
+        await self.rerun('Levels', f'id={level_id}')
+
+
+async def run_level(port, pid, session_count, rounds, tournament_id, level_id):
+    """세션 session_count개를 동시에 열고 rounds번씩 탐색한 결과를 반환하는 함수"""
+    sessions = [Session(port) for _ in range(session_count)]
+    await asyncio.gather(*(session.connect() for session in sessions))
+    rss_before = server_rss_kb(pid)
+
+    async def run(session):
+        for _ in range(rounds):
+            await session.browse(tournament_id, level_id)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run(session) for session in sessions))
+    elapsed = time.perf_counter() - started
+    rss_after = server_rss_kb(pid)  # 세션을 닫기 전에 잽니다 (세션 상태가 남아 있는 상태)
+    await asyncio.gather(*(session.close() for session in sessions))
+
+    latencies = sorted(lat for session in sessions for lat in session.latencies)
+    p99_index = min(len(latencies) - 1, int(len(latencies) * 0.99))
+    return {
+        'sessions': session_count,
+        'reruns': len(latencies),
+        'p50_ms': round(statistics.median(latencies), 1),
+        'p99_ms': round(latencies[p99_index], 1),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'rss_kb': rss_after,
+        'rss_growth_kb': None if rss_before is None or rss_after is None else rss_after - rss_before,
+    }
+
+
+def _arg(argv, name, default):
+    return argv[argv.index(name) + 1] if name in argv else default
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    session_counts = [int(n) for n in _arg(argv, '--sessions', '1,5,10,25,50').split(',')]
+    rounds = int(_arg(argv, '--rounds', 3))
+    port = int(_arg(argv, '--port', 8599))
+    output = Path(_arg(argv, '--output', DEFAULT_OUTPUT))
+    level_count = _arg(argv, '--levels', None)
+    tournament_count = int(_arg(argv, '--tournaments', 5))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        content_dir = ROOT_DIR / CONTENT_DIR
+        if level_count is not None:
+            content_dir = Path(tmp) / 'content'
+            make_synthetic_content(content_dir, tournament_count, int(level_count))
+            env.update(AWC_CONTENT_DIR=str(content_dir), AWC_SNAPSHOT_FILE=str(Path(tmp) / 'snapshot.pickle'))
+
+        sources = list_sources(content_dir)
+        tournament_id = parse_tournament(sources['tournaments'][0], sources['tournaments'][0].read_bytes()).id
+        level_id = sources['levels'][0].stem
+
+        process = start_server(port, env)
+        try:
+            # 첫 세션 한 번으로 콘텐츠 로드와 캐시를 데워 둔 뒤의 메모리를 기준으로 삼습니다.
+            asyncio.run(run_level(port, process.pid, 1, 1, tournament_id, level_id))
+            baseline_rss = server_rss_kb(process.pid)
+            print(f'서버 준비 완료 (기준 RSS {baseline_rss} KB)')
+            print(f'{"세션":>6} {"rerun":>7} {"p50 ms":>9} {"p99 ms":>9} {"rerun/s":>9} {"RSS KB":>10} {"KB/세션":>9}')
+
+            results = []
+            for session_count in session_counts:
+                result = asyncio.run(run_level(port, process.pid, session_count, rounds, tournament_id, level_id))
+                per_session = (round(result['rss_growth_kb'] / session_count)
+                               if result['rss_growth_kb'] is not None else None)
+                result['rss_growth_per_session_kb'] = per_session
+                results.append(result)
+                print(f'{session_count:>6} {result["reruns"]:>7} {result["p50_ms"]:>9} {result["p99_ms"]:>9} '
+                      f'{result["throughput_rps"]:>9} {result["rss_kb"]!s:>10} {per_session!s:>9}')
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    report = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'content': {'levels': len(sources['levels']), 'tournaments': len(sources['tournaments'])},
+        'rounds': rounds,
+        'baseline_rss_kb': baseline_rss,
+        'results': results,
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f'결과 저장: {output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
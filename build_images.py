@@ -0,0 +1,161 @@
+# build_images.py
+#
+# 대회 배경 이미지를 여러 너비의 WebP/AVIF/JPEG 변형으로 만드는 빌드 스크립트.
+# 카드 배경은 수백 픽셀 너비로만 보이는데 원본 PNG는 2~3MB이므로,
+# 미리 줄인 변형과 매니페스트를 만들어 두고 카드에서 가장 작은 변형을 고릅니다.
+#
+# 사용법:  python build_images.py [--posters]
+# 필요 패키지: Pillow (requirements-build.txt). AVIF는 Pillow가 지원할 때만 생성합니다.
+#
+# --posters 를 주면 content/에 나오는 유튜브 영상의 썸네일을 static/images/posters/<영상 id>.jpg로
+# 내려받아 둡니다. 상세 페이지의 영상 파사드가 외부 요청 없이 이 이미지를 포스터로 사용합니다.
+
+import hashlib
+import io
+import json
+import sys
+import urllib.request
+from pathlib import Path
+
+import yaml
+
+STATIC_DIR = Path(__file__).parent / 'static'
+SOURCE_PATTERNS = ('images/tournament_bg_*.png', 'images/tournament_bg_*.jpg')
+VARIANTS_DIR = STATIC_DIR / 'images' / 'variants'
+MANIFEST_FILE = VARIANTS_DIR / 'manifest.json'
+
+VARIANT_WIDTHS = (480, 960, 1440)
+
+# 형식별 저장 옵션 (Pillow save 인자)
+FORMAT_OPTIONS = {
+    'avif': {'format': 'AVIF', 'quality': 50},
+    'webp': {'format': 'WEBP', 'quality': 78, 'method': 6},
+    'jpg': {'format': 'JPEG', 'quality': 80, 'progressive': True, 'optimize': True},
+}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpg': 'image/jpeg'}
+
+CONTENT_DIR = Path(__file__).parent / 'content'
+POSTERS_DIR = STATIC_DIR / 'images' / 'posters'
+POSTER_URL = 'https://i.ytimg.com/vi/{video_id}/hqdefault.jpg'
+
+
+def _load_manifest():
+    try:
+        return json.loads(MANIFEST_FILE.read_text(encoding='utf-8'))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _supported_formats(features):
+    formats = ['webp', 'jpg']
+    if features.check('avif'):
+        formats.insert(0, 'avif')
+    return formats
+
+
+def _build_variants(source, raw, formats, Image):
+    image = Image.open(io.BytesIO(raw))
+    image.load()
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    # 원본보다 큰 너비는 만들지 않되, 최소 한 개의 변형은 만듭니다.
+    widths = [w for w in VARIANT_WIDTHS if w < image.width] or [image.width]
+    variants = []
+    for width in widths:
+        height = round(image.height * width / image.width)
+        resized = image.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            buffer = io.BytesIO()
+            resized.save(buffer, **FORMAT_OPTIONS[fmt])
+            data = buffer.getvalue()
+            digest = hashlib.sha1(data).hexdigest()[:12]
+            out_file = VARIANTS_DIR / f'{source.stem}-{width}w.{digest}.{fmt}'
+            out_file.write_bytes(data)
+            variants.append({
+                'width': width,
+                'height': height,
+                'format': fmt,
+                'mime': MIME_TYPES[fmt],
+                'path': out_file.relative_to(STATIC_DIR).as_posix(),
+                'sha1': digest,
+                'bytes': len(data),
+            })
+    return image.width, variants
+
+
+def fetch_posters():
+    """content/의 youtube_video_id 썸네일 중 아직 없는 것만 내려받는 함수"""
+    POSTERS_DIR.mkdir(parents=True, exist_ok=True)
+    video_ids = set()
+    for path in CONTENT_DIR.glob('*/*.yaml'):
+        data = yaml.safe_load(path.read_bytes()) or {}
+        if data.get('youtube_video_id'):
+            video_ids.add(str(data['youtube_video_id']))
+
+    for video_id in sorted(video_ids):
+        target = POSTERS_DIR / f'{video_id}.jpg'
+        if target.exists():
+            continue
+        try:
+            with urllib.request.urlopen(POSTER_URL.format(video_id=video_id), timeout=10) as response:
+                target.write_bytes(response.read())
+            print(f'  포스터 저장: {target.name}')
+        except OSError as e:
+            print(f'  포스터를 받지 못했습니다 ({video_id}): {e}', file=sys.stderr)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if '--posters' in argv:
+        fetch_posters()
+
+    try:
+        from PIL import Image, features
+    except ImportError:
+        print('Pillow가 필요합니다: pip install -r requirements-build.txt', file=sys.stderr)
+        return 1
+
+    VARIANTS_DIR.mkdir(parents=True, exist_ok=True)
+    previous = _load_manifest()
+    formats = _supported_formats(features)
+    manifest = {}
+
+    sources = sorted({path for pattern in SOURCE_PATTERNS for path in STATIC_DIR.glob(pattern)})
+    for source in sources:
+        raw = source.read_bytes()
+        source_sha1 = hashlib.sha1(raw).hexdigest()
+        entry = previous.get(source.stem)
+
+        # 원본과 형식이 그대로이고 변형 파일이 모두 남아 있으면 다시 만들지 않습니다.
+        if (entry and entry.get('source_sha1') == source_sha1
+                and sorted({v['format'] for v in entry['variants']}) == sorted(formats)
+                and all((STATIC_DIR / v['path']).exists() for v in entry['variants'])):
+            manifest[source.stem] = entry
+            print(f'  그대로 사용: {source.name}')
+            continue
+
+        width, variants = _build_variants(source, raw, formats, Image)
+        manifest[source.stem] = {
+            'source': source.relative_to(STATIC_DIR).as_posix(),
+            'source_sha1': source_sha1,
+            'source_bytes': len(raw),
+            'width': width,
+            'variants': variants,
+        }
+        smallest = min(v['bytes'] for v in variants)
+        print(f'  생성: {source.name} ({len(raw) // 1024} KB → 변형 {len(variants)}개, 최소 {smallest // 1024} KB)')
+
+    # 매니페스트에 없는 오래된 변형 파일은 지웁니다.
+    keep = {STATIC_DIR / v['path'] for entry in manifest.values() for v in entry['variants']}
+    for stale in VARIANTS_DIR.glob('*.*'):
+        if stale != MANIFEST_FILE and stale not in keep:
+            stale.unlink()
+
+    MANIFEST_FILE.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f'이미지 매니페스트 저장: {MANIFEST_FILE} (형식: {", ".join(formats)})')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
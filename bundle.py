@@ -0,0 +1,174 @@
+# bundle.py
+#
+# 정적 에셋 번들 빌드 단계.
+# static/ 이미지(배경 변형, 유튜브 포스터 포함), 부분 글꼴, 압축된 스타일시트를 모아
+# 이름에 내용 해시가 붙은 파일로 static/bundle/에 복사하고, 압축이 의미 있는 형식(CSS, SVG 등)은
+# gzip(.gz)과 brotli(.br)로 미리 압축한 파일을 옆에 둡니다.
+# static/bundle/manifest.json 에 원래 경로 → 번들 파일 이름을 기록하며, 앱의 컴포넌트(assets.py,
+# css_build.py)는 이 매니페스트로 에셋 주소를 정합니다. 번들에 없거나 원본이 바뀐 파일은 기존처럼
+# app/static/...?v=<해시> 주소를 사용합니다.
+#
+# 파일 이름이 내용에 따라 바뀌므로 번들 파일은 영구 캐시(immutable)해도 안전합니다.
+# serve.py로 앱을 띄우면 번들 요청에 immutable 캐시 헤더를 붙이고, 브라우저가 지원하면
+# 미리 압축한 파일을 Content-Encoding과 함께 보냅니다.
+#
+# 사용법:  python bundle.py   (build_images.py, css_build.py 다음에 실행)
+# brotli 압축에는 brotli 패키지(requirements-build.txt)가 필요합니다. 없으면 gzip 파일만 만듭니다.
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import shutil
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent
+STATIC_DIR = ROOT_DIR / 'static'
+BUNDLE_DIR = STATIC_DIR / 'bundle'
+BUNDLE_MANIFEST_FILE = BUNDLE_DIR / 'manifest.json'
+
+# 번들 주소 (Streamlit 정적 파일 서빙 경로 기준)
+BUNDLE_URL_PREFIX = 'app/static/bundle'
+
+# 매니페스트 구조가 바뀌면 올립니다. 형식이 다른 매니페스트는 없는 것으로 취급합니다.
+BUNDLE_FORMAT = 1
+
+# 번들에 넣을 static/ 기준 파일 패턴 (번들 폴더 자신은 제외)
+SOURCE_PATTERNS = ('images/**/*', 'fonts/*.woff2')
+STYLESHEET_SOURCE = ROOT_DIR / 'style.css'
+STYLESHEET_KEY = 'style.css'
+
+# 미리 압축할 형식. PNG/JPEG/WebP/woff2는 이미 압축되어 있어 거의 줄지 않으므로 제외합니다.
+COMPRESSIBLE_SUFFIXES = {'.css', '.js', '.svg', '.json', '.txt', '.html', '.xml'}
+# 압축 결과가 원본의 이 비율보다 크면 압축 파일을 두지 않습니다.
+MIN_COMPRESSION_RATIO = 0.9
+
+# Content-Encoding 이름 → 파일 접미사 (선호 순서)
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+
+
+# --- 매니페스트 조회 (앱과 css_build.py가 사용) ---
+
+_manifest_cache = None
+
+def load_bundle_manifest():
+    """번들 매니페스트의 files 맵 (번들이 없으면 빈 dict). 프로세스당 한 번만 읽습니다."""
+    global _manifest_cache
+    if _manifest_cache is None:
+        try:
+            manifest = json.loads(BUNDLE_MANIFEST_FILE.read_text(encoding='utf-8'))
+        except (FileNotFoundError, json.JSONDecodeError):
+            manifest = {}
+        _manifest_cache = manifest.get('files', {}) if manifest.get('format') == BUNDLE_FORMAT else {}
+    return _manifest_cache
+
+def bundle_url(relative, sha1=None):
+    """static/ 기준 경로의 번들 주소. 번들에 없거나 (sha1을 주면) 내용이 다르면 None
+
+    ?v=<해시>도 그대로 붙여, export_site.py의 주소 변환과 ?v= 인자에 장기 캐시를 주는
+    정적 파일 핸들러에서도 같은 주소를 쓸 수 있게 합니다.
+    """
+    entry = load_bundle_manifest().get(relative)
+    if entry is None or (sha1 is not None and not entry['sha1'].startswith(sha1)):
+        return None
+    return f"{BUNDLE_URL_PREFIX}/{entry['file']}?v={entry['sha1'][:12]}"
+
+
+# --- 빌드 ---
+
+def _fingerprinted_name(relative, sha1):
+    path = Path(relative)
+    return path.with_name(f'{path.stem}.{sha1[:12]}{path.suffix}').as_posix()
+
+def _compressors():
+    compressors = {'gzip': lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+        compressors['br'] = lambda data: brotli.compress(data, quality=11)
+    except ImportError:
+        print('  brotli 패키지가 없어 .br 파일은 만들지 않습니다: pip install -r requirements-build.txt', file=sys.stderr)
+    return compressors
+
+def _write_entry(relative, data, compressors, **extra):
+    sha1 = hashlib.sha1(data).hexdigest()
+    name = _fingerprinted_name(relative, sha1)
+    out_file = BUNDLE_DIR / name
+    out_file.parent.mkdir(parents=True, exist_ok=True)
+    if not out_file.exists():
+        out_file.write_bytes(data)
+
+    encodings = {}
+    if out_file.suffix in COMPRESSIBLE_SUFFIXES:
+        for encoding, compress in compressors.items():
+            compressed_file = out_file.with_name(out_file.name + ENCODINGS[encoding])
+            if compressed_file.exists():
+                compressed = compressed_file.read_bytes()
+            else:
+                compressed = compress(data)
+                if len(compressed) > len(data) * MIN_COMPRESSION_RATIO:
+                    continue
+                compressed_file.write_bytes(compressed)
+            encodings[encoding] = len(compressed)
+
+    return {
+        'file': name,
+        'sha1': sha1,
+        'bytes': len(data),
+        'mime': mimetypes.guess_type(name)[0] or 'application/octet-stream',
+        'encodings': encodings,
+        **extra,
+    }
+
+def build_bundle():
+    """번들 파일과 매니페스트를 만들고 매니페스트 dict를 반환하는 함수"""
+    from css_build import compile_css
+
+    global _manifest_cache
+    compressors = _compressors()
+    files = {}
+
+    sources = sorted({path for pattern in SOURCE_PATTERNS for path in STATIC_DIR.glob(pattern)
+                      if path.is_file() and BUNDLE_DIR not in path.parents and path.suffix != '.json'})
+    for source in sources:
+        relative = source.relative_to(STATIC_DIR).as_posix()
+        files[relative] = _write_entry(relative, source.read_bytes(), compressors)
+
+    # 스타일시트 안의 글꼴 주소는 스타일시트 파일 기준 상대 경로(번들 안의 fonts/...)로 씁니다.
+    def font_url(face):
+        entry = files.get(face['path'])
+        return entry['file'] if entry else None
+
+    compiled, _ = compile_css(STYLESHEET_SOURCE, font_url=font_url)
+    source_sha1 = hashlib.sha1(STYLESHEET_SOURCE.read_bytes()).hexdigest()
+    files[STYLESHEET_KEY] = _write_entry(STYLESHEET_KEY, compiled.encode('utf-8'), compressors,
+                                         source_sha1=source_sha1)
+
+    # 매니페스트에 없는 이전 번들 파일은 지웁니다.
+    keep = {BUNDLE_DIR / entry['file'] for entry in files.values()}
+    keep |= {path.with_name(path.name + suffix) for path in keep for suffix in ENCODINGS.values()}
+    for stale in BUNDLE_DIR.rglob('*'):
+        if stale.is_file() and stale != BUNDLE_MANIFEST_FILE and stale not in keep:
+            stale.unlink()
+
+    manifest = {'format': BUNDLE_FORMAT, 'files': files}
+    BUNDLE_MANIFEST_FILE.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+    _manifest_cache = None
+    return manifest
+
+
+def main(argv=None):
+    if '--clean' in (sys.argv[1:] if argv is None else argv):
+        shutil.rmtree(BUNDLE_DIR, ignore_errors=True)
+
+    manifest = build_bundle()
+    total = sum(entry['bytes'] for entry in manifest['files'].values())
+    for relative, entry in sorted(manifest['files'].items()):
+        encodings = ', '.join(f'{name} {size:,}' for name, size in entry['encodings'].items())
+        print(f'  {relative} → {entry["file"]} ({entry["bytes"]:,} bytes{"; " + encodings if encodings else ""})')
+    print(f'번들 매니페스트 저장: {BUNDLE_MANIFEST_FILE} (파일 {len(manifest["files"])}개, {total:,} bytes)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
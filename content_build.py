@@ -0,0 +1,232 @@
+# content_build.py
+#
+# content/ 폴더의 YAML 파일들을 하나의 스냅샷 파일로 컴파일하는 빌드 스크립트.
+# 서버가 시작될 때마다 파일을 하나씩 열고 순수 파이썬 YAML 파서로 읽는 대신,
+# 미리 만들어 둔 스냅샷을 한 번에 읽어 콜드 스타트 시간을 줄입니다.
+#
+# 사용법:  python content_build.py
+
+import hashlib
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import yaml
+
+from records import RecordError, intern_strings, level_from_dict, tournament_from_dict
+
+# libyaml이 설치되어 있으면 C 구현 로더를 사용하고, 없으면 순수 파이썬 로더로 대체합니다.
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# 이 개수 이상의 파일을 한 번에 파싱할 때만 프로세스 풀을 사용합니다.
+# (파일이 적으면 프로세스를 띄우는 비용이 파싱 비용보다 큽니다.)
+PARALLEL_MIN_FILES = 200
+MAX_WORKERS = 8
+
+# 벤치마크처럼 다른 콘텐츠 트리로 앱을 띄울 때는 환경 변수로 경로를 바꿀 수 있습니다.
+CONTENT_DIR = Path(os.environ.get('AWC_CONTENT_DIR', 'content'))
+SNAPSHOT_FILE = Path(os.environ.get('AWC_SNAPSHOT_FILE', Path('build') / 'content_snapshot.pickle'))
+
+# 스냅샷 구조나 파싱 규칙이 바뀌면 이 값을 올려서 기존 스냅샷을 무효화합니다.
+SNAPSHOT_FORMAT = 4
+
+CONTENT_KINDS = ('tournaments', 'levels')
+
+
+# --- 레코드 파싱 (dataLoad와 빌드 스크립트가 같은 규칙을 사용) ---
+
+def load_yaml(raw):
+    """yaml.safe_load와 같지만 가능하면 libyaml(CSafeLoader)을 사용하는 함수"""
+    return yaml.load(raw, Loader=YAML_LOADER)
+
+def _content_hash(raw):
+    # 렌더링된 HTML 조각 캐시의 키로 사용하는 소스 파일 해시
+    return hashlib.sha1(raw).hexdigest()[:12]
+
+def parse_tournament(filepath, raw):
+    """대회 YAML 원문을 읽어 검증된 Tournament 레코드로 변환하는 함수"""
+    return tournament_from_dict(filepath.stem, _content_hash(raw), load_yaml(raw))
+
+def parse_level(filepath, raw):
+    """레벨 YAML 원문을 읽어 검증된 Level 레코드로 변환하는 함수"""
+    return level_from_dict(filepath.stem, _content_hash(raw), load_yaml(raw))
+
+PARSERS = {
+    'tournaments': parse_tournament,
+    'levels': parse_level,
+}
+
+def _parse_job(job):
+    kind, filepath, raw = job
+    try:
+        return PARSERS[kind](filepath, raw), None
+    except (yaml.YAMLError, RecordError) as e:
+        # 파일 하나의 문법/스키마 오류가 전체 로드를 멈추지 않도록 오류 문자열로 돌려줍니다.
+        return None, str(e)
+
+def parse_many(jobs, max_workers=None):
+    """(kind, filepath, raw) 목록을 파싱해 같은 순서로 (record, error) 목록을 반환하는 함수
+
+    파일이 많으면 최대 MAX_WORKERS개의 프로세스로 나눠 파싱합니다.
+    YAML 파싱은 CPU 작업이라 스레드로는 GIL 때문에 빨라지지 않습니다.
+    """
+    jobs = list(jobs)
+    workers = max_workers or min(MAX_WORKERS, os.cpu_count() or 1)
+    if workers <= 1 or len(jobs) < PARALLEL_MIN_FILES:
+        return [_parse_job(job) for job in jobs]
+
+    chunksize = max(1, len(jobs) // (workers * 4))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_parse_job, jobs, chunksize=chunksize)
+            # 다른 프로세스에서 pickle로 넘어온 문자열은 다시 intern해서 공유합니다.
+            return [(intern_strings(record) if record is not None else None, error) for record, error in results]
+    except (OSError, BrokenProcessPool):
+        # 프로세스를 만들 수 없는 환경에서는 순차 파싱으로 대체합니다.
+        return [_parse_job(job) for job in jobs]
+
+def sort_records(kind, records):
+    """목록 페이지에서 사용하는 기본 순서로 정렬하는 함수"""
+    if kind == 'tournaments':
+        records.sort(key=lambda t: t.year or '0000', reverse=True)
+    else:
+        # 레벨 이름순 (대소문자 구분 없이, 같으면 id순). SQLite 백엔드의 기본 정렬(title_sort, id)과 같습니다.
+        records.sort(key=lambda l: (l.title.casefold(), l.id))
+    return records
+
+
+# --- 소스 파일 목록과 매니페스트 ---
+
+def list_sources(content_dir=CONTENT_DIR):
+    """종류별 YAML 소스 파일 경로 목록을 반환하는 함수"""
+    sources = {}
+    for kind in CONTENT_KINDS:
+        kind_path = Path(content_dir) / kind
+        sources[kind] = sorted(kind_path.glob('*.yaml')) if kind_path.exists() else []
+    return sources
+
+def _manifest_key(content_dir, filepath):
+    return Path(filepath).relative_to(content_dir).as_posix()
+
+def _manifest_entry(filepath, raw):
+    stat = os.stat(filepath)
+    return {
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha1': hashlib.sha1(raw).hexdigest(),
+    }
+
+
+# --- 스냅샷 빌드 / 저장 / 로드 ---
+
+def build_snapshot(content_dir=CONTENT_DIR):
+    """content/ 전체를 파싱해 매니페스트가 포함된 스냅샷 dict를 만드는 함수"""
+    content_dir = Path(content_dir)
+    snapshot = {
+        'format': SNAPSHOT_FORMAT,
+        'built_at': time.time(),
+        'manifest': {},
+    }
+    jobs = []
+    for kind, paths in list_sources(content_dir).items():
+        snapshot[kind] = []
+        for filepath in paths:
+            raw = filepath.read_bytes()
+            snapshot['manifest'][_manifest_key(content_dir, filepath)] = _manifest_entry(filepath, raw)
+            jobs.append((kind, filepath, raw))
+
+    errors = []
+    for (kind, filepath, _), (record, error) in zip(jobs, parse_many(jobs)):
+        if error is not None:
+            errors.append(f'{filepath}: {error}')
+        else:
+            snapshot[kind].append(record)
+    if errors:
+        raise ValueError('콘텐츠 파싱 실패:\n' + '\n'.join(errors))
+
+    for kind in CONTENT_KINDS:
+        sort_records(kind, snapshot[kind])
+    return snapshot
+
+def write_snapshot(snapshot, snapshot_file=SNAPSHOT_FILE):
+    """스냅샷을 임시 파일에 쓴 뒤 교체해서, 읽는 쪽이 반쯤 쓰인 파일을 보지 않게 하는 함수"""
+    snapshot_file = Path(snapshot_file)
+    snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = snapshot_file.with_suffix(snapshot_file.suffix + '.tmp')
+    with open(tmp_file, 'wb') as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, snapshot_file)
+
+def is_snapshot_fresh(snapshot, content_dir=CONTENT_DIR):
+    """스냅샷의 매니페스트가 현재 content/ 상태와 일치하는지 확인하는 함수
+
+    배포 과정에서 파일 내용은 같아도 mtime이 바뀌는 경우가 많으므로,
+    mtime이나 크기가 다른 파일만 해시를 다시 계산해서 비교합니다.
+    """
+    content_dir = Path(content_dir)
+    manifest = snapshot.get('manifest', {})
+    current = {
+        _manifest_key(content_dir, filepath): filepath
+        for paths in list_sources(content_dir).values()
+        for filepath in paths
+    }
+    if current.keys() != manifest.keys():
+        return False
+
+    for key, filepath in current.items():
+        entry = manifest[key]
+        stat = os.stat(filepath)
+        if stat.st_mtime_ns == entry['mtime_ns'] and stat.st_size == entry['size']:
+            continue
+        if stat.st_size != entry['size']:
+            return False
+        if hashlib.sha1(filepath.read_bytes()).hexdigest() != entry['sha1']:
+            return False
+    return True
+
+def read_snapshot(snapshot_file=SNAPSHOT_FILE):
+    """스냅샷 파일을 최신 여부와 관계없이 읽는 함수 (없거나 형식이 다르면 None)"""
+    try:
+        with open(snapshot_file, 'rb') as f:
+            snapshot = pickle.load(f)
+    except (FileNotFoundError, pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+        # 레코드 클래스가 바뀐 뒤의 오래된 스냅샷도 여기서 걸러집니다.
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get('format') != SNAPSHOT_FORMAT:
+        return None
+    return snapshot
+
+def load_snapshot(content_dir=CONTENT_DIR, snapshot_file=SNAPSHOT_FILE):
+    """최신 상태인 스냅샷을 한 번에 읽어 반환하고, 없거나 오래됐으면 None을 반환하는 함수"""
+    snapshot = read_snapshot(snapshot_file)
+    if snapshot is None or not is_snapshot_fresh(snapshot, content_dir):
+        return None
+    return snapshot
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    content_dir = Path(argv[0]) if len(argv) > 0 else CONTENT_DIR
+    snapshot_file = Path(argv[1]) if len(argv) > 1 else SNAPSHOT_FILE
+
+    started = time.perf_counter()
+    try:
+        snapshot = build_snapshot(content_dir)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    write_snapshot(snapshot, snapshot_file)
+    elapsed = time.perf_counter() - started
+
+    counts = ', '.join(f'{kind} {len(snapshot[kind])}개' for kind in CONTENT_KINDS)
+    print(f'콘텐츠 스냅샷 생성 완료: {snapshot_file} ({counts}, {elapsed:.2f}초)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,518 @@
+# content_db.py
+#
+# 선택적 SQLite 콘텐츠 백엔드 (AWC_CONTENT_BACKEND=sqlite 일 때 사용).
+# content/ YAML을 로컬 SQLite 파일(build/content.sqlite3)에 옮겨 두고,
+# 레벨 목록의 대회 필터, 검색, 범위 필터, 정렬, 전체 개수, 페이지 자르기를 쿼리 하나로 처리합니다.
+#   - 레벨 전체를 파이썬 객체로 들고 있지 않으므로 레벨 수가 늘어도 프로세스 메모리는 거의 그대로입니다.
+#   - 여러 앱 프로세스가 같은 DB 파일을 함께 읽습니다. (WAL 모드)
+#   - ContentStore처럼 파일별 mtime/크기/해시를 DB에 기록해 두고 바뀐 파일만 다시 파싱합니다.
+#     다른 프로세스가 이미 반영한 변경은 다시 파싱하지 않고, 바뀐 파일이 없으면 쓰기 잠금도 잡지 않습니다.
+#   - 검색은 search_index와 같은 규칙으로 정규화한 문자열을 FTS5(trigram) 테이블에 넣어 찾습니다.
+#     정확히 일치하는 레벨이 적으면 메모리 색인처럼 3-gram이 절반 이상 겹치는 오타 후보도 함께 찾습니다.
+#
+# 사용법:  python content_db.py   (DB를 미리 만들거나 갱신만 하고 종료)
+
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+
+from content_build import CONTENT_DIR, CONTENT_KINDS, list_sources, parse_many, sort_records
+from records import DateEntry, Level, ShortcutLink, Tournament
+from search_index import (FIELD_WEIGHTS, FUZZY_MIN_RESULTS, GRAM_SIZE, MIN_GRAM_RATIO, SEARCH_FIELDS,
+                          normalize, query_variants)
+
+logger = logging.getLogger(__name__)
+
+CONTENT_DB_FILE = Path(os.environ.get('AWC_CONTENT_DB', Path('build') / 'content.sqlite3'))
+
+# 테이블 구조나 파싱 규칙이 바뀌면 이 값을 올려서 기존 DB를 다시 만듭니다. (PRAGMA user_version)
+DB_FORMAT = 3
+
+# 다른 프로세스가 DB를 갱신하는 동안 기다릴 최대 시간 (초)
+BUSY_TIMEOUT = 60
+
+LEVEL_FIELDS = ('id', 'content_hash', 'title', 'artist', 'detail_artist', 'creator', 'detail_creator',
+                'tournament_id', 'minititle', 'difficulty_rating', 'difficulty_label', 'bpm', 'tiles',
+                'youtube_video_id', 'download_url')
+
+# 정렬 열 이름(sort_index.SORT_COLUMNS와 같음) → SQL 정렬식.
+# NULLS LAST로 값이 없는 레벨은 방향과 관계없이 맨 뒤에 두며, 내림차순은 열 색인을 거꾸로 훑어 바로 읽습니다.
+SORT_EXPRESSIONS = {
+    'title': 'l.title_sort',
+    'difficulty': 'l.difficulty_rating',
+    'bpm': 'l.bpm',
+    'tiles': 'l.tiles',
+    'tournament': "NULLIF(l.tournament_id, '')",
+}
+
+# 범위 필터를 지원하는 열 이름 → DB 열
+RANGE_EXPRESSIONS = {
+    'difficulty': 'l.difficulty_rating',
+    'bpm': 'l.bpm',
+    'tiles': 'l.tiles',
+}
+
+_SCHEMA = f'''
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha1 TEXT NOT NULL
+);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE tournaments (id TEXT PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE levels (
+    doc INTEGER PRIMARY KEY,
+    {', '.join(f'{field} TEXT UNIQUE NOT NULL' if field == 'id' else field for field in LEVEL_FIELDS)},
+    title_sort TEXT NOT NULL
+);
+CREATE INDEX levels_tournament ON levels (tournament_id, title_sort);
+CREATE INDEX levels_title_sort ON levels (title_sort);
+CREATE INDEX levels_difficulty ON levels (difficulty_rating);
+CREATE INDEX levels_bpm ON levels (bpm);
+CREATE INDEX levels_tiles ON levels (tiles);
+'''
+
+
+def _has_trigram():
+    # trigram 토크나이저는 SQLite 3.34부터 있습니다. 없으면 일반 테이블에서 instr()로 찾습니다.
+    try:
+        sqlite3.connect(':memory:').execute("CREATE VIRTUAL TABLE t USING fts5(a, tokenize='trigram')")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+HAS_TRIGRAM = _has_trigram()
+
+
+# --- 레코드 ↔ 행 변환 ---
+
+def _tournament_to_json(tournament):
+    data = {name: getattr(tournament, name) for name in Tournament.__dataclass_fields__}
+    data['dates'] = [[entry.label, entry.value] for entry in tournament.dates]
+    data['shortcut_links'] = [[link.label, link.url, link.icon] for link in tournament.shortcut_links]
+    return json.dumps(data, ensure_ascii=False)
+
+def _tournament_from_json(text):
+    data = json.loads(text)
+    data['dates'] = tuple(DateEntry(*entry) for entry in data['dates'])
+    data['shortcut_links'] = tuple(ShortcutLink(*link) for link in data['shortcut_links'])
+    return Tournament(**data)
+
+def _level_row(level):
+    return tuple(getattr(level, field) for field in LEVEL_FIELDS) + (level.title.casefold(),)
+
+def _search_row(level):
+    return tuple(normalize(str(getattr(level, field) or '')) for field in SEARCH_FIELDS)
+
+
+class ContentDatabase:
+    """SQLite에 저장된 콘텐츠를 조회하는 객체
+
+    대회 목록과 제목↔id 맵은 ContentIndex와 같은 이름으로 제공하므로 페이지에서 그대로 바꿔 쓸 수 있고,
+    레벨 목록은 query_levels()로 필요한 페이지만 읽습니다.
+    연결은 스레드(세션)마다 하나씩 엽니다. sqlite3 연결은 스레드 사이에 공유할 수 없습니다.
+    """
+
+    def __init__(self, db_file=CONTENT_DB_FILE, content_dir=CONTENT_DIR, check_interval=2.0):
+        self.db_file = Path(db_file)
+        self.content_dir = Path(content_dir)
+        self.check_interval = check_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self.version = None
+        self._set_tournaments(())
+        self._bounds = {}
+        self.errors = MappingProxyType({})
+        self._failed = {}
+
+    # --- 연결과 스키마 ---
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            self.db_file.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_file, timeout=BUSY_TIMEOUT, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _ensure_schema(self, conn):
+        if conn.execute('PRAGMA user_version').fetchone()[0] == DB_FORMAT:
+            return
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # 잠금을 기다리는 동안 다른 프로세스가 이미 만들었을 수 있습니다.
+            if conn.execute('PRAGMA user_version').fetchone()[0] != DB_FORMAT:
+                for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' "
+                                            "AND name NOT LIKE 'sqlite_%' AND name NOT LIKE 'level_search_%'").fetchall():
+                    conn.execute(f'DROP TABLE IF EXISTS {name}')
+                for statement in _SCHEMA.split(';'):
+                    if statement.strip():
+                        conn.execute(statement)
+                columns = ', '.join(SEARCH_FIELDS)
+                if HAS_TRIGRAM:
+                    conn.execute(f"CREATE VIRTUAL TABLE level_search USING fts5({columns}, tokenize='trigram')")
+                else:
+                    conn.execute(f'CREATE TABLE level_search (rowid INTEGER PRIMARY KEY, {columns})')
+                conn.execute(f'PRAGMA user_version = {DB_FORMAT}')
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    # --- 동기화 ---
+
+    def _is_stale(self):
+        return self.version is None or time.monotonic() - self._last_check >= self.check_interval
+
+    def current(self):
+        """check_interval 초에 한 번만 디스크를 확인하고 자기 자신을 반환하는 함수
+
+        여러 세션이 동시에 호출해도 동기화는 한 스레드만 하고, 나머지는 끝날 때까지 기다립니다.
+        """
+        if self._is_stale():
+            with self._lock:
+                if self._is_stale():
+                    self._refresh_locked()
+        return self
+
+    def refresh(self):
+        """content/와 DB를 비교해 추가/변경/삭제된 파일만 DB에 반영하는 함수"""
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self):
+        conn = self._connect()
+        self._ensure_schema(conn)
+        errors = dict(self.errors)
+        # 바뀐 것이 없으면 읽기만 하고 끝냅니다. (여러 프로세스가 확인할 때마다 쓰기 잠금을 두고 다투지 않도록)
+        if self._needs_sync(conn):
+            # 쓰기 잠금을 잡은 뒤 다시 비교하므로, 여러 프로세스가 동시에 시작해도 파싱은 한 번만 합니다.
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                errors, self._failed = self._sync(conn)
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+
+        version = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        version = version[0] if version else ''
+        if version != self.version:
+            tournaments = [_tournament_from_json(data) for (data,) in conn.execute('SELECT data FROM tournaments')]
+            self._set_tournaments(tuple(sort_records('tournaments', tournaments)))
+            self._bounds = self._read_bounds(conn)
+            self.version = version
+        if dict(errors) != dict(self.errors):
+            for key, error in sorted(errors.items()):
+                logger.warning('콘텐츠 파일을 읽지 못했습니다: %s: %s', key, error)
+            self.errors = MappingProxyType(errors)
+        self._last_check = time.monotonic()
+        return self
+
+    def _needs_sync(self, conn):
+        """쓰기 잠금 없이 files 표의 mtime/크기와 디스크를 비교해 반영할 것이 있는지 확인하는 함수"""
+        if not conn.execute("SELECT 1 FROM meta WHERE key = 'version'").fetchone():
+            return True
+        known = {path: (mtime_ns, size) for path, mtime_ns, size in conn.execute('SELECT path, mtime_ns, size FROM files')}
+        seen = set()
+        for paths in list_sources(self.content_dir).values():
+            for filepath in paths:
+                key = filepath.relative_to(self.content_dir).as_posix()
+                try:
+                    stat = os.stat(filepath)
+                except FileNotFoundError:
+                    continue
+                seen.add(key)
+                current = (stat.st_mtime_ns, stat.st_size)
+                # 지난번에 읽지 못한 파일은 다시 저장되기 전까지 변경으로 보지 않습니다.
+                if known.get(key) != current and self._failed.get(key) != current:
+                    return True
+        # 지워진 파일 (읽지 못했던 파일이 지워지면 오류 기록을 없애야 함)
+        return bool(known.keys() - seen or self._failed.keys() - seen)
+
+    def _sync(self, conn):
+        known = {path: (kind, record_id, mtime_ns, size, sha1) for path, kind, record_id, mtime_ns, size, sha1
+                 in conn.execute('SELECT path, kind, record_id, mtime_ns, size, sha1 FROM files')}
+        seen = set()
+        pending = []
+        errors = {}
+        failed = {}  # 읽지 못한 파일 → (mtime_ns, 크기)
+        for kind, paths in list_sources(self.content_dir).items():
+            for filepath in paths:
+                key = filepath.relative_to(self.content_dir).as_posix()
+                try:
+                    stat = os.stat(filepath)
+                except FileNotFoundError:
+                    continue  # 스캔 도중 삭제된 파일
+                seen.add(key)
+                previous = known.get(key)
+                if previous and previous[2] == stat.st_mtime_ns and previous[3] == stat.st_size:
+                    continue
+
+                raw = filepath.read_bytes()
+                sha1 = hashlib.sha1(raw).hexdigest()
+                if previous and previous[4] == sha1:
+                    # 내용은 같고 mtime만 바뀐 경우: 다시 파싱하지 않습니다.
+                    conn.execute('UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?',
+                                 (stat.st_mtime_ns, stat.st_size, key))
+                    continue
+                pending.append((key, kind, filepath, raw, stat, sha1))
+
+        changed = False
+        for key in known.keys() - seen:
+            kind, record_id = known[key][:2]
+            self._delete_record(conn, kind, record_id)
+            conn.execute('DELETE FROM files WHERE path = ?', (key,))
+            changed = True
+
+        results = parse_many((kind, filepath, raw) for _, kind, filepath, raw, _, _ in pending)
+        for (key, kind, _, _, stat, sha1), (record, error) in zip(pending, results):
+            if error is not None:
+                # 편집 도중 잘못 저장된 파일은 이전 행을 유지하고 오류만 기록합니다.
+                errors[key] = error
+                failed[key] = (stat.st_mtime_ns, stat.st_size)
+                continue
+            self._delete_record(conn, kind, record.id)
+            self._insert_record(conn, kind, record)
+            conn.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)',
+                         (key, kind, record.id, stat.st_mtime_ns, stat.st_size, sha1))
+            changed = True
+
+        if changed or not conn.execute("SELECT 1 FROM meta WHERE key = 'version'").fetchone():
+            digest = hashlib.sha1()
+            for path, sha1 in conn.execute('SELECT path, sha1 FROM files ORDER BY path'):
+                digest.update(path.encode('utf-8'))
+                digest.update(sha1.encode('ascii'))
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (digest.hexdigest()[:16],))
+        return errors, failed
+
+    def _delete_record(self, conn, kind, record_id):
+        if kind == 'tournaments':
+            conn.execute('DELETE FROM tournaments WHERE id = ?', (record_id,))
+            return
+        row = conn.execute('SELECT doc FROM levels WHERE id = ?', (record_id,)).fetchone()
+        if row is not None:
+            conn.execute('DELETE FROM level_search WHERE rowid = ?', row)
+            conn.execute('DELETE FROM levels WHERE doc = ?', row)
+
+    def _insert_record(self, conn, kind, record):
+        if kind == 'tournaments':
+            conn.execute('INSERT INTO tournaments VALUES (?, ?)', (record.id, _tournament_to_json(record)))
+            return
+        placeholders = ', '.join('?' * (len(LEVEL_FIELDS) + 1))
+        doc = conn.execute(f'INSERT INTO levels ({", ".join(LEVEL_FIELDS)}, title_sort) VALUES ({placeholders})',
+                           _level_row(record)).lastrowid
+        conn.execute(f'INSERT INTO level_search (rowid, {", ".join(SEARCH_FIELDS)}) '
+                     f'VALUES (?{", ?" * len(SEARCH_FIELDS)})', (doc, *_search_row(record)))
+
+    # --- 대회 (ContentIndex와 같은 이름) ---
+
+    def _set_tournaments(self, tournaments):
+        self.tournaments = tournaments
+        self.tournament_by_id = MappingProxyType({t.id: t for t in tournaments})
+        self.tournament_titles = tuple(t.title for t in tournaments)
+        self.tournament_title_to_id = MappingProxyType({t.title: t.id for t in tournaments})
+        self.tournament_id_to_title = MappingProxyType({t.id: t.title for t in tournaments})
+
+    def get_tournament(self, tournament_id):
+        return self.tournament_by_id.get(tournament_id)
+
+    # --- 레벨 ---
+
+    def get_level(self, level_id):
+        row = self._connect().execute(f'SELECT {", ".join(LEVEL_FIELDS)} FROM levels WHERE id = ?',
+                                      (level_id,)).fetchone()
+        return Level(*row) if row else None
+
+    @staticmethod
+    def _read_bounds(conn):
+        # 콘텐츠 버전이 바뀔 때 잠금 안에서 한 번에 읽어 새 dict로 바꿔 끼웁니다. (세션 스레드는 읽기만 함)
+        # MIN과 MAX를 따로 읽어야 SQLite가 열 색인의 양 끝만 보고 끝냅니다.
+        bounds = {}
+        for column, expression in RANGE_EXPRESSIONS.items():
+            low = conn.execute(f'SELECT MIN({expression}) FROM levels l').fetchone()[0]
+            high = conn.execute(f'SELECT MAX({expression}) FROM levels l').fetchone()[0]
+            bounds[column] = None if low is None else (low, high)
+        return bounds
+
+    def bounds(self, column):
+        """열의 (최솟값, 최댓값). 값이 있는 레벨이 없으면 None (동기화할 때 열 색인에서 읽어 둔 값)"""
+        return self._bounds.get(column)
+
+    def all_levels(self):
+        """레벨 전체를 기본 순서(대소문자 무시 제목순, 같으면 id순)의 튜플로 읽는 함수
+
+        결과를 보관하지 않으므로 호출할 때마다 DB에서 읽습니다. 페이지는 query_levels()로 필요한 만큼만 읽으세요.
+        """
+        rows = self._connect().execute(f'SELECT {", ".join(LEVEL_FIELDS)} FROM levels ORDER BY title_sort, id')
+        return tuple(Level(*row) for row in rows)
+
+    def level_columns(self, fields):
+        """레벨 전체의 필드별 값 목록 dict (열 단위로 한 번에 읽음, 레코드 객체를 만들지 않음)"""
+        unknown = set(fields) - set(LEVEL_FIELDS)
+        if unknown:
+            raise ValueError(f'알 수 없는 레벨 필드: {sorted(unknown)}')
+        rows = self._connect().execute(f'SELECT {", ".join(fields)} FROM levels ORDER BY doc').fetchall()
+        return {field: [row[i] for row in rows] for i, field in enumerate(fields)}
+
+    def query_levels(self, tournament_id=None, search=None, ranges=None, sort_keys=(), page=1, page_size=50):
+        """필터, 검색, 범위, 정렬을 적용한 레벨 한 페이지를 (레벨 튜플, 전체 개수, 페이지) 로 반환하는 함수
+
+        전체 개수는 같은 쿼리의 스칼라 서브쿼리로 함께 받습니다. (COUNT(*) OVER ()는 모든 행을
+        정렬한 뒤에야 첫 행을 돌려주므로, 색인 순서대로 읽다가 LIMIT에서 멈출 수 없습니다)
+        page가 마지막 페이지보다 크면 마지막 페이지로 맞춥니다.
+        정렬 기준이 없으면 검색 중에는 관련도순, 아니면 제목순이며, 같은 값끼리는 제목순입니다.
+        """
+        where, params, order = [], [], []
+        joins = ''
+        if tournament_id is not None:
+            where.append('l.tournament_id = ?')
+            params.append(tournament_id)
+
+        # 입력 중인 검색어의 끝 숫자는 접은 형태로도 찾습니다. (search_index.query_variants 참고)
+        variants = query_variants(search) if search else ()
+        conn = self._connect()
+        score_sql, score_params = None, []
+        if variants:
+            joins = 'JOIN level_search s ON s.rowid = l.doc'
+            if self._needs_fuzzy(conn, variants):
+                # 정확히 일치하는 레벨이 적으면 3-gram이 절반 이상 겹치는 오타 후보도 찾습니다. (메모리 색인과 같은 규칙)
+                matchers = []
+                for variant in variants:
+                    query_grams = sorted({variant[i:i + GRAM_SIZE] for i in range(len(variant) - GRAM_SIZE + 1)})
+                    matchers.append((variant, query_grams, max(1, math.ceil(len(query_grams) * MIN_GRAM_RATIO))))
+                score_sql, score_params = _score_sql(matchers)
+                # 후보는 드문 3-gram 중 하나라도 들어 있는 레벨로 좁힌 뒤, 점수가 0보다 큰 것만 남깁니다.
+                if HAS_TRIGRAM and all(query_grams for _, query_grams, _ in matchers):
+                    where.append('s.level_search MATCH ?')
+                    params.append(_match_expression(self._fuzzy_terms(conn, matchers)))
+                where.append(f'{score_sql} > 0')
+                params.extend(score_params)
+            elif HAS_TRIGRAM and all(len(variant) >= 3 for variant in variants):
+                where.append('s.level_search MATCH ?')
+                params.append(_match_expression(variants))
+            else:
+                where.append('(' + ' OR '.join(f'instr(s.{field}, ?) > 0'
+                                               for _ in variants for field in SEARCH_FIELDS) + ')')
+                params.extend(variant for variant in variants for _ in SEARCH_FIELDS)
+
+        for column, (low, high) in (ranges or {}).items():
+            where.append(f'{RANGE_EXPRESSIONS[column]} BETWEEN ? AND ?')
+            params.extend((low, high))
+
+        for column, descending in sort_keys:
+            order.append(f'{SORT_EXPRESSIONS[column]} {"DESC" if descending else "ASC"} NULLS LAST')
+        if variants and not sort_keys:
+            if score_sql is None:
+                score_sql, score_params = _score_sql([(variant, (), 0) for variant in variants])
+            order.append(f'{score_sql} DESC')
+        else:
+            score_params = []
+        # 메모리 백엔드의 기본 순서(content_build.sort_records)와 같은 대소문자 무시 제목순, 같으면 id순
+        order.extend(('l.title_sort', 'l.id'))
+
+        columns = ', '.join(f'l.{field}' for field in LEVEL_FIELDS)
+        where_sql = ('WHERE ' + ' AND '.join(where)) if where else ''
+        count_sql = f'SELECT COUNT(*) FROM levels l {joins} {where_sql}'
+        sql = (f'SELECT {columns}, ({count_sql}) FROM levels l {joins} {where_sql} '
+               f'ORDER BY {", ".join(order)} LIMIT ? OFFSET ?')
+
+        page = max(page, 1)
+        rows = conn.execute(sql, params + params + score_params + [page_size, (page - 1) * page_size]).fetchall()
+        if rows:
+            return tuple(Level(*row[:-1]) for row in rows), rows[0][-1], page
+
+        # 빈 페이지: 범위를 벗어난 페이지라면 전체 개수를 세서 마지막 페이지를 다시 읽습니다.
+        total = conn.execute(count_sql, params).fetchone()[0]
+        last_page = max(1, -(-total // page_size))
+        if total == 0 or page <= last_page:
+            return (), total, min(page, last_page)
+        return self.query_levels(tournament_id, search, ranges, sort_keys, last_page, page_size)
+
+    def _needs_fuzzy(self, conn, variants):
+        """대회나 범위 필터와 관계없이 정확히 일치하는 레벨이 FUZZY_MIN_RESULTS개보다 적은지 확인하는 함수
+
+        메모리 색인처럼 전체 레벨 기준으로 판단하고, 검색어가 GRAM_SIZE자 이하이면 오타 검색을 하지 않습니다.
+        """
+        if len(variants[0]) <= GRAM_SIZE:
+            return False
+        if HAS_TRIGRAM and all(len(variant) >= 3 for variant in variants):
+            condition, params = 'level_search MATCH ?', [_match_expression(variants)]
+        else:
+            condition = ' OR '.join(f'instr({field}, ?) > 0' for _ in variants for field in SEARCH_FIELDS)
+            params = [variant for variant in variants for _ in SEARCH_FIELDS]
+        found = conn.execute(f'SELECT COUNT(*) FROM (SELECT 1 FROM level_search WHERE {condition} LIMIT ?)',
+                             params + [FUZZY_MIN_RESULTS]).fetchone()[0]
+        return found < FUZZY_MIN_RESULTS
+
+    def _fuzzy_terms(self, conn, matchers):
+        """오타 후보를 찾을 3-gram 목록 (SearchIndex._fuzzy_candidates와 같은 비둘기집 원리)
+
+        required개 이상 겹치는 레벨은 가장 드문 (k - required + 1)개 3-gram 중 적어도 하나를 포함하므로,
+        그 3-gram만 MATCH에 넣어도 후보가 빠지지 않습니다. 3-gram별 레벨 수는 FTS5 어휘 표에서 읽습니다.
+        """
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS temp.level_search_vocab USING fts5vocab(main, level_search, 'row')")
+        grams = sorted({gram for _, query_grams, _ in matchers for gram in query_grams})
+        counts = dict(conn.execute(f'SELECT term, doc FROM temp.level_search_vocab '
+                                   f'WHERE term IN ({", ".join("?" * len(grams))})', grams))
+        terms = set()
+        for _, query_grams, required in matchers:
+            rarest = sorted(query_grams, key=lambda gram: counts.get(gram, 0))
+            terms.update(rarest[:len(query_grams) - required + 1])
+        return sorted(terms)
+
+
+def _match_expression(terms):
+    # FTS5 MATCH 식: 각 문자열을 구절로 감싸 OR로 잇습니다.
+    return ' OR '.join('"' + term.replace('"', '""') + '"' for term in terms)
+
+def _score_sql(matchers):
+    """search_index의 필드 점수와 같은 규칙의 SQL 식과 매개변수 목록
+
+    matchers는 (검색어, 3-gram 목록, 필요한 겹침 수) 목록입니다. 처음 나오는 위치에 따라 일치 4, 접두 3, 단어 시작 2.5,
+    포함 2점이고, 아니면 3-gram이 필요한 수 이상 겹칠 때 1.5 × 겹친 비율입니다. 필드 가중치를 곱한 최댓값을 씁니다.
+    """
+    scores, params = [], []
+    for variant, query_grams, required in matchers:
+        for field in SEARCH_FIELDS:
+            fuzzy = '0'
+            if query_grams:
+                matched = ' + '.join(f'(instr(s.{field}, ?) > 0)' for _ in query_grams)
+                fuzzy = f'(SELECT CASE WHEN m >= {required} THEN 1.5 * m / {len(query_grams)} ELSE 0 END FROM (SELECT {matched} AS m))'
+            scores.append(f'(CASE WHEN s.{field} = ? THEN 4.0 WHEN instr(s.{field}, ?) = 1 THEN 3.0 '
+                          f"WHEN substr(s.{field}, instr(s.{field}, ?) - 1, 1) = ' ' THEN 2.5 WHEN instr(s.{field}, ?) > 0 THEN 2.0 "
+                          f'ELSE {fuzzy} END) * {FIELD_WEIGHTS.get(field, 0.5)}')
+            params.extend([variant] * 4)
+            params.extend(query_grams)
+    return f'max({", ".join(scores)})', params
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    started = time.perf_counter()
+    database = ContentDatabase(argv[0] if argv else CONTENT_DB_FILE).refresh()
+    conn = database._connect()
+    counts = {kind: conn.execute(f'SELECT COUNT(*) FROM {kind}').fetchone()[0] for kind in CONTENT_KINDS}
+    print(f'{database.db_file}: 대회 {counts["tournaments"]}개, 레벨 {counts["levels"]}개 '
+          f'({(time.perf_counter() - started) * 1000:.0f} ms, 버전 {database.version})')
+    for key, error in sorted(database.errors.items()):
+        print(f'  오류 {key}: {error}', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
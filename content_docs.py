@@ -0,0 +1,239 @@
+# content_docs.py
+#
+# content/news/*.md, content/players/*.md 문서 저장소.
+#   - 맨 앞의 --- 로 둘러싼 frontmatter는 대회/레벨과 같은 YAML 로더(content_build.load_yaml)로 읽습니다.
+#   - 본문 Markdown은 파일 내용 해시당 한 번만 HTML로 렌더링하고 허용 태그만 남긴 뒤(html_sanitize.py)
+#     build/rendered/에 저장해 둡니다. 서버를 다시 띄워도 내용이 같은 파일은 다시 렌더링하지 않습니다.
+#   - ContentStore처럼 파일별 mtime/크기/해시를 추적해 바뀐 파일만 다시 읽고,
+#     새 버전을 다 만든 뒤 한 번에 교체합니다. 페이지는 레코드의 html을 그대로 출력하기만 합니다.
+#
+# 사용법:  python content_docs.py   (렌더링 캐시를 미리 채워 두고 종료)
+
+import hashlib
+import logging
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+from types import MappingProxyType
+
+import markdown
+import yaml
+
+from content_build import CONTENT_DIR, load_yaml
+from html_sanitize import sanitize_html
+from records import RecordError, news_from_dict, player_from_dict
+
+logger = logging.getLogger(__name__)
+
+RENDER_CACHE_DIR = Path(os.environ.get('AWC_RENDER_CACHE_DIR', Path('build') / 'rendered'))
+
+# 렌더링 규칙(확장, 허용 태그)이 바뀌면 이 값을 올려서 기존 렌더링 캐시를 무효화합니다.
+RENDER_FORMAT = 1
+
+MARKDOWN_EXTENSIONS = ('extra', 'sane_lists')
+
+DOCUMENT_KINDS = ('news', 'players')
+
+RECORD_BUILDERS = {
+    'news': news_from_dict,
+    'players': player_from_dict,
+}
+
+# 한 번 만들어진 뒤에는 바뀌지 않는 문서 버전 (ContentVersion과 같은 방식으로 공유)
+# news_by_id/player_by_id는 상세 페이지의 ?id= 조회용 맵입니다. (ContentIndex의 id 맵과 같은 방식)
+DocumentVersion = namedtuple('DocumentVersion', ['version', 'news', 'players', 'news_by_id', 'player_by_id', 'errors'])
+
+_FileEntry = namedtuple('_FileEntry', ['kind', 'mtime_ns', 'size', 'sha1', 'record'])
+
+
+# --- 파싱과 렌더링 ---
+
+def split_frontmatter(text):
+    """'---'로 시작하는 frontmatter와 본문을 나눠 (frontmatter 원문, 본문)을 반환하는 함수
+
+    frontmatter가 없으면 ('', 전체)를 반환합니다. 구분선은 줄 전체가 '---'인 경우만 인정하므로
+    본문 안의 수평선(---)이나 제목 안의 대시는 잘리지 않습니다.
+    """
+    text = text.lstrip('﻿')
+    lines = text.splitlines(keepends=True)
+    if not lines or lines[0].strip() != '---':
+        return '', text
+    for i, line in enumerate(lines[1:], start=1):
+        if line.strip() in ('---', '...'):
+            return ''.join(lines[1:i]), ''.join(lines[i + 1:])
+    return '', text  # 닫는 구분선이 없으면 frontmatter로 보지 않습니다.
+
+def render_markdown(body):
+    """Markdown 본문을 허용 태그만 남긴 HTML로 바꾸는 함수"""
+    return sanitize_html(markdown.markdown(body, extensions=list(MARKDOWN_EXTENSIONS)))
+
+def _cache_file(cache_dir, sha1):
+    return Path(cache_dir) / f'v{RENDER_FORMAT}' / sha1[:2] / f'{sha1}.html'
+
+def rendered_html(body, sha1, cache_dir=RENDER_CACHE_DIR):
+    """파일 해시 sha1의 본문 HTML (렌더링 캐시에 있으면 읽기만, 없으면 렌더링해서 저장)"""
+    cache_file = _cache_file(cache_dir, sha1) if cache_dir else None
+    if cache_file is not None:
+        try:
+            return cache_file.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            pass
+
+    html_text = render_markdown(body)
+    if cache_file is not None:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 이름을 바꿉니다.
+            tmp_file = cache_file.with_name(f'{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+            tmp_file.write_text(html_text, encoding='utf-8')
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.warning('렌더링 캐시를 저장하지 못했습니다: %s: %s', cache_file, e)
+    return html_text
+
+def parse_document(kind, filepath, raw, cache_dir=RENDER_CACHE_DIR):
+    """Markdown 문서 원문을 읽어 검증된 NewsPost/Player 레코드로 변환하는 함수"""
+    sha1 = hashlib.sha1(raw).hexdigest()
+    frontmatter, body = split_frontmatter(raw.decode('utf-8'))
+    data = load_yaml(frontmatter) if frontmatter.strip() else {}
+    html_text = rendered_html(body, sha1, cache_dir)
+    return RECORD_BUILDERS[kind](Path(filepath).stem, sha1[:12], data, html_text)
+
+def sort_documents(kind, records):
+    """목록 페이지에서 사용하는 기본 순서로 정렬하는 함수 (뉴스는 최신순, 선수는 닉네임순)"""
+    if kind == 'news':
+        records.sort(key=lambda n: (n.date or '0000-00-00', n.id), reverse=True)
+    else:
+        records.sort(key=lambda p: p.nickname.casefold())
+    return records
+
+def list_documents(content_dir=CONTENT_DIR):
+    """종류별 Markdown 소스 파일 경로 목록을 반환하는 함수"""
+    sources = {}
+    for kind in DOCUMENT_KINDS:
+        kind_path = Path(content_dir) / kind
+        sources[kind] = sorted(kind_path.glob('*.md')) if kind_path.exists() else []
+    return sources
+
+
+# --- 저장소 ---
+
+def _version_id(entries):
+    digest = hashlib.sha1()
+    for key in sorted(entries):
+        digest.update(key.encode('utf-8'))
+        digest.update(entries[key].sha1.encode('ascii'))
+    return digest.hexdigest()[:16]
+
+
+class DocumentStore:
+    """content/news, content/players 변경분만 다시 읽어 새 버전으로 교체하는 저장소
+
+    current()는 check_interval 초에 한 번만 디스크를 확인하므로 매 rerun마다 호출해도 부담이 작습니다.
+    """
+
+    def __init__(self, content_dir=CONTENT_DIR, cache_dir=RENDER_CACHE_DIR, check_interval=2.0):
+        self.content_dir = Path(content_dir)
+        self.cache_dir = cache_dir
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._current = None
+        self._last_check = 0.0
+
+    def _is_stale(self):
+        return self._current is None or time.monotonic() - self._last_check >= self.check_interval
+
+    def current(self):
+        """최신 문서 버전을 반환하는 함수 (필요하면 변경분을 먼저 반영)
+
+        여러 세션이 동시에 호출해도 디스크 확인과 렌더링은 한 스레드만 합니다. (ContentStore.current 참고)
+        """
+        if self._is_stale():
+            with self._lock:
+                if self._is_stale():
+                    return self._refresh_locked()
+        return self._current
+
+    def refresh(self):
+        """디스크 상태와 비교해 추가/변경/삭제된 문서만 반영하는 함수"""
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self):
+        entries, errors = self._scan()
+        if (self._current is None or entries.keys() != self._entries.keys()
+                or any(entries[key].record is not self._entries[key].record for key in entries)
+                or errors != self._current.errors):
+            self._current = self._build_version(entries, errors)
+            for key, error in sorted(errors.items()):
+                logger.warning('문서 파일을 읽지 못했습니다: %s: %s', key, error)
+        self._entries = entries
+        self._last_check = time.monotonic()
+        return self._current
+
+    def _scan(self):
+        entries = {}
+        errors = {}
+        for kind, paths in list_documents(self.content_dir).items():
+            for filepath in paths:
+                key = filepath.relative_to(self.content_dir).as_posix()
+                previous = self._entries.get(key)
+                try:
+                    stat = os.stat(filepath)
+                except FileNotFoundError:
+                    continue  # 스캔 도중 삭제된 파일
+
+                if previous and previous.mtime_ns == stat.st_mtime_ns and previous.size == stat.st_size:
+                    entries[key] = previous
+                    continue
+
+                raw = filepath.read_bytes()
+                sha1 = hashlib.sha1(raw).hexdigest()
+                if previous and previous.sha1 == sha1:
+                    entries[key] = previous._replace(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                    continue
+
+                try:
+                    record = parse_document(kind, filepath, raw, self.cache_dir)
+                except (yaml.YAMLError, RecordError, UnicodeDecodeError) as e:
+                    # 편집 도중 잘못 저장된 파일은 이전 버전을 유지하고 오류만 기록합니다.
+                    errors[key] = str(e)
+                    if previous:
+                        entries[key] = previous
+                    continue
+                entries[key] = _FileEntry(kind, stat.st_mtime_ns, stat.st_size, sha1, record)
+        return entries, errors
+
+    def _build_version(self, entries, errors):
+        records = {kind: [] for kind in DOCUMENT_KINDS}
+        for entry in entries.values():
+            records[entry.kind].append(entry.record)
+        news = tuple(sort_documents('news', records['news']))
+        players = tuple(sort_documents('players', records['players']))
+        return DocumentVersion(
+            version=_version_id(entries),
+            news=news,
+            players=players,
+            news_by_id=MappingProxyType({post.id: post for post in news}),
+            player_by_id=MappingProxyType({player.id: player for player in players}),
+            errors=MappingProxyType(errors),
+        )
+
+
+def main():
+    started = time.perf_counter()
+    documents = DocumentStore(check_interval=0).current()
+    for key, error in sorted(documents.errors.items()):
+        print(f'  오류: {key}: {error}', file=sys.stderr)
+    elapsed = time.perf_counter() - started
+    print(f'문서 렌더링 캐시 준비: 뉴스 {len(documents.news)}개, 선수 {len(documents.players)}개 '
+          f'→ {RENDER_CACHE_DIR} ({elapsed:.2f}s)')
+    return 1 if documents.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
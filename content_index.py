@@ -0,0 +1,72 @@
+# content_index.py
+#
+# 콘텐츠 버전 하나에 대해 한 번만 만들어지는 조회용 인덱스.
+# 페이지에서 ?id= 조회나 대회별 레벨 필터를 할 때 전체 목록을 훑지 않도록
+# id → 레코드 맵과 tournament_id → 레벨 목록 보조 인덱스를 미리 만들어 둡니다.
+
+import threading
+from types import MappingProxyType
+
+from search_index import SearchIndex
+from sort_index import SortIndex
+
+
+class ContentIndex:
+    """id 조회, 대회별 레벨 목록, 정렬된 대회 목록을 제공하는 읽기 전용 인덱스
+
+    st.cache_resource로 프로세스에 하나만 두고 모든 세션이 공유하므로,
+    목록은 튜플, 조회 맵은 MappingProxyType으로 만들어 실수로 고칠 수 없게 합니다.
+    """
+
+    def __init__(self, content):
+        self.version = content.version
+
+        # 대회 목록은 load_tournaments와 같은 순서(연도 내림차순)로 이미 정렬되어 있습니다.
+        self.tournaments = content.tournaments
+        self.levels = content.levels
+
+        self.tournament_by_id = MappingProxyType({t.id: t for t in self.tournaments})
+        self.level_by_id = MappingProxyType({lvl.id: lvl for lvl in self.levels})
+
+        # 레벨 목록(제목순)을 한 번 훑어서 대회별로 나눕니다. 각 목록도 제목순을 유지합니다.
+        levels_by_tournament = {}
+        for lvl in self.levels:
+            levels_by_tournament.setdefault(lvl.tournament_id, []).append(lvl)
+        self.levels_by_tournament = MappingProxyType({key: tuple(levels) for key, levels in levels_by_tournament.items()})
+
+        self.tournament_titles = tuple(t.title for t in self.tournaments)
+        self.tournament_title_to_id = MappingProxyType({t.title: t.id for t in self.tournaments})
+        self.tournament_id_to_title = MappingProxyType({t.id: t.title for t in self.tournaments})
+
+        self._search_index = None
+        self._sort_index = None
+        # 여러 세션이 동시에 처음 검색/정렬해도 색인은 한 번만 만듭니다. (나머지는 완성될 때까지 기다림)
+        self._search_lock = threading.Lock()
+        self._sort_lock = threading.Lock()
+
+    @property
+    def search_index(self):
+        """레벨 검색 색인 (처음 검색할 때 한 번만 만듭니다)"""
+        if self._search_index is None:
+            with self._search_lock:
+                if self._search_index is None:
+                    self._search_index = SearchIndex(self.levels)
+        return self._search_index
+
+    @property
+    def sort_index(self):
+        """레벨 정렬/범위 필터 색인 (처음 정렬하거나 범위를 걸 때 한 번만 만듭니다)"""
+        if self._sort_index is None:
+            with self._sort_lock:
+                if self._sort_index is None:
+                    self._sort_index = SortIndex(self.levels)
+        return self._sort_index
+
+    def get_tournament(self, tournament_id):
+        return self.tournament_by_id.get(tournament_id)
+
+    def get_level(self, level_id):
+        return self.level_by_id.get(level_id)
+
+    def levels_for_tournament(self, tournament_id):
+        return self.levels_by_tournament.get(tournament_id, ())
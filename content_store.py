@@ -0,0 +1,159 @@
+# content_store.py
+#
+# content/ 파일별 mtime/크기/해시를 추적하면서 바뀐 파일만 다시 파싱하는 콘텐츠 저장소.
+# 새 버전은 완전히 만들어진 뒤에 한 번에 교체되므로, 이미 렌더링 중인 세션은
+# 이전 버전을 그대로 사용하고 다음 rerun부터 새 버전을 보게 됩니다.
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+from types import MappingProxyType
+
+from content_build import (CONTENT_DIR, CONTENT_KINDS, SNAPSHOT_FILE,
+                           list_sources, parse_many, read_snapshot, sort_records)
+
+logger = logging.getLogger(__name__)
+
+# 한 번 만들어진 뒤에는 바뀌지 않는 콘텐츠 버전
+# version: 모든 소스 파일 해시로 만든 식별자 (캐시 키로 사용)
+# tournaments/levels는 frozen 레코드의 튜플, errors는 읽기 전용 매핑이라
+# 모든 세션이 복사 없이 같은 객체를 그대로 공유합니다.
+ContentVersion = namedtuple('ContentVersion', ['version', 'tournaments', 'levels', 'errors'])
+
+# 소스 파일 하나의 추적 상태
+_FileEntry = namedtuple('_FileEntry', ['kind', 'mtime_ns', 'size', 'sha1', 'record'])
+
+
+def _version_id(entries):
+    digest = hashlib.sha1()
+    for key in sorted(entries):
+        digest.update(key.encode('utf-8'))
+        digest.update(entries[key].sha1.encode('ascii'))
+    return digest.hexdigest()[:16]
+
+
+class ContentStore:
+    """content/ 변경분만 다시 읽어 새 버전으로 교체하는 저장소
+
+    current()는 check_interval 초에 한 번만 디스크를 확인하므로
+    매 rerun마다 호출해도 부담이 작습니다.
+    """
+
+    def __init__(self, content_dir=CONTENT_DIR, snapshot_file=SNAPSHOT_FILE, check_interval=2.0):
+        self.content_dir = Path(content_dir)
+        self.snapshot_file = snapshot_file
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._current = None
+        self._last_check = 0.0
+
+    def _is_stale(self):
+        return self._current is None or time.monotonic() - self._last_check >= self.check_interval
+
+    def current(self):
+        """최신 콘텐츠 버전을 반환하는 함수 (필요하면 변경분을 먼저 반영)
+
+        확인 주기가 지난 뒤 여러 세션이 동시에 호출해도 디스크 확인은 한 스레드만 하고,
+        나머지는 잠금을 기다렸다가 방금 만들어진 버전을 그대로 받습니다.
+        """
+        if self._is_stale():
+            with self._lock:
+                if self._is_stale():
+                    return self._refresh_locked()
+        return self._current
+
+    def refresh(self):
+        """디스크 상태와 비교해 추가/변경/삭제된 파일만 반영하는 함수"""
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self):
+        if self._current is None:
+            self._seed_from_snapshot()
+
+        entries, changed, errors = self._scan()
+        if changed or self._current is None:
+            self._current = self._build_version(entries, errors)
+            # 잘못된 파일은 건너뛰고, 어떤 파일의 어떤 필드가 문제인지 서버 로그에 남깁니다.
+            for key, error in sorted(errors.items()):
+                logger.warning('콘텐츠 파일을 읽지 못했습니다: %s: %s', key, error)
+        self._entries = entries
+        self._last_check = time.monotonic()
+        return self._current
+
+    def _seed_from_snapshot(self):
+        # 빌드된 스냅샷이 있으면 (오래됐더라도) 그 레코드를 초기 상태로 사용합니다.
+        # 스냅샷이 만들어진 뒤 바뀐 파일만 이어지는 _scan()에서 다시 파싱됩니다.
+        snapshot = read_snapshot(self.snapshot_file) if self.snapshot_file else None
+        if snapshot is None:
+            return
+        records_by_id = {
+            kind: {record.id: record for record in snapshot[kind]}
+            for kind in CONTENT_KINDS
+        }
+        for key, meta in snapshot['manifest'].items():
+            kind = key.split('/', 1)[0]
+            record = records_by_id.get(kind, {}).get(Path(key).stem)
+            if record is not None:
+                self._entries[key] = _FileEntry(kind, meta['mtime_ns'], meta['size'], meta['sha1'], record)
+
+    def _scan(self):
+        entries = {}
+        errors = {}
+        pending = []
+        changed = False
+        for kind, paths in list_sources(self.content_dir).items():
+            for filepath in paths:
+                key = filepath.relative_to(self.content_dir).as_posix()
+                previous = self._entries.get(key)
+                try:
+                    stat = os.stat(filepath)
+                except FileNotFoundError:
+                    continue  # 스캔 도중 삭제된 파일
+
+                if previous and previous.mtime_ns == stat.st_mtime_ns and previous.size == stat.st_size:
+                    entries[key] = previous
+                    continue
+
+                raw = filepath.read_bytes()
+                sha1 = hashlib.sha1(raw).hexdigest()
+                if previous and previous.sha1 == sha1:
+                    # 내용은 같고 mtime만 바뀐 경우: 다시 파싱하지 않습니다.
+                    entries[key] = previous._replace(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                    continue
+
+                pending.append((key, kind, filepath, raw, stat, sha1))
+
+        # 새로 파싱할 파일은 한 번에 모아서 파싱합니다 (첫 로드처럼 많으면 병렬 처리).
+        results = parse_many((kind, filepath, raw) for _, kind, filepath, raw, _, _ in pending)
+        for (key, kind, _, _, stat, sha1), (record, error) in zip(pending, results):
+            if error is not None:
+                # 편집 도중 잘못 저장된 파일은 이전 버전을 유지하고 오류만 기록합니다.
+                errors[key] = error
+                if key in self._entries:
+                    entries[key] = self._entries[key]
+                continue
+            entries[key] = _FileEntry(kind, stat.st_mtime_ns, stat.st_size, sha1, record)
+            changed = True
+
+        if entries.keys() != self._entries.keys():
+            changed = True  # 추가 또는 삭제된 파일
+        if self._current is not None and errors != self._current.errors:
+            changed = True
+        return entries, changed, errors
+
+    def _build_version(self, entries, errors):
+        records = {kind: [] for kind in CONTENT_KINDS}
+        for entry in entries.values():
+            records[entry.kind].append(entry.record)
+        return ContentVersion(
+            version=_version_id(entries),
+            tournaments=tuple(sort_records('tournaments', records['tournaments'])),
+            levels=tuple(sort_records('levels', records['levels'])),
+            errors=MappingProxyType(errors),
+        )
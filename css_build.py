@@ -0,0 +1,190 @@
+# css_build.py
+#
+# 스타일시트 빌드 단계.
+#   - 런타임: style.css를 압축(minify)하고 해시를 붙여 프로세스당 한 번만 만들어 둡니다.
+#             (inject_local_css가 이 결과를 사용)
+#   - 빌드:   python css_build.py [--font-dir fonts/src]
+#             content/와 UI 문자열에 실제로 쓰인 글자만 담은 Noto Sans KR 부분 글꼴(woff2)을
+#             static/fonts/에 만들고, 압축된 스타일시트를 static/css/style.<해시>.css로 저장합니다.
+#             Streamlit 정적 파일 핸들러가 .css를 text/css로 보내므로, 앱은 원본이 그대로인 동안
+#             이 파일을 <link>로 걸어 브라우저 캐시를 쓰고 페이지마다 스타일을 인라인하지 않습니다.
+#
+# 부분 글꼴을 만들려면 fontTools와 brotli(requirements-build.txt)가 필요하고, --font-dir에 Noto Sans KR의
+# 굵기별 TTF/OTF 원본(NotoSansKR-Regular/Medium/Bold)이 있어야 합니다.
+
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+from bundle import bundle_url
+
+ROOT_DIR = Path(__file__).parent
+STATIC_DIR = ROOT_DIR / 'static'
+FONTS_DIR = STATIC_DIR / 'fonts'
+FONT_MANIFEST_FILE = FONTS_DIR / 'manifest.json'
+CSS_STATIC_DIR = STATIC_DIR / 'css'
+STYLESHEET_MANIFEST_FILE = CSS_STATIC_DIR / 'manifest.json'
+DEFAULT_FONT_SOURCE_DIR = ROOT_DIR / 'fonts' / 'src'
+
+FONT_FAMILY = 'Noto Sans KR'
+FONT_WEIGHTS = {400: 'Regular', 500: 'Medium', 700: 'Bold'}
+
+# 글꼴 URL은 Streamlit 정적 파일 서빙 경로를 사용합니다. (woff2는 허용 목록에 있는 형식)
+FONT_URL_PREFIX = 'app/static'
+
+# 부분 글꼴에 넣을 글자를 모으는 소스 (콘텐츠 + 화면에 보이는 UI 문자열)
+GLYPH_SOURCES = ('content/**/*.yaml', 'content/**/*.md', '*.py', 'pages/*.py', 'style.css')
+
+
+# --- 압축 ---
+
+_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_STRING_RE = re.compile(r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')')
+
+
+def minify_css(css):
+    """주석과 불필요한 공백을 제거하는 간단한 CSS 압축기 (문자열 리터럴 안은 건드리지 않음)"""
+    css = _COMMENT_RE.sub('', css)
+    parts = _STRING_RE.split(css)
+    for i in range(0, len(parts), 2):  # 짝수 번째 조각만 문자열 밖
+        chunk = re.sub(r'\s+', ' ', parts[i])
+        chunk = re.sub(r'\s*([{};,>])\s*', r'\1', chunk)
+        chunk = re.sub(r':\s+', ':', chunk)
+        chunk = chunk.replace(';}', '}')
+        parts[i] = chunk
+    return ''.join(parts).strip()
+
+
+def _app_font_url(face):
+    # 번들(bundle.py)에 같은 글꼴이 있으면 번들 주소, 없으면 정적 파일 서빙 주소
+    return bundle_url(face['path'], face['sha1']) or f"{FONT_URL_PREFIX}/{face['path']}?v={face['sha1']}"
+
+
+def font_face_css(font_manifest, font_url=None):
+    """부분 글꼴 매니페스트로 @font-face 규칙을 만드는 함수 (font_url: 글꼴 face → 주소)"""
+    font_url = font_url or _app_font_url
+    rules = []
+    for face in font_manifest.get('faces', []):
+        url = font_url(face)
+        if not url:
+            continue
+        rules.append(
+            f"@font-face{{font-family:'{font_manifest['family']}';font-style:normal;"
+            f"font-weight:{face['weight']};font-display:swap;"
+            f"src:url('{url}') format('woff2')}}"
+        )
+    return ''.join(rules)
+
+
+def load_stylesheet_manifest():
+    """static/css/에 빌드된 스타일시트 정보 {file, sha1, source_sha1} (없으면 빈 dict)"""
+    try:
+        return json.loads(STYLESHEET_MANIFEST_FILE.read_text(encoding='utf-8'))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def load_font_manifest():
+    try:
+        return json.loads(FONT_MANIFEST_FILE.read_text(encoding='utf-8'))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def compile_css(file_name, font_url=None):
+    """style.css를 압축하고 (부분 글꼴이 있으면) @font-face를 앞에 붙인 결과와 해시를 반환하는 함수"""
+    css = Path(file_name).read_text(encoding='utf-8')
+    compiled = font_face_css(load_font_manifest(), font_url) + minify_css(css)
+    return compiled, hashlib.sha1(compiled.encode('utf-8')).hexdigest()[:12]
+
+
+def build_stylesheet(source):
+    """압축한 스타일시트를 static/css/style.<해시>.css로 저장하고 (파일 경로, 내용)을 반환하는 함수"""
+    # 글꼴 주소는 스타일시트 파일 기준 상대 경로(static/css/ → static/fonts/)로 씁니다.
+    compiled, digest = compile_css(source, font_url=lambda face: f"../{face['path']}?v={face['sha1']}")
+    CSS_STATIC_DIR.mkdir(parents=True, exist_ok=True)
+    out_file = CSS_STATIC_DIR / f'style.{digest}.css'
+    out_file.write_text(compiled, encoding='utf-8')
+    for stale in CSS_STATIC_DIR.glob('style.*.css'):
+        if stale != out_file:
+            stale.unlink()
+    manifest = {'file': out_file.name, 'sha1': digest,
+                'source_sha1': hashlib.sha1(Path(source).read_bytes()).hexdigest()}
+    STYLESHEET_MANIFEST_FILE.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    return out_file, compiled
+
+
+# --- 부분 글꼴 ---
+
+def collect_glyphs(root=ROOT_DIR):
+    """콘텐츠와 UI 문자열에 쓰인 글자 집합 (ASCII 출력 가능 문자는 항상 포함)"""
+    glyphs = {chr(c) for c in range(0x20, 0x7F)}
+    for pattern in GLYPH_SOURCES:
+        for path in Path(root).glob(pattern):
+            glyphs.update(path.read_text(encoding='utf-8', errors='ignore'))
+    return {g for g in glyphs if g.isprintable()}
+
+
+def build_font_subsets(font_source_dir):
+    from fontTools import subset
+
+    glyphs = ''.join(sorted(collect_glyphs()))
+    FONTS_DIR.mkdir(parents=True, exist_ok=True)
+    faces = []
+    for weight, style_name in FONT_WEIGHTS.items():
+        candidates = [p for ext in ('ttf', 'otf') for p in Path(font_source_dir).glob(f'NotoSansKR-{style_name}.{ext}')]
+        if not candidates:
+            print(f'  원본 글꼴 없음, 건너뜀: NotoSansKR-{style_name}', file=sys.stderr)
+            continue
+
+        options = subset.Options()
+        options.flavor = 'woff2'
+        options.layout_features = ['*']
+        font = subset.load_font(str(candidates[0]), options)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(text=glyphs)
+        subsetter.subset(font)
+
+        tmp_file = FONTS_DIR / f'noto-sans-kr-{weight}.woff2.tmp'
+        subset.save_font(font, str(tmp_file), options)
+        data = tmp_file.read_bytes()
+        digest = hashlib.sha1(data).hexdigest()[:12]
+        out_file = FONTS_DIR / f'noto-sans-kr-{weight}.{digest}.woff2'
+        tmp_file.replace(out_file)
+        faces.append({'weight': weight, 'path': out_file.relative_to(STATIC_DIR).as_posix(), 'sha1': digest, 'bytes': len(data)})
+        print(f'  부분 글꼴 생성: {out_file.name} ({len(data) // 1024} KB)')
+
+    keep = {STATIC_DIR / face['path'] for face in faces}
+    for stale in FONTS_DIR.glob('noto-sans-kr-*.woff2'):
+        if stale not in keep:
+            stale.unlink()
+
+    manifest = {'family': FONT_FAMILY, 'glyph_count': len(glyphs), 'faces': faces}
+    FONT_MANIFEST_FILE.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+    return manifest
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    font_source_dir = Path(argv[argv.index('--font-dir') + 1]) if '--font-dir' in argv else DEFAULT_FONT_SOURCE_DIR
+
+    if font_source_dir.exists():
+        try:
+            manifest = build_font_subsets(font_source_dir)
+            print(f'글꼴 매니페스트 저장: {FONT_MANIFEST_FILE} (글자 {manifest["glyph_count"]}개)')
+        except ImportError:
+            print('부분 글꼴을 만들려면 fontTools와 brotli가 필요합니다: pip install -r requirements-build.txt', file=sys.stderr)
+            return 1
+    else:
+        print(f'글꼴 원본 폴더가 없어 부분 글꼴 생성을 건너뜁니다: {font_source_dir}')
+
+    out_file, compiled = build_stylesheet(ROOT_DIR / 'style.css')
+    original_size = (ROOT_DIR / 'style.css').stat().st_size
+    print(f'스타일시트 저장: {out_file} ({original_size:,} → {len(compiled.encode("utf-8")):,} bytes)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,50 +1,134 @@
 # dataLoad.py (최종 버전)
 
+import os
 import streamlit as st
-import yaml
-from pathlib import Path
+from content_build import CONTENT_DIR, SNAPSHOT_FILE
+from content_store import ContentStore
+from content_index import ContentIndex
+from content_db import CONTENT_DB_FILE, ContentDatabase
+from content_docs import RENDER_CACHE_DIR, DocumentStore
+from metrics import timed
+from similar_levels import SimilarLevels
+from level_stats import LevelColumns, LevelStatsStore
 
-CONTENT_DIR = Path('content')
+# AWC_CONTENT_BACKEND=sqlite 이면 레벨 목록을 메모리 대신 SQLite(content_db.py)에서 조회합니다.
+USE_CONTENT_DB = os.environ.get('AWC_CONTENT_BACKEND', 'memory') == 'sqlite'
 
-@st.cache_data
+@st.cache_resource
+def get_content_store():
+    """프로세스 전체에서 공유하는 콘텐츠 저장소
+
+    저장소가 파일별 mtime/해시를 추적하므로, 레벨 YAML 하나를 고치면
+    그 파일만 다시 파싱되고 나머지 세션은 이전 버전을 계속 사용합니다.
+    """
+    return ContentStore(CONTENT_DIR, SNAPSHOT_FILE)
+
+@timed('content.load')
+def load_content():
+    """현재 콘텐츠 버전(ContentVersion)을 반환하는 함수"""
+    return get_content_store().current()
+
+# 콘텐츠 버전의 목록은 frozen 레코드의 튜플이라 st.cache_data처럼 호출마다 복사본을 만들 필요가 없습니다.
+# 모든 세션이 저장소가 가진 같은 튜플을 그대로 받습니다. (rerun마다 목록 크기만큼 할당하지 않음)
+@timed('content.tournaments')
 def load_tournaments():
-    tournaments = []
-    tournaments_path = CONTENT_DIR / 'tournaments'
-    if not tournaments_path.exists(): return tournaments
-    
-    for filepath in tournaments_path.glob('*.yaml'):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            data['id'] = filepath.stem
-            
-            # YAML 파일에 bg_image_class가 명시적으로 있으면 그것을 사용하고,
-            # 없으면 제목을 기반으로 동적으로 생성합니다. (더 안정적인 방식)
-            if 'bg_image_class' not in data:
-                year = data.get('year', '')
-                if year:
-                    data['bg_image_class'] = f'tournament_bg_{year}'
-                else:
-                    data['bg_image_class'] = ''
-            
-            tournaments.append(data)
-            
-    tournaments.sort(key=lambda t: t.get('year', '0000'), reverse=True)
-    return tournaments
-
-# dataLoad.py 파일에 추가
-
-@st.cache_data
+    if USE_CONTENT_DB:
+        return load_content_database().tournaments
+    return load_content().tournaments
+
+@timed('content.levels')
 def load_levels():
-    levels = []
-    levels_path = CONTENT_DIR / 'levels'
-    if not levels_path.exists(): return levels
-    
-    for filepath in levels_path.glob('*.yaml'):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            data['id'] = filepath.stem
-            levels.append(data)
-            
-    # 레벨 이름순으로 정렬 (선택 사항)
-    levels.sort(key=lambda l: l.get('title', ''))
-    return levels
\ No newline at end of file
+    """레벨 전체 튜플 (기본 순서)
+
+    SQLite 백엔드에서는 메모리 콘텐츠 저장소를 만들지 않고 DB에서 읽기만 합니다.
+    (프로세스마다 모든 레벨을 들고 있지 않도록. 목록 페이지는 query_levels()로 한 페이지만 읽음)
+    """
+    if USE_CONTENT_DB:
+        return load_content_database().all_levels()
+    return load_content().levels
+
+# 인덱스는 콘텐츠 버전마다 한 번만 만들고 모든 세션이 같은 읽기 전용 객체를 공유합니다.
+@st.cache_resource(max_entries=2)
+def _index_for_version(version, _content):
+    return ContentIndex(_content)
+
+@timed('content.index')
+def load_content_index():
+    """현재 콘텐츠 버전의 ContentIndex를 반환하는 함수"""
+    content = load_content()
+    return _index_for_version(content.version, content)
+
+@st.cache_resource
+def get_content_database():
+    """프로세스 전체에서 공유하는 SQLite 콘텐츠 DB (연결은 스레드마다 따로 엽니다)"""
+    return ContentDatabase(CONTENT_DB_FILE, CONTENT_DIR)
+
+@timed('content.database')
+def load_content_database():
+    """변경분을 반영한 ContentDatabase를 반환하는 함수"""
+    return get_content_database().current()
+
+def load_catalog():
+    """페이지에서 쓸 조회 객체 (백엔드에 따라 ContentDatabase 또는 ContentIndex)
+
+    둘 다 tournaments, get_tournament(), get_level(), tournament_titles와 제목↔id 맵을 같은 이름으로 제공합니다.
+    """
+    return load_content_database() if USE_CONTENT_DB else load_content_index()
+
+# 비슷한 레벨 표도 콘텐츠 버전마다 한 번만 계산합니다. (레벨 하나를 고치면 새 버전에서 다시 계산)
+@st.cache_resource(max_entries=2)
+def _similar_for_version(version, _catalog):
+    if USE_CONTENT_DB:
+        return SimilarLevels(_catalog.level_columns(SimilarLevels.FIELDS))
+    return SimilarLevels.from_levels(_catalog.levels)
+
+@timed('content.similar')
+def load_similar_levels():
+    """현재 콘텐츠 버전의 SimilarLevels (레벨 id → 비슷한 레벨 id 목록)"""
+    catalog = load_content_database() if USE_CONTENT_DB else load_content()
+    return _similar_for_version(catalog.version, catalog)
+
+@st.cache_resource
+def get_level_stats_store():
+    """프로세스 전체에서 공유하는 대회별 레벨 집계 저장소 (level_stats.py)
+
+    콘텐츠 버전이 바뀌면 레벨 구성이 달라진 대회만 다시 집계하고 나머지는 이전 결과를 씁니다.
+    """
+    return LevelStatsStore()
+
+@timed('content.tournament_stats')
+def load_tournament_stats():
+    """현재 콘텐츠 버전의 대회별 집계 (get(tournament_id) → TournamentStats 또는 None)"""
+    if USE_CONTENT_DB:
+        database = load_content_database()
+        return get_level_stats_store().for_version(
+            database.version, lambda: LevelColumns(database.level_columns(LevelColumns.FIELDS)))
+    content = load_content()
+    return get_level_stats_store().for_version(content.version, lambda: LevelColumns.from_levels(content.levels))
+
+@st.cache_resource
+def get_document_store():
+    """프로세스 전체에서 공유하는 뉴스/선수 문서 저장소
+
+    Markdown 본문은 파일 해시당 한 번만 렌더링되어 build/rendered/에 남으므로,
+    페이지는 레코드의 html을 그대로 출력하기만 합니다. (content_docs.py 참고)
+    """
+    return DocumentStore(CONTENT_DIR, RENDER_CACHE_DIR)
+
+@timed('content.news')
+def load_news():
+    """최신순으로 정렬된 뉴스 레코드 튜플"""
+    return get_document_store().current().news
+
+@timed('content.players')
+def load_players():
+    """닉네임순으로 정렬된 선수 레코드 튜플"""
+    return get_document_store().current().players
+
+def get_news(news_id):
+    """id로 뉴스 레코드를 찾는 함수 (없으면 None, 목록을 훑지 않고 id 맵에서 조회)"""
+    return get_document_store().current().news_by_id.get(news_id)
+
+def get_player(player_id):
+    """id로 선수 레코드를 찾는 함수 (없으면 None, 목록을 훑지 않고 id 맵에서 조회)"""
+    return get_document_store().current().player_by_id.get(player_id)
@@ -0,0 +1,390 @@
+# export_site.py
+#
+# 모든 페이지를 정적 HTML로 미리 렌더링해서 CDN으로 서빙할 수 있게 내보내는 스크립트.
+# 앱과 같은 카드/행/정보 박스 컴포넌트(ui_components.py)를 사용하며, 내보낸 사이트는
+# content/가 바뀔 때만 달라지므로 결승 같은 트래픽이 몰리는 시간에 읽기 부하를 대신 받습니다.
+#
+# 사용법:  python export_site.py [출력 폴더=build/site] [--base-url https://example.com]
+#
+# 출력 구조
+#   index.html                          홈 (대회 카드)
+#   Tournaments/index.html              대회 목록
+#   Tournaments/<id>/index.html         대회 상세
+#   Levels/index.html, Levels/page/N/   레벨 목록 (페이지 단위)
+#   Levels/tournament/<id>/             대회별 레벨 목록
+#   Levels/<id>/index.html              레벨 상세
+#   News/, News/<id>/                   뉴스 목록/상세 (content/news/*.md)
+#   Players/, Players/<id>/             선수 목록/상세 (content/players/*.md)
+#   assets/<이름>.<해시>.<확장자>         지문(fingerprint)이 붙은 에셋
+#   sitemap.xml, _redirects, _headers   사이트맵, ?id= 주소 리다이렉트, 캐시 헤더
+#
+# 페이지마다 원본 레코드 해시를 .export-manifest.json에 기록해 두고, 다시 실행하면
+# 원본이 바뀐 페이지만 다시 씁니다.
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+from pathlib import Path
+from urllib.parse import quote
+from xml.sax.saxutils import escape as xml_escape
+
+from content_build import CONTENT_DIR
+from content_docs import DocumentStore
+from content_index import ContentIndex
+from content_store import ContentStore
+from css_build import compile_css
+from level_stats import LevelColumns
+from similar_levels import SimilarLevels
+from assets import STATIC_DIR, STATIC_URL_PREFIX, get_asset_registry
+from ui_components import (create_detail_button_link, create_detail_title, create_level_info_box,
+                           create_level_table, create_news_item, create_news_meta, create_player_card,
+                           create_rich_content, create_top_nav_bar_html, create_tournament_card, create_tournament_stats,
+                           create_video_embed, YOUTUBE_EAGER, YOUTUBE_POSTER_DIR)
+
+ROOT_DIR = Path(__file__).parent
+DEFAULT_OUTPUT_DIR = ROOT_DIR / 'build' / 'site'
+LOGO_IMAGE_FILE = STATIC_DIR / 'images' / 'awc_logo.png'
+SMALL_LOGO_IMAGE_FILE = STATIC_DIR / 'images' / 'awc_logo_small.png'
+
+DEFAULT_BASE_URL = os.environ.get('AWC_SITE_URL', 'http://localhost:8000')
+STATIC_PAGE_SIZE = 200
+MANIFEST_NAME = '.export-manifest.json'
+
+# 내보내기 형식(페이지 틀, URL 구조 등)이 바뀌면 올려서 모든 페이지를 다시 씁니다.
+EXPORT_FORMAT = 6
+
+FOOTER_HTML = '<div class="footer">© 에셋 저작권은 AWC, ADOFAI.gg에 있으며, 해당 사이트는 ADOFAI.gg에서 운영하지 않습니다.</div>'
+
+# Streamlit의 st.columns 배치를 대신하는 정적 페이지 전용 스타일
+EXPORT_CSS = (
+    '.block-container{max-width:1400px;margin:0 auto}'
+    '.static-grid{display:grid;grid-template-columns:repeat(var(--cols),minmax(0,1fr));gap:1rem}'
+    '.static-detail{display:grid;grid-template-columns:2fr 1fr;gap:3rem}'
+    '.static-links{display:flex;flex-wrap:wrap;gap:.75rem;margin:1rem 0}'
+    '.static-links a.detail-button-link{width:auto;flex:1 1 160px}'
+    '.static-pager{display:flex;justify-content:space-between;margin:1.5rem 0}'
+    '@media(max-width:768px){.static-grid,.static-detail{grid-template-columns:1fr}}'
+)
+
+_STATIC_URL_RE = re.compile(re.escape(STATIC_URL_PREFIX) + r"/([^'\"?)\s]+)\?v=([0-9a-f]+)")
+
+# 앱 주소(?id=)를 정적 경로로 바꾸는 규칙
+_LINK_RULES = (
+    (re.compile(r'href="/Tournaments\?id=([^"&]+)"'), r'href="/Tournaments/\1/"'),
+    (re.compile(r'href="/Levels\?tournament_id=([^"&]+)"'), r'href="/Levels/tournament/\1/"'),
+    (re.compile(r'href="/Levels\?id=([^"&]+)"'), r'href="/Levels/\1/"'),
+    (re.compile(r'href="/(News|Players)\?id=([^"&]+)"'), r'href="/\1/\2/"'),
+    (re.compile(r'href="/(Tournaments|Levels|News|Players)"'), r'href="/\1/"'),
+)
+
+
+class SiteExporter:
+    def __init__(self, output_dir, base_url=DEFAULT_BASE_URL):
+        self.output_dir = Path(output_dir)
+        self.base_url = base_url.rstrip('/')
+        self.assets = {}  # static/ 기준 경로 → assets/ 기준 지문 경로
+        self.pages = {}   # 출력 경로 → 원본 해시
+        self.written = 0
+        self.skipped = 0
+        try:
+            self.previous = json.loads((self.output_dir / MANIFEST_NAME).read_text(encoding='utf-8'))
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.previous = {}
+
+    # --- 에셋 ---
+
+    def publish_asset(self, source_file, data=None):
+        """파일을 assets/<이름>.<해시><확장자>로 복사하고 사이트 기준 URL을 반환하는 함수"""
+        source_file = Path(source_file)
+        data = source_file.read_bytes() if data is None else data
+        digest = hashlib.sha1(data).hexdigest()[:12]
+        # 번들(bundle.py) 파일은 이름에 이미 같은 해시가 붙어 있습니다.
+        stem = source_file.stem.removesuffix(f'.{digest}')
+        name = f'{stem}.{digest}{source_file.suffix}'
+        target = self.output_dir / 'assets' / name
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(data)
+        return f'/assets/{name}'
+
+    def rewrite_urls(self, text):
+        """app/static/...?v= 주소와 앱 내부 링크를 정적 사이트 주소로 바꾸는 함수"""
+        def static_url(match):
+            relative = match.group(1)
+            if relative not in self.assets:
+                self.assets[relative] = self.publish_asset(STATIC_DIR / relative)
+            return self.assets[relative]
+
+        text = _STATIC_URL_RE.sub(static_url, text)
+        for pattern, replacement in _LINK_RULES:
+            text = pattern.sub(replacement, text)
+        return text
+
+    # --- 페이지 ---
+
+    def prepare_shell(self):
+        registry = get_asset_registry()
+        registry.force_static_urls = True
+
+        compiled_css, _ = compile_css(ROOT_DIR / 'style.css')
+        css = self.rewrite_urls(compiled_css) + EXPORT_CSS
+        self.stylesheet_url = self.publish_asset(Path('style.css'), css.encode('utf-8'))
+        self.small_logo_src = registry.static_url(SMALL_LOGO_IMAGE_FILE)
+        self.main_logo_src = registry.static_url(LOGO_IMAGE_FILE)
+        # 페이지 틀(스타일시트, 로고)이 바뀌면 모든 페이지를 다시 써야 하므로 원본 해시에 포함합니다.
+        # 영상 포스터를 새로 내려받았거나 임베드 방식이 바뀐 경우도 마찬가지입니다.
+        posters = sorted(p.name for p in YOUTUBE_POSTER_DIR.glob('*.jpg'))
+        self.shell_hash = hashlib.sha1(
+            f'{EXPORT_FORMAT}|{self.stylesheet_url}|{self.small_logo_src}|{self.main_logo_src}'
+            f'|{YOUTUBE_EAGER}|{",".join(posters)}'.encode('utf-8')
+        ).hexdigest()
+
+    def page_shell(self, title, active_page, body):
+        nav = create_top_nav_bar_html(self.small_logo_src, active_page)
+        return (
+            '<!doctype html><html lang="ko"><head><meta charset="utf-8">'
+            '<meta name="viewport" content="width=device-width,initial-scale=1">'
+            f'<title>{title}</title><link rel="stylesheet" href="{self.stylesheet_url}"></head>'
+            f'<body><div class="block-container">{nav}{body}</div></body></html>'
+        )
+
+    def write_page(self, path, source_hashes, render):
+        """원본 해시가 이전과 같고 파일이 남아 있으면 건너뛰고, 아니면 렌더링해서 쓰는 함수"""
+        source_hash = hashlib.sha1('|'.join([self.shell_hash, *source_hashes]).encode('utf-8')).hexdigest()
+        self.pages[path] = source_hash
+        target = self.output_dir / path
+        if self.previous.get(path) == source_hash and target.exists():
+            self.skipped += 1
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(self.rewrite_urls(render()), encoding='utf-8')
+        self.written += 1
+
+    def export(self, index, documents=None):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.prepare_shell()
+        tournament_hashes = [t.content_hash for t in index.tournaments]
+        level_hashes = [lvl.content_hash for lvl in index.levels]
+        # 대회 카드와 상세 페이지에 레벨 집계가 들어가므로 레벨 해시도 원본 해시에 넣습니다.
+        stats = LevelColumns.from_levels(index.levels).aggregate()
+
+        self.write_page('index.html', tournament_hashes + level_hashes, lambda: self.render_home(index, stats))
+        self.write_page('Tournaments/index.html', tournament_hashes + level_hashes,
+                        lambda: self.render_tournament_list(index, stats))
+        for tournament in index.tournaments:
+            self.write_page(f"Tournaments/{tournament.id}/index.html",
+                            [tournament.content_hash] + [lvl.content_hash for lvl in index.levels_for_tournament(tournament.id)],
+                            lambda t=tournament: self.render_tournament_detail(t, stats.get(t.id)))
+
+        tournament_titles = [f"{t.id}={t.title}" for t in index.tournaments]
+        self.export_level_list('Levels', index.levels, level_hashes + tournament_titles, index)
+        for tournament in index.tournaments:
+            levels = index.levels_for_tournament(tournament.id)
+            self.export_level_list(f"Levels/tournament/{tournament.id}", levels,
+                                   [lvl.content_hash for lvl in levels] + tournament_titles, index, tournament)
+        # 상세 페이지는 비슷한 레벨 목록도 보여 주므로, 그 레벨들의 해시가 바뀌어도 다시 씁니다.
+        similar = SimilarLevels.from_levels(index.levels)
+        for level in index.levels:
+            similar_levels = [index.get_level(similar_id) for similar_id in similar.similar(level.id)]
+            self.write_page(f"Levels/{level.id}/index.html", [lvl.content_hash for lvl in (level, *similar_levels)],
+                            lambda lvl=level, sl=similar_levels: self.render_level_detail(lvl, sl))
+
+        if documents is not None:
+            self.export_documents(documents)
+
+        self.remove_stale_pages()
+        self.write_sitemap()
+        self.write_host_rules()
+        (self.output_dir / MANIFEST_NAME).write_text(json.dumps(self.pages, ensure_ascii=False, indent=0), encoding='utf-8')
+
+    def export_level_list(self, base, levels, source_hashes, index, tournament=None):
+        page_count = max(1, -(-len(levels) // STATIC_PAGE_SIZE))
+        for page in range(1, page_count + 1):
+            path = f'{base}/index.html' if page == 1 else f'{base}/page/{page}/index.html'
+            page_levels = levels[(page - 1) * STATIC_PAGE_SIZE:page * STATIC_PAGE_SIZE]
+            self.write_page(path, source_hashes + [f'page={page}/{page_count}'],
+                            lambda p=page, lv=page_levels: self.render_level_list(index, lv, len(levels), base, p, page_count, tournament))
+
+    def export_documents(self, documents):
+        news_hashes = [post.content_hash for post in documents.news]
+        self.write_page('News/index.html', news_hashes, lambda: self.render_news_list(documents.news))
+        for post in documents.news:
+            self.write_page(f'News/{post.id}/index.html', [post.content_hash],
+                            lambda p=post: self.render_news_detail(p))
+
+        player_hashes = [player.content_hash for player in documents.players]
+        self.write_page('Players/index.html', player_hashes, lambda: self.render_player_list(documents.players))
+        for player in documents.players:
+            self.write_page(f'Players/{player.id}/index.html', [player.content_hash],
+                            lambda p=player: self.render_player_detail(p))
+
+    # --- 렌더링 (앱의 각 페이지와 같은 구성) ---
+
+    def render_home(self, index, stats):
+        body = [f'<div class="main-logo-container"><img src="{self.main_logo_src}" alt="AWC 로고"></div>']
+        if index.tournaments:
+            first = index.tournaments[0]
+            body.append(create_tournament_card(first, is_highlighted=True, stats=stats.get(first.id)))
+            cards = ''.join(create_tournament_card(t, stats=stats.get(t.id)) for t in index.tournaments[1:])
+            body.append(f'<div class="static-grid" style="--cols:3">{cards}</div>')
+        body.append(FOOTER_HTML)
+        return self.page_shell('AWC 정보 허브', '', ''.join(body))
+
+    def render_tournament_list(self, index, stats):
+        cards = ''.join(create_tournament_card(t, stats=stats.get(t.id)) for t in index.tournaments)
+        body = (
+            '<div style="text-align: center;"><h1 class="page-title">🏆 대회 정보</h1>'
+            '<p>자세히 보고 싶은 대회를 클릭하세요.</p></div>'
+            f'<div class="static-grid" style="--cols:4">{cards}</div>'
+        )
+        return self.page_shell('대회 정보', 'Tournaments', body)
+
+    def render_tournament_detail(self, tournament, stats=None):
+        body = []
+        if tournament.youtube_video_id:
+            body.append(create_video_embed(tournament.youtube_video_id, title=tournament.title))
+        body.append(create_detail_title(tournament.title))
+        links = ''.join(
+            create_detail_button_link(link.url, f'{link.icon} {link.label}')
+            for link in tournament.shortcut_links
+        )
+        links += create_detail_button_link(f'/Levels?tournament_id={quote(tournament.id, safe="")}',
+                                           '📜 오리지널 레벨 목록 보기', new_tab=False)
+        body.append(f'<div class="static-links">{links}</div>')
+        if stats:
+            body.append(create_tournament_stats(stats))
+        if tournament.description:
+            body.append(create_rich_content(tournament.description))
+        body.append("<hr class='custom-hr'>")
+        body.append(create_detail_button_link('/Tournaments', '◀ 대회 목록으로 돌아가기', new_tab=False))
+        return self.page_shell(tournament.title, 'Tournaments', ''.join(body))
+
+    def render_level_list(self, index, page_levels, total_count, base, page, page_count, tournament):
+        filters = [create_detail_button_link('/Levels', '전체', new_tab=False)]
+        filters += [create_detail_button_link(f"/Levels?tournament_id={quote(t.id, safe='')}", t.title, new_tab=False)
+                    for t in index.tournaments]
+        body = ["<h1 class='page-title'>🎶 레벨 목록</h1>", f'<div class="static-links">{"".join(filters)}</div>']
+        if page_levels:
+            start = (page - 1) * STATIC_PAGE_SIZE
+            body.append(f'<p>총 {total_count}개 중 {start + 1}–{start + len(page_levels)}번째</p>')
+        body.append(create_level_table(page_levels))
+        if page_count > 1:
+            def page_href(n):
+                return f'/{quote(base)}/' if n == 1 else f'/{quote(base)}/page/{n}/'
+            prev_link = f'<a href="{page_href(page - 1)}">◀ 이전</a>' if page > 1 else '<span></span>'
+            next_link = f'<a href="{page_href(page + 1)}">다음 ▶</a>' if page < page_count else '<span></span>'
+            body.append(f'<div class="static-pager">{prev_link}<span>{page} / {page_count} 페이지</span>{next_link}</div>')
+        title = f"{tournament.title} 레벨 목록" if tournament else '레벨 목록'
+        return self.page_shell(title, 'Levels', ''.join(body))
+
+    def render_level_detail(self, level, similar_levels=()):
+        video = (create_video_embed(level.youtube_video_id, title=level.title) if level.youtube_video_id
+                 else '<p>이 레벨의 대표 영상이 없습니다.</p>')
+        body = (
+            create_detail_title(level.title)
+            + f'<div class="static-detail"><div>{video}</div><div>{create_level_info_box(level)}</div></div>'
+            + ("<h2 class='section-title'>비슷한 레벨</h2>" + create_level_table(similar_levels) if similar_levels else '')
+            + "<hr class='custom-hr'>"
+            + create_detail_button_link('/Levels', '◀ 레벨 목록으로 돌아가기', new_tab=False)
+        )
+        return self.page_shell(level.title, 'Levels', body)
+
+    def render_news_list(self, news):
+        items = ''.join(create_news_item(post) for post in news) or '<p>등록된 뉴스가 없습니다.</p>'
+        body = '<div style="text-align: center;"><h1 class="page-title">📰 뉴스/공지</h1></div>' + items
+        return self.page_shell('뉴스/공지', 'News', body)
+
+    def render_news_detail(self, post):
+        body = (
+            create_detail_title(post.title)
+            + create_news_meta(post)
+            + create_rich_content(post.html)
+            + "<hr class='custom-hr'>"
+            + create_detail_button_link('/News', '◀ 뉴스 목록으로 돌아가기', new_tab=False)
+        )
+        return self.page_shell(post.title, 'News', body)
+
+    def render_player_list(self, players):
+        cards = ''.join(create_player_card(player) for player in players)
+        body = (
+            '<div style="text-align: center;"><h1 class="page-title">🧑‍💻 선수 정보</h1>'
+            '<p>자세히 보고 싶은 선수를 클릭하세요.</p></div>'
+            + (f'<div class="static-grid" style="--cols:4">{cards}</div>' if cards else '<p>등록된 선수가 없습니다.</p>')
+        )
+        return self.page_shell('선수 정보', 'Players', body)
+
+    def render_player_detail(self, player):
+        body = (
+            create_player_card(player)
+            + create_rich_content(player.html)
+            + "<hr class='custom-hr'>"
+            + create_detail_button_link('/Players', '◀ 선수 목록으로 돌아가기', new_tab=False)
+        )
+        return self.page_shell(player.nickname, 'Players', body)
+
+    # --- 마무리 ---
+
+    def remove_stale_pages(self):
+        for path in self.previous:
+            if path not in self.pages:
+                stale = self.output_dir / path
+                if stale.exists():
+                    stale.unlink()
+
+    def write_sitemap(self):
+        urls = []
+        for path in sorted(self.pages):
+            url_path = '/' + quote(path[:-len('index.html')])
+            urls.append(f'<url><loc>{xml_escape(self.base_url + url_path)}</loc></url>')
+        (self.output_dir / 'sitemap.xml').write_text(
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">' + ''.join(urls) + '</urlset>',
+            encoding='utf-8',
+        )
+
+    def write_host_rules(self):
+        # Netlify / Cloudflare Pages 형식. 디스코드에 공유된 앱 주소(?id=)를 정적 경로로 보내고,
+        # 지문이 붙은 에셋은 내용이 바뀌면 이름도 바뀌므로 영구 캐시합니다.
+        (self.output_dir / '_redirects').write_text(
+            '/Tournaments id=:id /Tournaments/:id/ 301\n'
+            '/Levels id=:id /Levels/:id/ 301\n'
+            '/Levels tournament_id=:id /Levels/tournament/:id/ 301\n'
+            '/News id=:id /News/:id/ 301\n'
+            '/Players id=:id /Players/:id/ 301\n',
+            encoding='utf-8',
+        )
+        (self.output_dir / '_headers').write_text(
+            '/assets/*\n  Cache-Control: public, max-age=31536000, immutable\n',
+            encoding='utf-8',
+        )
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    base_url = DEFAULT_BASE_URL
+    if '--base-url' in argv:
+        i = argv.index('--base-url')
+        base_url = argv[i + 1]
+        del argv[i:i + 2]
+    if '--clean' in argv:
+        argv.remove('--clean')
+        clean = True
+    else:
+        clean = False
+    output_dir = Path(argv[0]) if argv else DEFAULT_OUTPUT_DIR
+
+    if clean and output_dir.exists():
+        shutil.rmtree(output_dir)
+
+    content = ContentStore(CONTENT_DIR).refresh()
+    exporter = SiteExporter(output_dir, base_url)
+    exporter.export(ContentIndex(content), DocumentStore(CONTENT_DIR).refresh())
+    print(f'정적 사이트 내보내기 완료: {output_dir} (새로 쓴 페이지 {exporter.written}개, 그대로 둔 페이지 {exporter.skipped}개)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
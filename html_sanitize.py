@@ -0,0 +1,116 @@
+# html_sanitize.py
+#
+# 콘텐츠에 들어 있는 HTML(대회 description, 뉴스/선수 Markdown 렌더링 결과)을 페이지에 넣기 전에
+# 허용 목록에 있는 태그와 속성만 남기는 정리기. 표준 라이브러리 html.parser만 사용합니다.
+#   - 허용하지 않는 태그는 태그만 지우고 안의 글자는 남깁니다. (script/style 등은 내용까지 제거)
+#   - on* 이벤트 속성, style 속성, javascript: 같은 주소는 모두 제거합니다.
+#   - 닫히지 않은 태그는 끝에서 닫아, 페이지의 나머지 HTML 구조를 깨뜨리지 않습니다.
+
+import html
+from html.parser import HTMLParser
+
+ALLOWED_TAGS = {
+    'p', 'br', 'hr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'strong', 'b', 'em', 'i', 'u', 's', 'del', 'ins', 'mark', 'small', 'sup', 'sub',
+    'code', 'pre', 'blockquote', 'ul', 'ol', 'li', 'dl', 'dt', 'dd',
+    'a', 'img', 'table', 'thead', 'tbody', 'tr', 'th', 'td', 'span', 'div', 'figure', 'figcaption',
+}
+
+# 태그별 허용 속성 ('*'는 모든 허용 태그에 적용)
+ALLOWED_ATTRIBUTES = {
+    '*': {'title'},
+    'a': {'href'},
+    'img': {'src', 'alt', 'width', 'height'},
+    'th': {'colspan', 'rowspan', 'align'},
+    'td': {'colspan', 'rowspan', 'align'},
+    'ol': {'start'},
+}
+
+URL_ATTRIBUTES = {'href', 'src'}
+ALLOWED_URL_SCHEMES = {'http', 'https', 'mailto'}
+
+# 내용까지 통째로 버리는 태그
+DROP_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'template', 'noscript', 'svg', 'math'}
+
+VOID_TAGS = {'br', 'hr', 'img'}
+
+
+def _safe_url(url):
+    url = url.strip()
+    # 브라우저는 주소 안의 공백/제어 문자를 무시하므로 (java\tscript:) 이를 지운 뒤 스킴을 확인합니다.
+    compact = ''.join(ch for ch in url if ch > ' ').lower()
+    scheme, sep, _ = compact.partition(':')
+    if sep and '/' not in scheme and '?' not in scheme and '#' not in scheme:
+        return url if scheme in ALLOWED_URL_SCHEMES else None
+    return url  # 상대 주소, #앵커
+
+
+class _Sanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.stack = []
+        self.dropping = 0  # DROP_CONTENT_TAGS 안에 있는 깊이
+
+    def _attributes(self, tag, attrs):
+        allowed = ALLOWED_ATTRIBUTES['*'] | ALLOWED_ATTRIBUTES.get(tag, set())
+        parts = []
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES:
+                value = _safe_url(value)
+                if value is None:
+                    continue
+            parts.append(f' {name}="{html.escape(value, quote=True)}"')
+        if tag == 'a' and any(name == 'href' for name, _ in attrs):
+            parts.append(' rel="noopener noreferrer"')
+        return ''.join(parts)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        self.out.append(f'<{tag}{self._attributes(tag, attrs)}>')
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            return
+        if not self.dropping and tag in ALLOWED_TAGS:
+            self.out.append(f'<{tag}{self._attributes(tag, attrs)}>')
+            if tag not in VOID_TAGS:
+                self.out.append(f'</{tag}>')
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if self.dropping or tag not in self.stack:
+            return
+        # 중간에 닫히지 않은 태그가 있으면 함께 닫습니다.
+        while self.stack:
+            open_tag = self.stack.pop()
+            self.out.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.out.append(html.escape(data, quote=False))
+
+    def result(self):
+        self.close()
+        return ''.join(self.out) + ''.join(f'</{tag}>' for tag in reversed(self.stack))
+
+
+def sanitize_html(text):
+    """허용 목록에 있는 태그/속성만 남긴 HTML 문자열을 반환하는 함수"""
+    if not text:
+        return ''
+    sanitizer = _Sanitizer()
+    sanitizer.feed(text)
+    return sanitizer.result()
@@ -0,0 +1,191 @@
+# level_stats.py
+#
+# 레벨 목록을 열(column) 단위 NumPy 배열로 들고, 대회별 집계를 한 번의 벡터 연산으로 구하는 모듈.
+#   - LevelColumns: 레벨 순서대로의 난이도/BPM/타일 수 배열과 대회 번호 배열 (값이 없으면 NaN)
+#   - TournamentStats: 대회 하나의 레벨 수, 난이도 최저/중앙/최고, BPM 범위, 타일 수 합계/평균
+#   - LevelStatsStore: 콘텐츠 버전마다 한 번 집계하고, 버전이 바뀌면 레벨 구성이 달라진 대회만 다시 집계
+#     (대회마다 소속 레벨 content_hash들의 해시를 서명으로 기록해 두고 이전 버전과 비교)
+#
+# 집계는 (대회 번호, 값) 순으로 한 번 정렬한 뒤, 대회마다 시작 위치와 값 개수로 최저/중앙/최고를 바로 읽고
+# 합계는 bincount로 구합니다. 대회 수만큼 파이썬 반복을 돌며 목록을 훑지 않습니다.
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class TournamentStats:
+    tournament_id: str
+    level_count: int = 0
+    # 값이 있는 레벨이 없으면 None
+    difficulty_min: float = None
+    difficulty_median: float = None
+    difficulty_max: float = None
+    bpm_min: float = None
+    bpm_max: float = None
+    tiles_total: int = None
+    tiles_average: float = None
+
+
+def _float_column(values):
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+class LevelColumns:
+    """레벨 목록의 열 단위 표현 (읽기 전용)
+
+    columns는 레벨 순서대로의 값 목록 dict (FIELDS의 각 레코드 필드)입니다.
+    메모리 백엔드는 from_levels(), SQLite 백엔드는 ContentDatabase.level_columns()로 만듭니다.
+    """
+
+    FIELDS = ('id', 'content_hash', 'tournament_id', 'difficulty_rating', 'bpm', 'tiles')
+
+    def __init__(self, columns):
+        self.ids = tuple(columns['id'])
+        self.content_hashes = tuple(columns['content_hash'])
+        tournament_ids = np.array([tournament_id or '' for tournament_id in columns['tournament_id']], dtype=str)
+        unique_ids, self.codes = np.unique(tournament_ids, return_inverse=True)
+        self.tournament_ids = tuple(unique_ids.tolist())
+        self._code_by_id = {tournament_id: code for code, tournament_id in enumerate(self.tournament_ids)}
+        self.difficulty = _float_column(columns['difficulty_rating'])
+        self.bpm = _float_column(columns['bpm'])
+        self.tiles = _float_column(columns['tiles'])
+
+    @classmethod
+    def from_levels(cls, levels):
+        return cls({field: [getattr(level, field) for level in levels] for field in cls.FIELDS})
+
+    def __len__(self):
+        return len(self.ids)
+
+    def signatures(self):
+        """대회 id → 소속 레벨 content_hash들의 해시 (레벨이 추가/삭제/수정되면 그 대회만 달라짐)
+
+        레벨 순서와 관계없도록 해시를 정렬해서 이어 붙입니다. (SQLite 백엔드는 다시 넣은 행의 순서가 바뀜)
+        """
+        order = np.argsort(self.codes, kind='stable')
+        bounds = np.searchsorted(self.codes[order], np.arange(len(self.tournament_ids) + 1))
+        hashes = self.content_hashes
+        signatures = {}
+        for code, tournament_id in enumerate(self.tournament_ids):
+            digest = hashlib.sha1()
+            for content_hash in sorted(hashes[row] for row in order[bounds[code]:bounds[code + 1]].tolist()):
+                digest.update(content_hash.encode('ascii'))
+            signatures[tournament_id] = digest.hexdigest()
+        return signatures
+
+    def aggregate(self, tournament_ids=None):
+        """대회 id → TournamentStats dict (tournament_ids를 주면 그 대회들만 집계)"""
+        if tournament_ids is None:
+            rows = np.arange(len(self.ids))
+            codes = self.codes
+        else:
+            wanted = np.zeros(len(self.tournament_ids), dtype=bool)
+            wanted[[self._code_by_id[tournament_id] for tournament_id in tournament_ids
+                    if tournament_id in self._code_by_id]] = True
+            rows = np.flatnonzero(wanted[self.codes])
+            codes = self.codes[rows]
+
+        group_count = len(self.tournament_ids)
+        level_counts = np.bincount(codes, minlength=group_count)
+        difficulty = _group_order_stats(codes, self.difficulty[rows], group_count)
+        bpm = _group_order_stats(codes, self.bpm[rows], group_count)
+        tiles = _group_order_stats(codes, self.tiles[rows], group_count)
+
+        stats = {}
+        for code in np.flatnonzero(level_counts).tolist():
+            tournament_id = self.tournament_ids[code]
+            if not tournament_id:
+                continue  # 대회가 없는 레벨
+            tiles_count = tiles[0][code]
+            stats[tournament_id] = TournamentStats(
+                tournament_id=tournament_id,
+                level_count=int(level_counts[code]),
+                difficulty_min=_value(difficulty[1][code]),
+                difficulty_median=_value(difficulty[2][code]),
+                difficulty_max=_value(difficulty[3][code]),
+                bpm_min=_value(bpm[1][code]),
+                bpm_max=_value(bpm[3][code]),
+                tiles_total=int(tiles[4][code]) if tiles_count else None,
+                tiles_average=float(tiles[4][code] / tiles_count) if tiles_count else None,
+            )
+        return stats
+
+
+def _value(value):
+    return None if np.isnan(value) else float(value)
+
+
+def _group_order_stats(codes, values, group_count):
+    # 대회별 (값 개수, 최저, 중앙, 최고, 합계). 값이 없는 대회의 최저/중앙/최고는 NaN
+    present = ~np.isnan(values)
+    codes = codes[present]
+    values = values[present]
+    sorted_values = values[np.lexsort((values, codes))]
+
+    counts = np.bincount(codes, minlength=group_count)
+    starts = np.cumsum(counts) - counts
+    lowest = np.full(group_count, np.nan)
+    median = np.full(group_count, np.nan)
+    highest = np.full(group_count, np.nan)
+    has = counts > 0
+    start, count = starts[has], counts[has]
+    lowest[has] = sorted_values[start]
+    highest[has] = sorted_values[start + count - 1]
+    median[has] = (sorted_values[start + (count - 1) // 2] + sorted_values[start + count // 2]) / 2
+    totals = np.bincount(codes, weights=values, minlength=group_count)
+    return counts, lowest, median, highest, totals
+
+
+class LevelStatsVersion:
+    """콘텐츠 버전 하나의 대회별 집계 (by_tournament: 대회 id → TournamentStats)"""
+
+    def __init__(self, version, by_tournament, signatures):
+        self.version = version
+        self.by_tournament = MappingProxyType(by_tournament)
+        self.signatures = signatures
+
+    def get(self, tournament_id):
+        return self.by_tournament.get(tournament_id)
+
+
+class LevelStatsStore:
+    """콘텐츠 버전마다 대회별 집계를 한 번 만들고, 바뀐 대회만 다시 집계하는 저장소"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._current = None
+        self.recomputed = ()  # 마지막 갱신에서 다시 집계한 대회 id (로그/확인용)
+
+    def for_version(self, version, load_columns):
+        """version의 LevelStatsVersion (처음 보는 버전이면 load_columns()로 열을 읽어 갱신)
+
+        여러 세션이 동시에 새 버전을 요청해도 집계는 한 스레드만 합니다.
+        """
+        current = self._current
+        if current is not None and current.version == version:
+            return current
+        with self._lock:
+            if self._current is None or self._current.version != version:
+                self._current = self._build(version, load_columns())
+            return self._current
+
+    def _build(self, version, columns):
+        signatures = columns.signatures()
+        previous = self._current
+        if previous is None:
+            changed = None
+            by_tournament = {}
+        else:
+            changed = [tournament_id for tournament_id, signature in signatures.items()
+                       if previous.signatures.get(tournament_id) != signature]
+            # 레벨 구성이 그대로인 대회는 이전 집계를 그대로 씁니다. (레벨이 모두 사라진 대회는 빠짐)
+            by_tournament = {tournament_id: stats for tournament_id, stats in previous.by_tournament.items()
+                             if signatures.get(tournament_id) == previous.signatures.get(tournament_id)}
+        by_tournament.update(columns.aggregate(changed))
+        self.recomputed = tuple(signatures) if changed is None else tuple(changed)
+        return LevelStatsVersion(version, by_tournament, signatures)
@@ -0,0 +1,280 @@
+# metrics.py
+#
+# rerun 한 번이 어디에 시간을 쓰는지 보기 위한 선택적 계측.
+# AWC_METRICS=1 일 때만 켜지며, 꺼져 있으면 timed()는 함수를 그대로 돌려주므로 비용이 없습니다.
+#
+# 켜져 있으면:
+#   - timed()로 감싼 함수(CSS 주입, 이미지 인코딩, 로더, 컴포넌트 빌더)의 실행 시간을 rerun마다 모읍니다.
+#   - st.markdown, st.html 호출 수와 보낸 바이트 수를 rerun마다 셉니다.
+#   - 페이지 URL에 ?debug=metrics 를 붙이면 페이지 맨 아래에 측정 패널이 나타납니다.
+#   - 누적 히스토그램과 캐시 적중률을 Prometheus 텍스트 형식으로
+#     build/metrics/awc.prom 에 주기적으로 덮어씁니다. (node_exporter textfile 수집기 등에서 읽을 수 있음)
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+ENABLED = os.environ.get('AWC_METRICS', '') == '1'
+METRICS_FILE = Path(os.environ.get('AWC_METRICS_FILE', Path('build') / 'metrics' / 'awc.prom'))
+WRITE_INTERVAL = float(os.environ.get('AWC_METRICS_INTERVAL', '10'))
+
+# 히스토그램 버킷 경계 (초)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# 디버그 패널에 보여줄 최근 rerun 수
+RECENT_RERUNS = 20
+
+
+class Histogram:
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+
+class RerunRecord:
+    """rerun 한 번 동안 모은 측정값"""
+
+    def __init__(self, page):
+        self.page = page
+        self.started = time.perf_counter()
+        self.elapsed = None
+        self.spans = {}  # 이름 → [호출 수, 누적 초]
+        self.markdown_calls = 0
+        self.markdown_bytes = 0
+        self.html_calls = 0
+        self.html_bytes = 0
+
+    def add_span(self, name, seconds):
+        span = self.spans.setdefault(name, [0, 0.0])
+        span[0] += 1
+        span[1] += seconds
+
+
+class MetricsRegistry:
+    """프로세스 전체의 누적 측정값. 여러 세션 스레드가 함께 쓰므로 잠금으로 보호합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.rerun_latency = {}   # 페이지 → Histogram
+        self.span_latency = {}    # 구간 이름 → Histogram
+        self.markdown_calls = {}  # 페이지 → 누적 호출 수
+        self.markdown_bytes = {}  # 페이지 → 누적 바이트
+        self.html_calls = {}      # 페이지 → st.html 누적 호출 수
+        self.html_bytes = {}      # 페이지 → st.html 누적 바이트
+        self.recent = []
+        self._last_write = 0.0
+
+    # --- rerun 단위 ---
+
+    @property
+    def current(self):
+        return getattr(self._local, 'record', None)
+
+    def begin_rerun(self, page):
+        self._local.record = RerunRecord(page)
+
+    def end_rerun(self):
+        record = self.current
+        if record is None:
+            return None
+        self._local.record = None
+        record.elapsed = time.perf_counter() - record.started
+        with self._lock:
+            self.rerun_latency.setdefault(record.page, Histogram()).observe(record.elapsed)
+            for name, (_, seconds) in record.spans.items():
+                self.span_latency.setdefault(name, Histogram()).observe(seconds)
+            self.markdown_calls[record.page] = self.markdown_calls.get(record.page, 0) + record.markdown_calls
+            self.markdown_bytes[record.page] = self.markdown_bytes.get(record.page, 0) + record.markdown_bytes
+            self.html_calls[record.page] = self.html_calls.get(record.page, 0) + record.html_calls
+            self.html_bytes[record.page] = self.html_bytes.get(record.page, 0) + record.html_bytes
+            self.recent = (self.recent + [record])[-RECENT_RERUNS:]
+            due = time.monotonic() - self._last_write >= WRITE_INTERVAL
+            if due:
+                self._last_write = time.monotonic()
+        if due:
+            self.write_file()
+        return record
+
+    # --- 내보내기 ---
+
+    def prometheus_text(self):
+        """누적 측정값을 Prometheus 텍스트 형식 문자열로 만드는 함수"""
+        from templates import FRAGMENTS
+
+        lines = []
+
+        def histogram(metric, label, histograms, help_text):
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} histogram')
+            for key, hist in sorted(histograms.items()):
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ('+Inf',), hist.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{{label}="{key}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{{label}="{key}"}} {hist.total:.6f}')
+                lines.append(f'{metric}_count{{{label}="{key}"}} {hist.count}')
+
+        def counter(metric, label, values, help_text):
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} counter')
+            for key, value in sorted(values.items()):
+                lines.append(f'{metric}{{{label}="{key}"}} {value}')
+
+        with self._lock:
+            histogram('awc_rerun_seconds', 'page', self.rerun_latency, 'Script rerun latency')
+            histogram('awc_span_seconds', 'span', self.span_latency, 'Time spent per instrumented span in one rerun')
+            counter('awc_markdown_calls_total', 'page', self.markdown_calls, 'st.markdown calls')
+            counter('awc_markdown_bytes_total', 'page', self.markdown_bytes, 'Bytes sent through st.markdown')
+            counter('awc_html_calls_total', 'page', self.html_calls, 'st.html calls')
+            counter('awc_html_bytes_total', 'page', self.html_bytes, 'Bytes sent through st.html')
+
+        stats = FRAGMENTS.stats()
+        lines.append('# HELP awc_fragment_cache_hit_ratio Rendered HTML fragment cache hit ratio')
+        lines.append('# TYPE awc_fragment_cache_hit_ratio gauge')
+        lines.append(f'awc_fragment_cache_hit_ratio {stats["hit_rate"]:.4f}')
+        lines.append('# TYPE awc_fragment_cache_hits_total counter')
+        lines.append(f'awc_fragment_cache_hits_total {stats["hits"]}')
+        lines.append('# TYPE awc_fragment_cache_misses_total counter')
+        lines.append(f'awc_fragment_cache_misses_total {stats["misses"]}')
+        lines.append('# TYPE awc_fragment_cache_size gauge')
+        lines.append(f'awc_fragment_cache_size {stats["size"]}')
+        return '\n'.join(lines) + '\n'
+
+    def write_file(self, metrics_file=None):
+        """측정 파일을 임시 파일에 쓴 뒤 교체하는 함수 (수집기가 반쯤 쓰인 파일을 읽지 않도록)"""
+        metrics_file = Path(metrics_file or METRICS_FILE)
+        metrics_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = metrics_file.with_suffix(metrics_file.suffix + '.tmp')
+        tmp_file.write_text(self.prometheus_text(), encoding='utf-8')
+        os.replace(tmp_file, metrics_file)
+
+
+REGISTRY = MetricsRegistry()
+
+
+def timed(name):
+    """함수 실행 시간을 현재 rerun의 name 구간으로 기록하는 데코레이터 (꺼져 있으면 아무것도 하지 않음)"""
+    def decorator(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            record = REGISTRY.current
+            if record is None:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record.add_span(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def _count_element(name, body):
+    record = REGISTRY.current
+    if record is not None:
+        setattr(record, f'{name}_calls', getattr(record, f'{name}_calls') + 1)
+        setattr(record, f'{name}_bytes', getattr(record, f'{name}_bytes') + len(str(body).encode('utf-8')))
+
+# 호출 수와 바이트 수를 세는 요소 (RerunRecord의 {이름}_calls, {이름}_bytes에 기록)
+COUNTED_ELEMENTS = ('markdown', 'html')
+
+_elements_patched = False
+_patch_lock = threading.Lock()
+
+def _patch_elements():
+    # st.markdown/st.html과 컬럼/컨테이너의 .markdown/.html 호출을 모두 세기 위해 한 번만 감쌉니다.
+    global _elements_patched
+    with _patch_lock:
+        if not _elements_patched:
+            for name in COUNTED_ELEMENTS:
+                _install_element_counter(name)
+            _elements_patched = True
+
+def _install_element_counter(name):
+    import streamlit as st
+    from streamlit.delta_generator import DeltaGenerator
+
+    # st.markdown 같은 모듈 함수는 메인 DeltaGenerator에 묶인 메서드이므로 클래스와 따로 감싸야 합니다.
+    method = getattr(DeltaGenerator, name)
+    function = getattr(st, name)
+
+    @functools.wraps(method)
+    def counted_method(self, body, *args, **kwargs):
+        _count_element(name, body)
+        return method(self, body, *args, **kwargs)
+
+    @functools.wraps(function)
+    def counted_function(body, *args, **kwargs):
+        _count_element(name, body)
+        return function(body, *args, **kwargs)
+
+    setattr(DeltaGenerator, name, counted_method)
+    setattr(st, name, counted_function)
+
+
+def begin_rerun(page):
+    """페이지 스크립트 맨 앞에서 호출합니다."""
+    if not ENABLED:
+        return
+    _patch_elements()
+    REGISTRY.begin_rerun(page)
+
+
+def end_rerun():
+    """페이지 스크립트 맨 끝에서 호출합니다. ?debug=metrics 이면 측정 패널을 그립니다."""
+    if not ENABLED:
+        return
+    import streamlit as st
+
+    record = REGISTRY.end_rerun()
+    if record is None or st.query_params.get('debug') != 'metrics':
+        return
+
+    with st.expander(f'⏱ rerun 측정 ({record.page}: {record.elapsed * 1000:.1f} ms)', expanded=True):
+        st.caption(f'st.markdown {record.markdown_calls}회, {record.markdown_bytes:,} bytes / '
+                   f'st.html {record.html_calls}회, {record.html_bytes:,} bytes')
+        spans = sorted(record.spans.items(), key=lambda item: item[1][1], reverse=True)
+        st.table([{'구간': name, '호출 수': calls, '시간 (ms)': round(seconds * 1000, 2)}
+                  for name, (calls, seconds) in spans])
+        st.table([{'페이지': r.page, '시간 (ms)': round(r.elapsed * 1000, 1), 'markdown': r.markdown_calls,
+                   'bytes': r.markdown_bytes, 'html': r.html_calls, 'html bytes': r.html_bytes}
+                  for r in reversed(REGISTRY.recent)])
+        st.code(REGISTRY.prometheus_text(), language='text')
+
+
+def fragment_rerun(page):
+    """st.fragment 함수에 붙이는 데코레이터 (@st.fragment 아래에 둡니다)
+
+    fragment만 다시 실행될 때는 페이지 맨 앞/끝의 begin_rerun()/end_rerun()이 불리지 않으므로,
+    진행 중인 rerun이 없으면 fragment 실행 자체를 page라는 이름의 rerun 하나로 기록합니다.
+    """
+    def decorator(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if REGISTRY.current is not None:
+                return func(*args, **kwargs)
+            begin_rerun(page)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end_rerun()
+        return wrapper
+    return decorator
@@ -5,62 +5,73 @@ import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from dataLoad import load_tournaments
-from ui_components import inject_local_css, create_top_nav_bar, create_tournament_card, get_image_as_base64
+import metrics
+from dataLoad import load_catalog, load_tournament_stats
+from urllib.parse import quote
+from ui_components import (inject_local_css, create_top_nav_bar, create_tournament_card, get_image_src,
+                           create_detail_title, create_detail_button_link, create_video_embed, create_back_button,
+                           create_tournament_stats, show_rich_content)
 from app import SMALL_LOGO_IMAGE_FILE # 경로 변수는 app.py에서 가져와도 괜찮음
+from warmup import start_warm_up
 
+metrics.begin_rerun("Tournaments")
 st.set_page_config(page_title="대회 정보", layout="wide", initial_sidebar_state="collapsed")
+start_warm_up()
 inject_local_css("style.css")
 
-small_logo_base64 = get_image_as_base64(SMALL_LOGO_IMAGE_FILE)
-create_top_nav_bar(small_logo_base64, active_page="Tournaments")
+small_logo_src = get_image_src(SMALL_LOGO_IMAGE_FILE)
+create_top_nav_bar(small_logo_src, active_page="Tournaments")
 
-all_tournaments = load_tournaments()
+content_index = load_catalog()
+tournament_stats = load_tournament_stats()
+all_tournaments = content_index.tournaments
 tournament_id = st.query_params.get("id")
 
-if tournament_id and any(t['id'] == tournament_id for t in all_tournaments):
+if tournament_id and tournament_id in content_index.tournament_by_id:
     # --- 1. 상세 페이지 ---
-    tournament = next((t for t in all_tournaments if t['id'] == tournament_id), None)
+    tournament = content_index.get_tournament(tournament_id)
     
     if tournament:
         
         # 1-1. 유튜브 영상 임베드
-        video_id = tournament.get('youtube_video_id')
+        video_id = tournament.youtube_video_id
         if video_id:
             #st.markdown("<h2 class='section-title'>대표 영상</h2>", unsafe_allow_html=True)
             video_cols = st.columns([1, 3, 1])
             with video_cols[1]:
-                st.markdown(f"""
-                <div class="video-container">
-                    <iframe src="https://www.youtube.com/embed/{video_id}" frameborder="0" allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture" allowfullscreen></iframe>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(create_video_embed(video_id, title=tournament.title), unsafe_allow_html=True)
 
         # 1-2. 대회 제목
-        st.markdown(f"<h1 class='detail-title'>{tournament.get('title', '제목 없음')}</h1>", unsafe_allow_html=True)
+        st.markdown(create_detail_title(tournament.title), unsafe_allow_html=True)
         
         # 1-3. 바로가기 (위치 변경)
-        links = tournament.get('shortcut_links', [])
+        links = tournament.shortcut_links
         if links:
             #st.markdown("<h2 class='section-title'></h2>", unsafe_allow_html=True)
             link_cols = st.columns(len(links) if len(links) <= 5 else 5)
             for i, link in enumerate(links):
                 with link_cols[i % 5]:
-                    st.markdown(f'<a href="{link.get("url", "#")}" target="_blank" class="detail-button-link">{link.get("icon", "")} {link.get("label", "링크")}</a>', unsafe_allow_html=True)
+                    st.markdown(create_detail_button_link(link.url, f'{link.icon} {link.label}'), unsafe_allow_html=True)
         
-        # 1-4. 레벨 정렬
-        st.markdown(f'<a href="/Levels?tournament_id={tournament.get("id")}" target="_self" class="detail-button-link">📜 오리지널 레벨 목록 보기</a>', unsafe_allow_html=True)
+        # 1-4. 레벨 집계 (콘텐츠 버전마다 한 번, 바뀐 대회만 다시 집계)
+        stats = tournament_stats.get(tournament.id)
+        if stats:
+            st.markdown(create_tournament_stats(stats), unsafe_allow_html=True)
 
-        # 1-5. 목록으로 돌아가기 버튼
+        # 1-5. 대회 설명 (YAML의 description HTML, 로드할 때 허용 태그만 남겨 둠)
+        show_rich_content(tournament.description)
+
+        # 1-6. 레벨 정렬
+        st.markdown(create_detail_button_link(f'/Levels?tournament_id={quote(tournament.id, safe="")}', "📜 오리지널 레벨 목록 보기", new_tab=False), unsafe_allow_html=True)
+
+        # 1-7. 목록으로 돌아가기 버튼
+        # 상세 화면의 위젯은 이 버튼 하나뿐이고, 누르면 목록 화면으로 바뀌어 페이지 전체를 다시 그려야 하므로
+        # fragment로 감싸지 않습니다. (감싸면 fragment rerun 뒤에 st.rerun(scope="app")이 한 번 더 필요함)
         st.markdown("<hr class='custom-hr'>", unsafe_allow_html=True)
-        if st.button("◀ 대회 목록으로 돌아가기"):
-            st.query_params.clear()
-            st.rerun()
+        create_back_button("◀ 대회 목록으로 돌아가기")
     else:
         st.error("선택한 대회를 찾을 수 없습니다.")
-        if st.button("◀ 대회 목록으로 돌아가기"):
-            st.query_params.clear()
-            st.rerun()
+        create_back_button("◀ 대회 목록으로 돌아가기")
 
 else:
     # --- 목록 페이지 (개선된 카드 디자인 적용) ---
@@ -77,6 +88,9 @@ else:
         cols = st.columns(num_columns)
         for i, tournament in enumerate(all_tournaments):
             # 카드 생성 함수 사용
-            cols[i % num_columns].markdown(create_tournament_card(tournament), unsafe_allow_html=True)
+            cols[i % num_columns].markdown(create_tournament_card(tournament, stats=tournament_stats.get(tournament.id)), unsafe_allow_html=True)
     else:
-        st.info("등록된 대회가 없습니다.")
\ No newline at end of file
+        st.info("등록된 대회가 없습니다.")
+
+# --- (AWC_METRICS=1일 때만) rerun 측정 마무리, ?debug=metrics 이면 측정 패널 표시 ---
+metrics.end_rerun()
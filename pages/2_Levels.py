@@ -3,134 +3,243 @@
 import streamlit as st
 import sys
 import os
+import math
 
 # --- 모듈 경로 설정 및 공통 컴포넌트 임포트 ---
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from dataLoad import load_levels, load_tournaments
-from ui_components import inject_local_css, create_top_nav_bar
-from app import get_image_as_base64, SMALL_LOGO_IMAGE_FILE
+import metrics
+from dataLoad import USE_CONTENT_DB, load_catalog, load_similar_levels
+from search_index import highlight
+from ui_components import (inject_local_css, create_top_nav_bar, create_detail_title, create_level_info_box,
+                           create_level_table, create_video_embed, create_back_button, highlight_text, get_image_src)
+from app import SMALL_LOGO_IMAGE_FILE
+from warmup import start_warm_up
+
+# 목록 페이지에서 한 번에 보여줄 레벨 수
+DEFAULT_PAGE_SIZE = 50
+PAGE_SIZE_OPTIONS = (25, 50, 100)
+
+# 정렬 옵션 (표시 이름 → (정렬 색인 열, 내림차순 여부)). 고른 순서대로 1차, 2차 … 정렬 기준이 됩니다.
+SORT_OPTIONS = {
+    "난이도 높은순": ("difficulty", True),
+    "난이도 낮은순": ("difficulty", False),
+    "BPM 높은순": ("bpm", True),
+    "BPM 낮은순": ("bpm", False),
+    "타일 수 많은순": ("tiles", True),
+    "타일 수 적은순": ("tiles", False),
+    "제목순": ("title", False),
+    "제목 역순": ("title", True),
+    "대회순": ("tournament", False),
+}
+
+# 범위 필터 슬라이더 (정렬 색인 열 → (표시 이름, 눈금 간격))
+RANGE_FILTERS = {
+    "difficulty": ("난이도", 0.1),
+    "bpm": ("BPM", 1),
+    "tiles": ("타일 수", 1),
+}
 
 # --- 페이지 기본 설정 및 스타일 적용 ---
+metrics.begin_rerun("Levels")
 st.set_page_config(page_title="레벨 목록", layout="wide", initial_sidebar_state="collapsed")
+start_warm_up()
 inject_local_css("style.css")
 
 # --- 상단 네비게이션 바 표시 ---
-small_logo_base64 = get_image_as_base64(SMALL_LOGO_IMAGE_FILE)
-create_top_nav_bar(small_logo_base64, active_page="Levels")
+small_logo_src = get_image_src(SMALL_LOGO_IMAGE_FILE)
+create_top_nav_bar(small_logo_src, active_page="Levels")
 
 # --- 데이터 로딩 ---
-all_levels = load_levels()
-all_tournaments = load_tournaments()
-query_params = st.query_params
-level_id = query_params.get("id")
+content_index = load_catalog()
+level_id = st.query_params.get("id")
+
+# --- 레벨 목록 영역 ---
+# 검색어, 필터, 정렬, 페이지를 바꾸면 페이지 전체가 아니라 이 fragment만 다시 실행됩니다.
+# (페이지 설정, CSS, 로고, 네비게이션 바, 제목은 페이지를 열 때 한 번만 그려짐)
+@st.fragment
+@metrics.fragment_rerun("Levels/list")
+def level_list():
+    # fragment만 다시 실행될 때도 최신 콘텐츠를 보도록 여기서 다시 가져옵니다. (캐시된 객체라 비용이 작음)
+    content_index = load_catalog()
+    query_params = st.query_params
+
+    # 필터링 UI (대회 목록과 제목↔id 맵은 콘텐츠 인덱스에 미리 만들어져 있음)
+    tournament_options = ["전체", *content_index.tournament_titles]
+    
+    tournament_id_from_query = query_params.get("tournament_id")
+    default_title = content_index.tournament_id_to_title.get(tournament_id_from_query)
+    default_index = tournament_options.index(default_title) if default_title in tournament_options else 0
+
+    filter_cols = st.columns([3, 8])
+    with filter_cols[0]:
+        selected_tournament_title = st.selectbox("대회 필터", options=tournament_options, index=default_index, key="tournament_filter")
+    with filter_cols[1]:
+        # 입력 값은 Enter를 누르거나 입력창을 벗어날 때만 전송되므로 글자마다 rerun되지 않습니다.
+        # 앞뒤 공백만 바뀐 경우에는 같은 검색으로 취급해 페이지를 처음으로 되돌리지 않습니다.
+        search_term = st.text_input("레벨, 아티스트, 제작자 검색", placeholder="검색어를 입력하세요...").strip()
+
+    # 정렬 기준과 숫자 범위 필터 (범위 경계는 콘텐츠 버전마다 한 번 만든 정렬 색인, SQLite면 열 색인에서 가져옴)
+    bounds_for = content_index.bounds if USE_CONTENT_DB else content_index.sort_index.bounds
+    with st.expander("정렬 및 상세 필터"):
+        sort_labels = st.multiselect("정렬 기준 (고른 순서대로 적용)", options=list(SORT_OPTIONS), key="level_sort")
+        range_values = {}
+        range_cols = st.columns(len(RANGE_FILTERS))
+        for col, (column, (label, step)) in zip(range_cols, RANGE_FILTERS.items()):
+            bounds = bounds_for(column)
+            if bounds is None or bounds[0] == bounds[1]:
+                continue
+            if isinstance(step, int):
+                low, high = math.floor(bounds[0]), math.ceil(bounds[1])
+            else:
+                low, high = float(bounds[0]), float(bounds[1])
+            with col:
+                selected = st.slider(label, min_value=low, max_value=high, value=(low, high), step=step, key=f"level_range_{column}")
+            # 전체 범위 그대로면 필터를 걸지 않습니다. (값이 없는 레벨도 계속 보이도록)
+            if selected != (low, high):
+                range_values[column] = selected
+
+    # 같은 열을 오름차순/내림차순으로 둘 다 고른 경우 먼저 고른 쪽만 사용합니다.
+    sort_keys = []
+    for label in sort_labels:
+        column, descending = SORT_OPTIONS[label]
+        if column not in {c for c, _ in sort_keys}:
+            sort_keys.append((column, descending))
+
+    selected_tournament_id = None
+    if selected_tournament_title != "전체":
+        selected_tournament_id = content_index.tournament_title_to_id.get(selected_tournament_title)
+
+    def highlighted_cell(level, field):
+        value = getattr(level, field) or 'N/A'
+        return highlight_text(value, highlight(str(value), search_term))
+
+    # --- 페이지네이션 (page, page_size 쿼리 파라미터) ---
+    try:
+        page_size = int(query_params.get("page_size", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        page_size = DEFAULT_PAGE_SIZE
+    if page_size not in PAGE_SIZE_OPTIONS:
+        page_size = DEFAULT_PAGE_SIZE
+
+    # 필터나 검색어가 바뀌면 첫 페이지로 돌아갑니다.
+    filter_signature = (selected_tournament_title, search_term, tuple(sort_keys), tuple(sorted(range_values.items())))
+    if st.session_state.get("level_filter_signature", filter_signature) != filter_signature:
+        query_params["page"] = "1"
+    st.session_state["level_filter_signature"] = filter_signature
+
+    try:
+        page = int(query_params.get("page", 1))
+    except ValueError:
+        page = 1
+
+    if USE_CONTENT_DB:
+        # 대회 필터, 검색, 범위, 정렬, 전체 개수, 현재 페이지를 SQLite 쿼리 하나로 가져옵니다.
+        page_levels, total_count, page = content_index.query_levels(
+            selected_tournament_id, search_term, range_values, sort_keys, page, page_size)
+    else:
+        # 필터링 로직
+        sort_index = content_index.sort_index
+        display_levels = content_index.levels
+        total_count = None
+        if selected_tournament_id is not None:
+            display_levels = content_index.levels_for_tournament(selected_tournament_id)
+        if search_term:
+            # 검색 색인은 콘텐츠 버전마다 한 번만 만들어지며, 관련도순으로 결과를 돌려줍니다.
+            search_index = content_index.search_index
+            if selected_tournament_title == "전체" and not range_values and not sort_keys:
+                # 다른 조건이 없으면 현재 페이지까지의 상위 결과만 뽑고, 전체 개수는 따로 셉니다.
+                search_hits, total_count = search_index.search_with_count(search_term, limit=max(page, 1) * page_size)
+            else:
+                search_hits = search_index.search(search_term)
+                if selected_tournament_title != "전체":
+                    search_hits = [hit for hit in search_hits if hit.record.tournament_id == selected_tournament_id]
+            display_levels = [hit.record for hit in search_hits]
+        if total_count is None:
+            # 범위 필터는 가장 좁은 범위를 bisect로 찾고, 정렬은 미리 만든 순열/순위를 사용합니다.
+            # (검색 중에 정렬 기준을 고르지 않으면 관련도순을 유지합니다.)
+            display_levels = sort_index.filter_ranges(display_levels, range_values)
+            if sort_keys:
+                display_levels = sort_index.sort(display_levels, sort_keys)
+            total_count = len(display_levels)
+
+        page = min(max(page, 1), max(1, -(-total_count // page_size)))
+        page_levels = display_levels[(page - 1) * page_size:page * page_size]
+
+    page_count = max(1, -(-total_count // page_size))
+    page_start = (page - 1) * page_size
+
+    def change_page_size():
+        # 지금 보고 있던 첫 레벨이 들어 있는 페이지로 옮깁니다.
+        new_size = st.session_state["level_page_size"]
+        st.query_params["page_size"] = str(new_size)
+        st.query_params["page"] = str(page_start // new_size + 1)
+
+    # 테이블 (헤더와 현재 페이지의 모든 행을 한 번의 st.markdown으로 전송)
+    if page_levels:
+        info_cols = st.columns([4, 1])
+        with info_cols[0]:
+            st.caption(f"총 {total_count}개 중 {page_start + 1}–{page_start + len(page_levels)}번째")
+        with info_cols[1]:
+            st.session_state["level_page_size"] = page_size
+            st.selectbox("페이지당 레벨 수", options=PAGE_SIZE_OPTIONS, key="level_page_size", on_change=change_page_size,
+                         format_func=lambda size: f"{size}개씩 보기", label_visibility="collapsed")
+        st.markdown(create_level_table(page_levels, highlighted_cell if search_term else None), unsafe_allow_html=True)
+    else:
+        st.markdown(create_level_table([]), unsafe_allow_html=True)
+        st.info("표시할 레벨이 없습니다.")
+
+    if page_count > 1:
+        def go_to_page(target_page):
+            st.query_params["page"] = str(target_page)
+            st.query_params["page_size"] = str(page_size)
+
+        pager_cols = st.columns([1, 2, 1])
+        with pager_cols[0]:
+            st.button("◀ 이전", disabled=page <= 1, on_click=go_to_page, args=(page - 1,), use_container_width=True)
+        with pager_cols[1]:
+            st.markdown(f'<div style="text-align: center; padding-top: 8px;">{page} / {page_count} 페이지</div>', unsafe_allow_html=True)
+        with pager_cols[2]:
+            st.button("다음 ▶", disabled=page >= page_count, on_click=go_to_page, args=(page + 1,), use_container_width=True)
+
 
 # --- 라우팅: URL에 'id'가 있으면 상세 페이지, 없으면 목록 페이지 표시 ---
-if level_id and any(lvl['id'] == level_id for lvl in all_levels):
+if level_id and content_index.get_level(level_id) is not None:
     # --- 1. 레벨 상세 페이지 ---
-    level = next((lvl for lvl in all_levels if lvl['id'] == level_id), None)
+    level = content_index.get_level(level_id)
     
     if level:
         # 페이지 제목
-        st.markdown(f"<h1 class='detail-title'>{level.get('title', '레벨 정보')}</h1>", unsafe_allow_html=True)
+        st.markdown(create_detail_title(level.title), unsafe_allow_html=True)
         
         # 메인 콘텐츠 (영상 + 정보 박스)
         main_cols = st.columns([2, 1], gap="large")
         
         with main_cols[0]: # 왼쪽: 유튜브 영상
-            video_id = level.get('youtube_video_id')
+            video_id = level.youtube_video_id
             if video_id:
-                st.markdown(f"""
-                <div class="video-container">
-                    <iframe src="https://www.youtube.com/embed/{video_id}" frameborder="0" allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture" allowfullscreen></iframe>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(create_video_embed(video_id, title=level.title), unsafe_allow_html=True)
             else:
                 st.info("이 레벨의 대표 영상이 없습니다.")
         
         with main_cols[1]: # 오른쪽: 정보 박스
-            st.markdown(f"""
-            <div class="level-info-box">
-                <h3>레벨 정보</h3>
-                <p><strong>아티스트:</strong> {level.get('artist', 'N/A')}</p>
-                <p>{level.get('detail_artist', '')}</p>
-                <p><strong>제작자:</strong> {level.get('creator', 'N/A')}</p>
-                <p>({level.get('detail_creator', 'N/A')})</p>
-                <p><strong>난이도:</strong> {level.get('difficulty_rating', 'N/A')}</p>
-                <p><strong>BPM:</strong> {level.get('bpm', 'N/A')}</p>
-                <p><strong>타일 수:</strong> {level.get('tiles', 'N/A')}</p>
-                <a href="{level.get('download_url', '#')}" target="_blank" class="download-button">레벨 다운로드</a>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(create_level_info_box(level), unsafe_allow_html=True)
+
+        # 비슷한 레벨 (콘텐츠 버전마다 미리 계산해 둔 표에서 읽기만 함)
+        similar_levels = [content_index.get_level(similar_id) for similar_id in load_similar_levels().similar(level.id)]
+        similar_levels = [similar for similar in similar_levels if similar is not None]
+        if similar_levels:
+            st.markdown("<h2 class='section-title'>비슷한 레벨</h2>", unsafe_allow_html=True)
+            st.markdown(create_level_table(similar_levels), unsafe_allow_html=True)
 
         st.markdown("<hr class='custom-hr'>", unsafe_allow_html=True)
-        if st.button("◀ 레벨 목록으로 돌아가기"):
-            st.query_params.clear()
-            st.rerun()
+        create_back_button("◀ 레벨 목록으로 돌아가기")
     else:
         st.error("요청한 레벨을 찾을 수 없습니다.")
 
 else:
     # --- 2. 레벨 목록 페이지 (필터링 기능 포함) ---
     st.markdown("<h1 class='page-title'>🎶 레벨 목록</h1>", unsafe_allow_html=True)
+    level_list()
 
-    # 필터링 UI
-    tournament_title_to_id = {t.get('title'): t.get('id') for t in all_tournaments}
-    tournament_id_to_title = {v: k for k, v in tournament_title_to_id.items()}
-    sorted_tournaments = sorted(all_tournaments, key=lambda t: t.get('year', '0000'), reverse=True)
-    tournament_options = ["전체"] + [t.get('title') for t in sorted_tournaments]
-    
-    tournament_id_from_query = query_params.get("tournament_id")
-    default_title = tournament_id_to_title.get(tournament_id_from_query)
-    default_index = tournament_options.index(default_title) if default_title in tournament_options else 0
-
-    filter_cols = st.columns([3, 8])
-    with filter_cols[0]:
-        selected_tournament_title = st.selectbox("대회 필터", options=tournament_options, index=default_index, key="tournament_filter")
-    with filter_cols[1]:
-        search_term = st.text_input("레벨, 아티스트, 제작자 검색", placeholder="검색어를 입력하세요...")
-
-    # 필터링 로직
-    display_levels = all_levels
-    if selected_tournament_title != "전체":
-        selected_tournament_id = tournament_title_to_id.get(selected_tournament_title)
-        display_levels = [lvl for lvl in display_levels if lvl.get('tournament_id') == selected_tournament_id]
-    if search_term:
-        search_term_lower = search_term.lower()
-        display_levels = [
-            lvl for lvl in display_levels 
-            if search_term_lower in lvl.get('title', '').lower() or \
-               search_term_lower in lvl.get('artist', '').lower() or \
-               search_term_lower in lvl.get('creator', '').lower()
-        ]
-
-    # 테이블 헤더
-    st.markdown("""
-    <div class="level-list-table">
-        <div class="header-row">
-            <div class="row-content">
-                <div class="cell cell-title">제목</div>
-                <div class="cell cell-artist">아티스트</div>
-                <div class="cell cell-creator">제작자</div>
-                <div class="cell cell-minititle">대회</div>
-                <div class="cell cell-difficulty">난이도</div>
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # 테이블 내용
-    if display_levels:
-        for level in display_levels:
-            st.markdown(f"""
-            <a href="/Levels?id={level.get('id')}" target="_self" class="level-row">
-                <div class="row-content">
-                    <div class="cell cell-title">{level.get('title', 'N/A')}</div>
-                    <div class="cell cell-artist">{level.get('artist', 'N/A')}</div>
-                    <div class="cell cell-creator">{level.get('creator', 'N/A')}</div>
-                    <div class="cell cell-tournament">{level.get('minititle', 'N/A')}</div>
-                    <div class="cell cell-difficulty">{level.get('difficulty_rating', 'N/A')}</div>
-                </div>
-            </a>
-            """, unsafe_allow_html=True)
-    else:
-        st.info("표시할 레벨이 없습니다.")
\ No newline at end of file
+# --- (AWC_METRICS=1일 때만) rerun 측정 마무리, ?debug=metrics 이면 측정 패널 표시 ---
+metrics.end_rerun()
@@ -0,0 +1,50 @@
+# 3_News.py
+
+import streamlit as st
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import metrics
+from dataLoad import get_news, load_news
+from ui_components import (inject_local_css, create_top_nav_bar, get_image_src, create_detail_title,
+                           create_news_item, create_news_meta, show_rich_content, create_back_button)
+from app import SMALL_LOGO_IMAGE_FILE
+from warmup import start_warm_up
+
+metrics.begin_rerun("News")
+st.set_page_config(page_title="뉴스/공지", layout="wide", initial_sidebar_state="collapsed")
+start_warm_up()
+inject_local_css("style.css")
+
+small_logo_src = get_image_src(SMALL_LOGO_IMAGE_FILE)
+create_top_nav_bar(small_logo_src, active_page="News")
+
+all_news = load_news()
+news_id = st.query_params.get("id")
+post = get_news(news_id) if news_id else None
+
+if post:
+    # --- 상세 페이지 (본문은 렌더링 캐시의 HTML을 그대로 출력) ---
+    st.markdown(create_detail_title(post.title), unsafe_allow_html=True)
+    st.markdown(create_news_meta(post), unsafe_allow_html=True)
+    show_rich_content(post.html)
+
+    st.markdown("<hr class='custom-hr'>", unsafe_allow_html=True)
+    create_back_button("◀ 뉴스 목록으로 돌아가기")
+
+else:
+    # --- 목록 페이지 ---
+    st.markdown("""
+    <div class="text-center">
+        <h1 class='page-title'>📰 뉴스/공지</h1>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if all_news:
+        st.markdown("".join(create_news_item(item) for item in all_news), unsafe_allow_html=True)
+    else:
+        st.info("등록된 뉴스가 없습니다.")
+
+# --- (AWC_METRICS=1일 때만) rerun 측정 마무리, ?debug=metrics 이면 측정 패널 표시 ---
+metrics.end_rerun()
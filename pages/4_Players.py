@@ -0,0 +1,53 @@
+# 4_Players.py
+
+import streamlit as st
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import metrics
+from dataLoad import get_player, load_players
+from ui_components import (inject_local_css, create_top_nav_bar, get_image_src, create_player_card,
+                           show_rich_content, create_back_button)
+from app import SMALL_LOGO_IMAGE_FILE
+from warmup import start_warm_up
+
+metrics.begin_rerun("Players")
+st.set_page_config(page_title="선수 정보", layout="wide", initial_sidebar_state="collapsed")
+start_warm_up()
+inject_local_css("style.css")
+
+small_logo_src = get_image_src(SMALL_LOGO_IMAGE_FILE)
+create_top_nav_bar(small_logo_src, active_page="Players")
+
+all_players = load_players()
+player_id = st.query_params.get("id")
+player = get_player(player_id) if player_id else None
+
+if player:
+    # --- 상세 페이지 (본문은 렌더링 캐시의 HTML을 그대로 출력) ---
+    st.markdown(create_player_card(player), unsafe_allow_html=True)
+    show_rich_content(player.html)
+
+    st.markdown("<hr class='custom-hr'>", unsafe_allow_html=True)
+    create_back_button("◀ 선수 목록으로 돌아가기")
+
+else:
+    # --- 목록 페이지 ---
+    st.markdown("""
+    <div class="text-center">
+        <h1 class='page-title'>🧑‍💻 선수 정보</h1>
+        <p>자세히 보고 싶은 선수를 클릭하세요.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if all_players:
+        num_columns = 4
+        cols = st.columns(num_columns)
+        for i, item in enumerate(all_players):
+            cols[i % num_columns].markdown(create_player_card(item), unsafe_allow_html=True)
+    else:
+        st.info("등록된 선수가 없습니다.")
+
+# --- (AWC_METRICS=1일 때만) rerun 측정 마무리, ?debug=metrics 이면 측정 패널 표시 ---
+metrics.end_rerun()
@@ -0,0 +1,276 @@
+# records.py
+#
+# 대회/레벨 YAML과 뉴스/선수 Markdown frontmatter를 읽은 뒤 한 번만 검증해서 만드는 읽기 전용 레코드.
+#   - 숫자 필드(difficulty_rating, bpm, tiles)는 로드할 때 한 번만 숫자로 바꿔 둡니다.
+#     (정렬/범위 필터에서 매번 문자열을 변환하지 않도록)
+#   - 반복되는 짧은 문자열(minititle, creator, tournament_id 등)은 sys.intern으로 공유합니다.
+#   - __slots__ + frozen dataclass라 레코드당 dict가 없고, 캐시끼리 같은 객체를 안전하게 공유합니다.
+# 잘못된 값이 있으면 RecordError를 던지고, 로더가 그 파일만 오류로 기록합니다.
+
+import sys
+from dataclasses import dataclass, fields, replace
+
+from html_sanitize import sanitize_html
+
+
+class RecordError(ValueError):
+    """YAML 내용이 레코드 스키마에 맞지 않을 때 발생하는 오류"""
+
+
+@dataclass(frozen=True, slots=True)
+class ShortcutLink:
+    label: str = '링크'
+    url: str = '#'
+    icon: str = ''
+
+
+@dataclass(frozen=True, slots=True)
+class DateEntry:
+    label: str = ''
+    value: str = ''
+
+
+@dataclass(frozen=True, slots=True)
+class Tournament:
+    id: str
+    content_hash: str
+    title: str = ''
+    minititle: str = ''
+    year: str = ''
+    bg_image_class: str = ''
+    banner_image_url: str = ''
+    status: str = ''
+    dates: tuple = ()
+    prize_pool: str = ''
+    organizer: str = ''
+    players: str = ''
+    shortcut_links: tuple = ()
+    youtube_video_id: str = ''
+    description: str = ''
+
+
+@dataclass(frozen=True, slots=True)
+class Level:
+    id: str
+    content_hash: str
+    title: str = ''
+    artist: str = ''
+    detail_artist: str = ''
+    creator: str = ''
+    detail_creator: str = ''
+    tournament_id: str = ''
+    minititle: str = ''
+    # 정렬/필터용 숫자 값과, 화면에 원문 그대로 보여줄 문자열 ("22.0"처럼 적힌 대로)
+    difficulty_rating: float = None
+    difficulty_label: str = ''
+    bpm: float = None
+    tiles: int = None
+    youtube_video_id: str = ''
+    download_url: str = ''
+
+
+@dataclass(frozen=True, slots=True)
+class NewsPost:
+    id: str
+    content_hash: str
+    title: str = ''
+    date: str = ''
+    author: str = ''
+    summary: str = ''
+    # 정리(sanitize)까지 끝난 본문 HTML (content_docs.py의 렌더링 캐시)
+    html: str = ''
+
+
+@dataclass(frozen=True, slots=True)
+class Player:
+    id: str
+    content_hash: str
+    nickname: str = ''
+    name: str = ''
+    country: str = ''
+    team: str = ''
+    profile_image_url: str = ''
+    html: str = ''
+
+
+# 값 종류가 적고 많은 레코드에서 반복되는 문자열 필드
+INTERNED_FIELDS = {
+    Tournament: ('status', 'organizer', 'prize_pool', 'players'),
+    Level: ('tournament_id', 'minititle', 'creator', 'detail_creator', 'artist', 'difficulty_label'),
+    NewsPost: ('author',),
+    Player: ('country', 'team'),
+}
+
+
+# --- 필드 변환 ---
+
+def _text(data, field, errors):
+    value = data.get(field)
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        errors.append(f'{field}: 문자열이어야 합니다 ({type(value).__name__})')
+        return ''
+    return str(value).strip()
+
+def _number(data, field, errors, integer=False, as_float=False):
+    # integer=True면 정수만 허용하고, as_float=True면 항상 float, 아니면 정수 값은 int로 둡니다.
+    value = data.get(field)
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        errors.append(f'{field}: 숫자여야 합니다 ({value!r})')
+        return None
+    try:
+        number = float(str(value).strip())
+    except ValueError:
+        errors.append(f'{field}: 숫자여야 합니다 ({value!r})')
+        return None
+    if number != number or number in (float('inf'), float('-inf')):
+        errors.append(f'{field}: 유한한 숫자여야 합니다 ({value!r})')
+        return None
+    if integer:
+        if not number.is_integer():
+            errors.append(f'{field}: 정수여야 합니다 ({value!r})')
+            return None
+        return int(number)
+    return number if as_float or not number.is_integer() else int(number)
+
+def _items(data, field, item_type, errors):
+    value = data.get(field)
+    if value is None:
+        return ()
+    if not isinstance(value, list):
+        errors.append(f'{field}: 목록이어야 합니다')
+        return ()
+    items = []
+    for i, item in enumerate(value):
+        if not isinstance(item, dict):
+            errors.append(f'{field}[{i}]: label/url 등을 가진 항목이어야 합니다')
+            continue
+        known = {f.name for f in fields(item_type)}
+        items.append(item_type(**{k: str(v) for k, v in item.items() if k in known and v is not None}))
+    return tuple(items)
+
+def _check_mapping(data):
+    if not isinstance(data, dict):
+        raise RecordError(f'최상위 값이 key: value 형식이어야 합니다 ({type(data).__name__})')
+
+def _raise_if_errors(errors):
+    if errors:
+        raise RecordError('; '.join(errors))
+
+
+# --- 레코드 생성 ---
+
+def tournament_from_dict(record_id, content_hash, data):
+    """YAML dict를 검증해 Tournament로 바꾸는 함수 (문제가 있으면 RecordError)"""
+    _check_mapping(data)
+    errors = []
+    year = _text(data, 'year', errors)
+    bg_image_class = _text(data, 'bg_image_class', errors) if 'bg_image_class' in data else ''
+    if 'bg_image_class' not in data and year:
+        # YAML 파일에 bg_image_class가 명시적으로 있으면 그것을 사용하고,
+        # 없으면 연도를 기반으로 동적으로 생성합니다.
+        bg_image_class = f'tournament_bg_{year}'
+
+    record = Tournament(
+        id=record_id,
+        content_hash=content_hash,
+        title=_text(data, 'title', errors),
+        minititle=_text(data, 'minititle', errors),
+        year=year,
+        bg_image_class=bg_image_class,
+        banner_image_url=_text(data, 'banner_image_url', errors),
+        status=_text(data, 'status', errors),
+        dates=_items(data, 'dates', DateEntry, errors),
+        prize_pool=_text(data, 'prize_pool', errors),
+        organizer=_text(data, 'organizer', errors),
+        players=_text(data, 'players', errors),
+        shortcut_links=_items(data, 'shortcut_links', ShortcutLink, errors),
+        youtube_video_id=_text(data, 'youtube_video_id', errors),
+        # description은 원문 HTML이라 페이지에 그대로 넣기 전에 허용 태그만 남깁니다. (파일 해시당 한 번)
+        description=sanitize_html(_text(data, 'description', errors)),
+    )
+    if not record.title:
+        errors.append('title: 필수 항목입니다')
+    _raise_if_errors(errors)
+    return intern_strings(record)
+
+def level_from_dict(record_id, content_hash, data):
+    """YAML dict를 검증해 Level로 바꾸는 함수 (문제가 있으면 RecordError)"""
+    _check_mapping(data)
+    errors = []
+    record = Level(
+        id=record_id,
+        content_hash=content_hash,
+        title=_text(data, 'title', errors),
+        artist=_text(data, 'artist', errors),
+        detail_artist=_text(data, 'detail_artist', errors),
+        creator=_text(data, 'creator', errors),
+        detail_creator=_text(data, 'detail_creator', errors),
+        tournament_id=_text(data, 'tournament_id', errors),
+        minititle=_text(data, 'minititle', errors),
+        difficulty_rating=_number(data, 'difficulty_rating', errors, as_float=True),
+        difficulty_label=_text(data, 'difficulty_rating', errors),
+        bpm=_number(data, 'bpm', errors),
+        tiles=_number(data, 'tiles', errors, integer=True),
+        youtube_video_id=_text(data, 'youtube_video_id', errors),
+        download_url=_text(data, 'download_url', errors),
+    )
+    if not record.title:
+        errors.append('title: 필수 항목입니다')
+    _raise_if_errors(errors)
+    return intern_strings(record)
+
+def news_from_dict(record_id, content_hash, data, html):
+    """뉴스 frontmatter dict와 렌더링된 본문으로 NewsPost를 만드는 함수 (문제가 있으면 RecordError)"""
+    _check_mapping(data)
+    errors = []
+    record = NewsPost(
+        id=record_id,
+        content_hash=content_hash,
+        title=_text(data, 'title', errors),
+        date=_text(data, 'date', errors),
+        author=_text(data, 'author', errors),
+        summary=_text(data, 'summary', errors),
+        html=html,
+    )
+    if not record.title:
+        errors.append('title: 필수 항목입니다')
+    _raise_if_errors(errors)
+    return intern_strings(record)
+
+def player_from_dict(record_id, content_hash, data, html):
+    """선수 frontmatter dict와 렌더링된 본문으로 Player를 만드는 함수 (문제가 있으면 RecordError)"""
+    _check_mapping(data)
+    errors = []
+    record = Player(
+        id=record_id,
+        content_hash=content_hash,
+        nickname=_text(data, 'nickname', errors),
+        name=_text(data, 'name', errors),
+        country=_text(data, 'country', errors),
+        team=_text(data, 'team', errors),
+        profile_image_url=_text(data, 'profile_image_url', errors),
+        html=html,
+    )
+    if not record.nickname:
+        errors.append('nickname: 필수 항목입니다')
+    _raise_if_errors(errors)
+    return intern_strings(record)
+
+def intern_strings(record):
+    """반복되는 문자열 필드를 sys.intern으로 바꾼 레코드를 반환하는 함수
+
+    다른 프로세스에서 파싱되어 pickle로 넘어온 레코드도 이 함수를 거치면
+    같은 값의 문자열이 다시 한 객체를 공유합니다.
+    """
+    changes = {}
+    for field in INTERNED_FIELDS.get(type(record), ()):
+        value = getattr(record, field)
+        if value:
+            interned = sys.intern(value)
+            if interned is not value:
+                changes[field] = interned
+    return replace(record, **changes) if changes else record
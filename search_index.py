@@ -0,0 +1,434 @@
+# search_index.py
+#
+# 레벨 검색창용 n-gram 역색인.
+# 콘텐츠 버전마다 한 번 만들어지며, 다음과 같이 정규화한 문자열로 검색합니다.
+#   - NFKD 정규화 + casefold, 발음 구별 기호 제거 (É → e, Ｌ → l)
+#   - 모양이 비슷한 문자 접기 (Λ → a, И → n, ∀ → a, 글자 사이의 8 → b 등)
+#   - 한글 음절을 호환 자모로 분해 (다밍 → ㄷㅏㅁㅣㅇ) 해서 입력 중인 글자도 매칭
+# 1~3자 검색어는 그 n-gram의 문서 목록이 곧 결과이며, 목록을 미리 관련도순으로 정렬해 두어
+# 한 페이지 분량만 잘라 읽습니다. 더 긴 검색어는 그대로 들어 있는 레벨을 가장 드문 3-gram으로 찾고,
+# 그런 결과가 적으면 3-gram이 절반 이상 겹치는 레벨도 후보로 인정해 오타를 어느 정도 허용합니다.
+#
+# 사용법:  python search_index.py   (모든 레벨 제목의 각 접두어로 그 레벨이 검색되는지 확인)
+
+import heapq
+import math
+import sys
+import tempfile
+import unicodedata
+from array import array
+from collections import namedtuple
+
+import numpy as np
+
+SEARCH_FIELDS = ('title', 'artist', 'creator')
+FIELD_WEIGHTS = {'title': 1.0, 'artist': 0.7, 'creator': 0.6}
+
+GRAM_SIZE = 3
+MIN_GRAM_RATIO = 0.5
+# 정확히 일치하는 결과가 이보다 적을 때만 오타 허용 검색을 함께 수행합니다.
+FUZZY_MIN_RESULTS = 10
+
+# 필드 경계 표시 문자. 이 문자가 들어간 n-gram은 색인하지 않습니다.
+_FIELD_SEP = '\x1f'
+
+# 필드 안에서 검색어가 처음 나오는 위치에 따른 점수 (필드 전체와 일치, 필드 시작, 단어 시작, 단어 중간)
+MATCH_SCORES = (4.0, 3.0, 2.5, 2.0)
+MATCH_EXACT, MATCH_PREFIX, MATCH_WORD, MATCH_INNER = range(len(MATCH_SCORES))
+
+# --- 정규화 ---
+
+# 스타일을 위해 라틴 문자 대신 쓰이는 문자들 (casefold 이후 기준)
+CONFUSABLES = {
+    'λ': 'a', 'α': 'a', 'д': 'a', '∀': 'a', 'ά': 'a',
+    'β': 'b', 'в': 'b', 'ь': 'b',
+    'ϲ': 'c', 'с': 'c',
+    'ε': 'e', 'е': 'e', 'ё': 'e', 'σ': 'e', 'ξ': 'e', '∃': 'e',
+    'η': 'n', 'и': 'n', 'й': 'n', 'п': 'n', 'π': 'n',
+    'ι': 'i', 'і': 'i', 'ї': 'i',
+    'κ': 'k', 'к': 'k',
+    'м': 'm', 'μ': 'u',
+    'ο': 'o', 'о': 'o', 'θ': 'o', 'ø': 'o', 'ö': 'o',
+    'ρ': 'p', 'р': 'p',
+    'я': 'r', 'г': 'r',
+    'ѕ': 's',
+    'τ': 't', 'т': 't',
+    'υ': 'u', 'ц': 'u',
+    'ω': 'w', 'ш': 'w', 'щ': 'w',
+    'χ': 'x', 'х': 'x', 'ж': 'x',
+    'γ': 'y', 'у': 'y', 'ч': 'y',
+    'ζ': 'z',
+}
+
+# 글자 사이에 끼어 있을 때만 문자로 취급하는 숫자 (LΛ8YRИTH → labyrnth)
+DIGIT_CONFUSABLES = {'0': 'o', '1': 'l', '3': 'e', '4': 'a', '5': 's', '7': 't', '8': 'b'}
+
+_CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+_JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+_JONGSEONG = ('', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ',
+              'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ')
+
+# 겹자모는 입력 도중 상태와 맞추기 위해 낱자로 나눕니다 (과 → ㄱㅗㅏ, 닭 → ㄷㅏㄹㄱ)
+_JAMO_SPLIT = {
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+    'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+}
+
+
+def _hangul_jamo(char):
+    """한 글자를 호환 자모 문자열로 바꾸는 함수 (한글이 아니면 None)"""
+    code = ord(char)
+    if 0xAC00 <= code <= 0xD7A3:
+        index = code - 0xAC00
+        jamo = _CHOSEONG[index // 588] + _JUNGSEONG[(index % 588) // 28] + _JONGSEONG[index % 28]
+    elif 0x3131 <= code <= 0x318E:
+        jamo = char
+    elif 0x1100 <= code <= 0x1112:
+        jamo = _CHOSEONG[code - 0x1100]
+    elif 0x1161 <= code <= 0x1175:
+        jamo = _JUNGSEONG[code - 0x1161]
+    elif 0x11A8 <= code <= 0x11C2:
+        jamo = _JONGSEONG[code - 0x11A7]
+    else:
+        return None
+    return ''.join(_JAMO_SPLIT.get(j, j) for j in jamo)
+
+
+def normalize_with_positions(text):
+    """검색용으로 정규화한 문자열과, 각 문자가 원문의 몇 번째 글자에서 왔는지를 반환하는 함수"""
+    chars = []
+    positions = []
+    for index, char in enumerate(text or ''):
+        if char.isascii():
+            folded = char.lower() if char.isalnum() else ' '
+        elif (jamo := _hangul_jamo(char)) is not None:
+            folded = jamo
+        else:
+            folded = ''
+            for c in unicodedata.normalize('NFKD', char).casefold():
+                if unicodedata.category(c) == 'Mn':
+                    continue
+                c = CONFUSABLES.get(c, c)
+                folded += c if c.isalnum() else ' '
+        for c in folded:
+            if c == ' ' and (not chars or chars[-1] == ' '):
+                continue
+            chars.append(c)
+            positions.append(index)
+
+    while chars and chars[-1] == ' ':
+        chars.pop()
+        positions.pop()
+
+    # 글자 사이에 낀 숫자만 문자로 접습니다. ("20.8"이나 "AWC2025"의 숫자는 그대로 둡니다.)
+    for i in range(1, len(chars) - 1):
+        c = chars[i]
+        if c in DIGIT_CONFUSABLES and chars[i - 1].isalpha() and chars[i + 1].isalpha():
+            chars[i] = DIGIT_CONFUSABLES[c]
+    return ''.join(chars), positions
+
+
+def normalize(text):
+    return normalize_with_positions(text)[0]
+
+
+def query_variants(text):
+    """검색어를 정규화한 문자열 목록 (빈 검색어면 빈 튜플)
+
+    색인은 양옆이 글자인 숫자만 접으므로, 입력 중인 검색어의 끝 숫자("LΛ8" → "la8")는 다음 글자가
+    들어오기 전까지 색인의 "lab"과 맞지 않습니다. 글자 뒤에 오는 끝 숫자는 접은 형태("lab")도 함께
+    검색합니다. ("level1"처럼 숫자 그대로 색인된 경우도 놓치지 않도록 원래 형태를 먼저 둡니다.)
+    """
+    query = normalize(text)
+    if not query:
+        return ()
+    if len(query) >= 2 and query[-1] in DIGIT_CONFUSABLES and query[-2].isalpha():
+        return (query, query[:-1] + DIGIT_CONFUSABLES[query[-1]])
+    return (query,)
+
+
+def _grams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _gram_matches(text):
+    """필드 문자열의 1~GRAM_SIZE자 n-gram → 처음 나오는 위치의 일치 종류 (MATCH_*)"""
+    matches = {}
+    length = len(text)
+    if not length:
+        return matches
+    # 위치별 일치 종류 (필드 시작, 공백 다음이면 단어 시작, 그 밖에는 단어 중간)
+    kinds = [MATCH_PREFIX, *(MATCH_WORD if char == ' ' else MATCH_INNER for char in text[:-1])]
+    for n in range(1, min(GRAM_SIZE, length) + 1):
+        # 뒤에서부터 채우므로 같은 n-gram은 가장 앞 위치가 남습니다. (str.find와 같은 기준)
+        first = {text[i:i + n]: i for i in range(length - n, -1, -1)}
+        matches.update(zip(first, map(kinds.__getitem__, first.values())))
+    if length <= GRAM_SIZE:
+        matches[text] = MATCH_EXACT
+    return matches
+
+
+# --- 색인 ---
+
+SearchHit = namedtuple('SearchHit', ['record', 'score', 'field'])
+
+
+class SearchIndex:
+    """레코드 목록(제목순)에 대한 1~3-gram 역색인
+
+    search()는 점수 내림차순(동점이면 원래 순서)으로 SearchHit 목록을 반환하고,
+    highlight()는 원문 기준 (시작, 끝) 구간 목록을 반환합니다.
+
+    n-gram마다 문서 목록을 그 n-gram을 검색어로 했을 때의 순서(점수 내림차순, 동점이면 문서 순서)로
+    저장하고, 각 문서의 (필드, 일치 종류) 번호를 나란히 둡니다. 1~3자 검색어는 점수를 다시 계산하지 않습니다.
+    """
+
+    def __init__(self, records, fields=SEARCH_FIELDS):
+        self.records = records
+        self.fields = fields
+        self._texts = []
+        self._joined = []
+
+        # (필드, 일치 종류) 번호 → 점수. 번호는 점수 내림차순(동점이면 앞 필드)이라 작을수록 좋은 일치입니다.
+        matches = sorted(((field_index, kind) for field_index in range(len(fields)) for kind in range(len(MATCH_SCORES))),
+                         key=lambda match: (-self._match_score(*match), match[0]))
+        self._matches = tuple(matches)
+        code_of = {match: code for code, match in enumerate(matches)}
+        field_codes = [[code_of[field_index, kind] for kind in range(len(MATCH_SCORES))]
+                       for field_index in range(len(fields))]
+        scores = sorted({self._match_score(*match) for match in matches}, reverse=True)
+        score_ranks = np.array([scores.index(self._match_score(*match)) for match in matches], dtype=np.int64)
+
+        # 문서마다 (n-gram 번호, 일치 번호)를 이어 붙여 두고, 정렬은 마지막에 NumPy로 한 번에 합니다.
+        # 아티스트/제작자처럼 여러 레벨이 같은 값을 쓰는 필드는 정규화와 n-gram 분석을 한 번만 합니다.
+        gram_ids = {}
+        analyzed = {}
+        doc_grams = array('I')
+        doc_codes = bytearray()
+        doc_sizes = array('I')
+        for record in records:
+            texts = []
+            size = len(doc_grams)
+            for field_index, field in enumerate(fields):
+                value = str(getattr(record, field, None) or '')
+                entry = analyzed.get((field_index, value))
+                if entry is None:
+                    text = normalize(value)
+                    field_matches = _gram_matches(text)
+                    new_grams = [gram for gram in field_matches if gram not in gram_ids]
+                    gram_ids.update(zip(new_grams, range(len(gram_ids), len(gram_ids) + len(new_grams))))
+                    entry = analyzed[field_index, value] = (
+                        text,
+                        array('I', map(gram_ids.__getitem__, field_matches)),
+                        bytes(map(field_codes[field_index].__getitem__, field_matches.values())))
+                texts.append(entry[0])
+                doc_grams.extend(entry[1])
+                doc_codes.extend(entry[2])
+            self._texts.append(tuple(texts))
+            self._joined.append(_FIELD_SEP.join(texts))
+            doc_sizes.append(len(doc_grams) - size)
+
+        self._postings = {}
+        self._codes = {}
+        if not doc_grams:
+            return
+        doc_count = len(records)
+        code_count = len(matches)
+        grams = np.frombuffer(doc_grams, dtype=np.uint32).astype(np.int64)
+        codes = np.frombuffer(bytes(doc_codes), dtype=np.uint8).astype(np.int64)
+        docs = np.repeat(np.arange(doc_count, dtype=np.int64), np.frombuffer(doc_sizes, dtype=np.uint32))
+
+        # 같은 문서에 같은 n-gram이 여러 필드에서 나오면 가장 좋은 일치(가장 작은 번호)만 남깁니다.
+        order = np.argsort((grams * doc_count + docs) * code_count + codes, kind='stable')
+        grams, docs, codes = grams[order], docs[order], codes[order]
+        first = np.ones(len(grams), dtype=bool)
+        first[1:] = (grams[1:] != grams[:-1]) | (docs[1:] != docs[:-1])
+        grams, docs, codes = grams[first], docs[first], codes[first]
+
+        # n-gram마다 (점수 순위, 문서 번호) 순으로 정렬해 n-gram별 구간으로 나눕니다.
+        order = np.argsort((grams * len(scores) + score_ranks[codes]) * doc_count + docs, kind='stable')
+        grams = grams[order]
+        docs = docs[order].astype(np.uint32)
+        codes = codes[order].astype(np.uint8)
+        bounds = np.flatnonzero(np.diff(grams)) + 1
+        starts = np.concatenate(([0], bounds)).tolist()
+        ends = np.concatenate((bounds, [len(grams)])).tolist()
+        gram_by_id = list(gram_ids)
+        for start, end in zip(starts, ends):
+            gram = gram_by_id[int(grams[start])]
+            self._postings[gram] = array('I', docs[start:end].tobytes())
+            self._codes[gram] = codes[start:end].tobytes()
+
+    def _match_score(self, field_index, kind):
+        return MATCH_SCORES[kind] * FIELD_WEIGHTS.get(self.fields[field_index], 0.5)
+
+    def __len__(self):
+        return len(self.records)
+
+    def _exact_candidates(self, query):
+        """검색어가 그대로 들어 있는 문서 번호 목록"""
+        if len(query) <= GRAM_SIZE:
+            # 1~3자 검색어는 그 n-gram의 문서 목록이 곧 결과입니다.
+            return self._postings.get(query, ())
+
+        # 가장 드문 3-gram의 문서 목록만 확인하면 됩니다.
+        rarest = min((self._postings.get(gram, ()) for gram in _grams(query, GRAM_SIZE)), key=len)
+        return [doc for doc in rarest if query in self._joined[doc]]
+
+    def _fuzzy_candidates(self, query_grams, required):
+        lists = sorted((self._postings.get(gram, ()) for gram in query_grams), key=len)
+        # 비둘기집 원리: required개 이상 겹치는 문서는 가장 짧은 (k - required + 1)개
+        # 목록 중 적어도 하나에 들어 있으므로, 그 목록들만 합쳐도 후보가 빠지지 않습니다.
+        candidates = set()
+        for docs in lists[:len(query_grams) - required + 1]:
+            candidates.update(docs)
+        return candidates
+
+    def _field_score(self, text, query, query_grams, required):
+        position = text.find(query)
+        if position == 0:
+            return MATCH_SCORES[MATCH_EXACT if len(text) == len(query) else MATCH_PREFIX]
+        if position > 0:
+            return MATCH_SCORES[MATCH_WORD if text[position - 1] == ' ' else MATCH_INNER]
+        if not query_grams:
+            return 0.0
+        matched = sum(1 for gram in query_grams if gram in text)
+        if matched < required:
+            return 0.0
+        return 1.5 * matched / len(query_grams)
+
+    def search(self, query, limit=None):
+        return self.search_with_count(query, limit)[0]
+
+    def search_with_count(self, query, limit=None):
+        """(점수순 상위 limit개의 SearchHit 목록, 전체 결과 수)를 반환하는 함수
+
+        목록 페이지처럼 앞쪽 몇 개만 필요할 때 limit을 주면 전체 결과를 정렬하거나 만들지 않습니다.
+        """
+        variants = query_variants(query)
+        if not variants:
+            return [], 0
+
+        if len(variants) == 1 and len(variants[0]) <= GRAM_SIZE:
+            # 미리 관련도순으로 정렬해 둔 목록에서 필요한 만큼만 읽습니다.
+            docs = self._postings.get(variants[0], ())
+            codes = self._codes.get(variants[0], b'')
+            stop = len(docs) if limit is None else min(limit, len(docs))
+            hits = []
+            for doc, code in zip(docs[:stop], codes[:stop]):
+                field_index, kind = self._matches[code]
+                hits.append(SearchHit(self.records[doc], self._match_score(field_index, kind), self.fields[field_index]))
+            return hits, len(docs)
+
+        candidates = set()
+        for variant in variants:
+            candidates.update(self._exact_candidates(variant))
+        matchers = [(variant, (), 0) for variant in variants]
+        if len(candidates) < FUZZY_MIN_RESULTS and len(variants[0]) > GRAM_SIZE:
+            # 정확히 일치하는 결과가 적을 때만 3-gram이 절반 이상 겹치는 오타 후보를 더합니다.
+            matchers = []
+            for variant in variants:
+                query_grams = _grams(variant, GRAM_SIZE)
+                required = max(1, math.ceil(len(query_grams) * MIN_GRAM_RATIO))
+                candidates.update(self._fuzzy_candidates(query_grams, required))
+                matchers.append((variant, query_grams, required))
+
+        scored = []
+        for doc in candidates:
+            best_score, best_field = 0.0, None
+            for field, text in zip(self.fields, self._texts[doc]):
+                score = max(self._field_score(text, variant, query_grams, required)
+                            for variant, query_grams, required in matchers) * FIELD_WEIGHTS.get(field, 0.5)
+                if score > best_score:
+                    best_score, best_field = score, field
+            if best_field is not None:
+                scored.append((-best_score, doc, best_field))
+
+        top = sorted(scored) if limit is None else heapq.nsmallest(limit, scored)
+        return [SearchHit(self.records[doc], -neg_score, field) for neg_score, doc, field in top], len(scored)
+
+    def highlight(self, text, query):
+        """검색어와 매칭되는 원문 구간 목록 [(시작, 끝), ...]을 반환하는 함수"""
+        return highlight(text, query)
+
+
+def highlight(text, query):
+    """검색어와 매칭되는 원문 구간 목록 [(시작, 끝), ...]을 반환하는 함수 (색인 없이 원문만 사용)"""
+    variants = query_variants(query)
+    normalized, positions = normalize_with_positions(text)
+    if not variants or not normalized:
+        return []
+    # 그대로 들어 있는 형태가 있으면 그것을, 없으면 원래 형태로 3-gram 강조를 합니다.
+    query = next((variant for variant in variants if variant in normalized), variants[0])
+
+    covered = [False] * len(normalized)
+    start = normalized.find(query)
+    if start >= 0:
+        while start >= 0:
+            covered[start:start + len(query)] = [True] * len(query)
+            start = normalized.find(query, start + 1)
+    elif len(query) > GRAM_SIZE:
+        for gram in _grams(query, GRAM_SIZE):
+            start = normalized.find(gram)
+            while start >= 0:
+                covered[start:start + GRAM_SIZE] = [True] * GRAM_SIZE
+                start = normalized.find(gram, start + 1)
+
+    spans = []
+    for i, is_covered in enumerate(covered):
+        if not is_covered or normalized[i] == ' ':
+            continue
+        begin, end = positions[i], positions[i] + 1
+        if spans and begin <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], end))
+        else:
+            spans.append((begin, end))
+    return spans
+
+
+# --- 확인 ---
+
+def check_prefixes(search, records):
+    """레벨 제목을 한 글자씩 입력하는 도중에도 그 레벨이 검색되는지 확인하는 함수
+
+    search(query)는 찾은 레코드 id 집합을 반환하는 함수입니다. 찾지 못한 (id, 입력) 목록을 반환합니다.
+    """
+    failures = []
+    for record in records:
+        title = record.title or ''
+        for end in range(1, len(title) + 1):
+            prefix = title[:end]
+            if normalize(prefix) and record.id not in search(prefix):
+                failures.append((record.id, prefix))
+    return failures
+
+
+def main(argv=None):
+    # 다른 모듈이 이 모듈을 불러오므로 확인용 모듈은 여기서만 불러옵니다.
+    from content_build import CONTENT_DIR
+    from content_db import ContentDatabase
+    from content_store import ContentStore
+
+    argv = sys.argv[1:] if argv is None else argv
+    content_dir = argv[0] if argv else CONTENT_DIR
+    levels = ContentStore(content_dir).refresh().levels
+    index = SearchIndex(levels)
+    failures = {'memory': check_prefixes(lambda query: {hit.record.id for hit in index.search(query)}, levels)}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database = ContentDatabase(f'{tmp_dir}/content.sqlite3', content_dir).refresh()
+        failures['sqlite'] = check_prefixes(
+            lambda query: {level.id for level in database.query_levels(search=query, page_size=len(levels) or 1)[0]},
+            levels)
+        database._connect().close()
+
+    for backend, backend_failures in failures.items():
+        for level_id, prefix in backend_failures:
+            print(f'  {backend}: "{prefix}" 로 {level_id} 를 찾지 못했습니다', file=sys.stderr)
+    print(f'접두어 검색 확인: 레벨 {len(levels)}개, '
+          + ', '.join(f'{backend} 실패 {len(backend_failures)}건' for backend, backend_failures in failures.items()))
+    return 1 if any(failures.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# serve.py
+#
+# 정적 파일(app/static/)을 캐시 친화적으로 서빙하는 앱 진입점.
+# app.py와 pages/는 그대로 실행하고, 정적 파일 요청에 다음을 더합니다.
+#   - app/static/bundle/ 요청과 ?v=<해시> 인자가 붙은 app/static/ 요청:
+#     Cache-Control: public, max-age=1년, immutable  (주소에 내용 해시가 있으므로 안전)
+#   - 번들 파일은 브라우저가 Accept-Encoding으로 지원을 알리면 미리 압축한 .br / .gz 파일을
+#     Content-Encoding과 함께 전송
+# Streamlit의 app/static 핸들러(starlette)는 Cache-Control을 붙이지 않고 압축도 하지 않으므로,
+# 재방문자가 로고, 배경, 글꼴, 스타일시트를 다시 받지 않게 하려면 이 진입점으로 띄웁니다.
+#
+# 사용법:  streamlit run serve.py   (또는 uvicorn serve:app)
+# 서버는 콘텐츠, 에셋, HTML 조각을 예열(warmup.py)한 뒤에 요청을 받기 시작하고,
+# /readyz 는 예열이 끝나면 200, 그 전에는 503을 돌려줍니다.
+#
+# ASGI 진입점(st.App)이 있는 Streamlit에서만 동작합니다. streamlit run app.py 로 띄우면 앱은 그대로 동작하지만
+# 정적 파일에 캐시 헤더가 붙지 않아, 브라우저가 재방문 때마다 다시 확인(조건부 요청)합니다.
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import streamlit as st
+from starlette.middleware import Middleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from assets import STATIC_URL_PREFIX
+from bundle import BUNDLE_URL_PREFIX, ENCODINGS, load_bundle_manifest
+from warmup import is_ready, warm_up
+
+IMMUTABLE_CACHE_CONTROL = b'public, max-age=31536000, immutable'
+
+_BUNDLE_PATH = '/' + BUNDLE_URL_PREFIX + '/'
+_STATIC_PATH = '/' + STATIC_URL_PREFIX + '/'
+
+
+def _accepted_encodings(headers):
+    accepted = set()
+    for name, value in headers:
+        if name == b'accept-encoding':
+            for token in value.decode('latin-1').split(','):
+                encoding, _, params = token.strip().partition(';')
+                if params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+                    accepted.add(encoding.strip().lower())
+    return accepted
+
+
+def _is_versioned(query_string):
+    # assets.py가 만드는 app/static/...?v=<해시> 주소인지 (해시가 바뀌면 주소도 바뀜)
+    return any(pair.startswith(b'v=') and len(pair) > 2 for pair in query_string.split(b'&'))
+
+
+class BundleMiddleware:
+    """app/static/bundle/와 ?v= 정적 파일 응답에 immutable 캐시 헤더를 붙이고, 미리 압축한 번들 파일을 골라 주는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+        # 번들 파일 이름 → 매니페스트 항목 (MIME 형식과 미리 압축한 형식)
+        self.entries = {entry['file']: entry for entry in load_bundle_manifest().values()}
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get('path', '')
+        entry = None
+        if scope['type'] == 'http' and _BUNDLE_PATH in path:
+            entry = self.entries.get(path.split(_BUNDLE_PATH, 1)[1])
+        if entry is None:
+            if scope['type'] == 'http' and _STATIC_PATH in path and _is_versioned(scope.get('query_string', b'')):
+                await self.app(scope, receive, _with_immutable_cache(send))
+            else:
+                await self.app(scope, receive, send)
+            return
+
+        accepted = _accepted_encodings(scope.get('headers', ()))
+        encoding = next((name for name in ENCODINGS if name in entry['encodings'] and name in accepted), None)
+        if encoding is not None:
+            suffix = ENCODINGS[encoding]
+            scope = dict(scope, path=path + suffix, raw_path=scope.get('raw_path', path.encode()) + suffix.encode())
+
+        async def send_with_headers(message):
+            if message['type'] == 'http.response.start' and message['status'] == 200:
+                headers = [(name, value) for name, value in message.get('headers', ())
+                           if name.lower() not in (b'cache-control', b'content-type', b'content-encoding', b'vary')]
+                headers.append((b'cache-control', IMMUTABLE_CACHE_CONTROL))
+                headers.append((b'content-type', entry['mime'].encode('latin-1')))
+                headers.append((b'vary', b'accept-encoding'))
+                if encoding is not None:
+                    headers.append((b'content-encoding', encoding.encode('latin-1')))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+def _with_immutable_cache(send):
+    async def send_with_headers(message):
+        if message['type'] == 'http.response.start' and message['status'] == 200:
+            headers = [(name, value) for name, value in message.get('headers', ())
+                       if name.lower() != b'cache-control']
+            headers.append((b'cache-control', IMMUTABLE_CACHE_CONTROL))
+            message = dict(message, headers=headers)
+        await send(message)
+    return send_with_headers
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # 예열은 블로킹 작업이라 스레드에서 실행합니다. 끝날 때까지 서버는 요청을 받지 않습니다.
+    await asyncio.to_thread(warm_up)
+    yield
+
+
+async def readiness(request):
+    if is_ready():
+        return PlainTextResponse('ok')
+    return PlainTextResponse('warming up', status_code=503)
+
+
+app = st.App('app.py', lifespan=lifespan, routes=[Route('/readyz', readiness)],
+             middleware=[Middleware(BundleMiddleware)])
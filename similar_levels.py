@@ -0,0 +1,285 @@
+# similar_levels.py
+#
+# 레벨 상세 페이지의 "비슷한 레벨" 목록을 위한 최근접 이웃 표.
+# 콘텐츠 버전마다 한 번, 레벨별 특성 행렬(NumPy)을 만들고 레벨마다 가장 가까운 TOP_K개를 미리 구해 둡니다.
+# 상세 페이지는 표에서 한 줄을 읽기만 하므로 조회할 때 다른 레벨과 비교하지 않습니다.
+#
+# 특성과 거리
+#   - 난이도, log(BPM), log(타일 수)를 각각 표준화(평균 0, 표준편차 1)하고 FEATURE_WEIGHTS를 곱합니다.
+#     값이 없는 레벨은 그 특성을 평균값(0)으로 둡니다.
+#   - 대회가 다르면 제곱 거리에 TOURNAMENT_PENALTY를 더해 같은 대회 레벨을 조금 더 가깝게 봅니다.
+#
+# 계산 (레벨 수만큼의 전체 쌍 비교를 피함)
+#   - 특성 공간을 분위수 경계의 격자(칸이 정육면체에 가깝도록 특성마다 칸 수를 나눔)로 나누고,
+#     칸마다 그 칸의 레벨과 주변 3^d칸의 레벨 사이 거리만 행렬 곱으로 한 번에 계산합니다.
+#   - k번째 이웃까지의 거리가 주변 칸 경계까지의 거리보다 짧으면 그 밖에 더 가까운 레벨이 있을 수 없으므로 결과가 정확합니다.
+#     그렇지 않은 레벨은 주변 5^d, 7^d칸으로 넓혀 다시 찾고, 그래도 남는 레벨만 전체 레벨과 묶음 단위로 비교합니다.
+#   - 레벨 5만 개(값이 고르게 퍼진 경우)에서 약 2초, 2만 개에서 약 0.8초 걸립니다.
+#   - 대회 벌점은 전체/대회별 두 번의 유클리드 계산 결과를 합쳐서 반영합니다. (top_k_neighbours 참고)
+
+import numpy as np
+
+# 한 레벨에 미리 구해 둘 이웃 수
+TOP_K = 8
+
+# 특성 이름 → (레코드 필드, 로그 변환 여부, 가중치)
+FEATURES = {
+    'difficulty': ('difficulty_rating', False, 1.0),
+    'bpm': ('bpm', True, 0.6),
+    'tiles': ('tiles', True, 0.4),
+}
+
+# 다른 대회 레벨에 더하는 제곱 거리
+TOURNAMENT_PENALTY = 0.25
+
+# 격자 한 칸에 평균적으로 들어갈 레벨 수 (칸이 작으면 확인 실패가 늘고, 크면 칸마다 비교가 늘어남)
+POINTS_PER_CELL = 4 * TOP_K
+
+# 격자로 이웃을 찾을 때 넓혀 볼 주변 칸 수의 최대 (1이면 3^d칸, 2이면 5^d칸 …)
+MAX_RADIUS = 3
+
+# 한 번에 만드는 거리 행렬의 최대 크기 (바이트)
+BLOCK_BYTES = 64 << 20
+
+
+def _standardized(values, log):
+    column = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    if log:
+        column = np.log1p(np.clip(column, 0, None))
+    present = ~np.isnan(column)
+    if not present.any():
+        return np.zeros(len(column))
+    mean = column[present].mean()
+    std = column[present].std() or 1.0
+    column = (column - mean) / std
+    column[~present] = 0.0
+    return column
+
+
+def feature_matrix(columns):
+    """특성 이름 → 값 목록 dict로 (레벨 수, 특성 수) 가중 표준화 행렬을 만드는 함수"""
+    return np.column_stack([
+        _standardized(columns[name], log) * weight
+        for name, (_, log, weight) in FEATURES.items()
+    ]) if columns else np.zeros((0, len(FEATURES)))
+
+
+def _nearest(distances, candidates, k):
+    # 거리 행렬의 행마다 가장 가까운 k개 (거리, 후보 번호 순으로 정렬) → (이웃 번호, 제곱 거리)
+    part = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    part_distances = np.take_along_axis(distances, part, axis=1)
+    order = np.lexsort((candidates[part], part_distances), axis=1)
+    return candidates[np.take_along_axis(part, order, axis=1)], np.take_along_axis(part_distances, order, axis=1)
+
+
+def _brute_force(features, rows, k):
+    # rows의 이웃을 전체 점과 묶음 단위로 비교해 구합니다. (격자로 확인하지 못한 점만)
+    n = len(features)
+    squared = (features * features).sum(axis=1)
+    everyone = np.arange(n)
+    block = max(1, BLOCK_BYTES // (n * 8))
+    neighbours = np.empty((len(rows), k), dtype=np.int64)
+    distances_out = np.empty((len(rows), k))
+    for start in range(0, len(rows), block):
+        batch = rows[start:start + block]
+        distances = features[batch] @ (-2 * features.T)
+        distances += squared[batch, None]
+        distances += squared[None, :]
+        np.maximum(distances, 0, out=distances)
+        distances[np.arange(len(batch)), batch] = np.inf
+        neighbours[start:start + block], distances_out[start:start + block] = _nearest(distances, everyone, k)
+    return neighbours, distances_out
+
+
+def _duplicate_neighbours(features, k):
+    # 같은 특성 값을 가진 점이 자기 말고도 k개 이상이면 그 점들이 (거리 0으로) 가장 가까운 이웃입니다.
+    # 값이 없는 레벨이 많아 같은 점이 수천 개 겹쳐도 격자 한 칸을 전부 비교하지 않게 합니다.
+    _, inverse, counts = np.unique(features, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.reshape(-1)
+    rows = np.flatnonzero(counts[inverse] > k)
+    if len(rows) == 0:
+        return rows, np.empty((0, k), dtype=np.int64)
+    order = np.argsort(inverse, kind='stable')
+    first = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    members = order[first[inverse[rows], None] + np.arange(k + 1)]
+    # 앞의 k+1개 중 자기 자신을 맨 뒤로 보내고 k개만 남깁니다.
+    keep = np.argsort(members == rows[:, None], axis=1, kind='stable')[:, :k]
+    return rows, np.take_along_axis(members, keep, axis=1)
+
+
+def _grid(features, dims, n):
+    # 특성마다 분위수로 칸 경계를 정해 칸마다 점 수가 고르게 되도록 합니다.
+    # 맨 바깥 칸은 무한대까지 이어지고, 경계가 겹치는 특성(같은 값이 많음)은 칸 수가 줄어듭니다.
+    # 이웃은 모든 방향으로 같은 거리 안에서 찾으므로, 칸이 정육면체에 가깝도록 특성마다 퍼진 정도
+    # (가중치를 곱한 표준편차)에 비례해 칸 수를 나눕니다. (가중치가 작은 특성을 너무 잘게 나누지 않도록)
+    spread = features[:, dims].std(axis=0)
+    side = (np.prod(spread) * POINTS_PER_CELL / n) ** (1 / len(dims))
+    coords, boundaries = [], []
+    for dim, dim_spread in zip(dims, spread.tolist()):
+        bins = max(1, round(dim_spread / side))
+        values = features[:, dim]
+        inner = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]))
+        coords.append(np.searchsorted(inner, values, side='right'))
+        boundaries.append(inner)
+    return np.stack(coords, axis=1), boundaries
+
+
+def _margins(features, dims, coords, boundaries, radius):
+    # 점마다 주변 radius칸까지 덮는 구간의 경계까지 가장 짧은 거리.
+    # k번째 이웃이 이 안에 있으면 구간 밖에 더 가까운 점이 없습니다.
+    margin = np.full(len(features), np.inf)
+    for axis, (dim, inner) in enumerate(zip(dims, boundaries)):
+        # 칸 c는 [inner[c - 1], inner[c]) 이므로 주변 radius칸은 [inner[c - radius - 1], inner[c + radius]) 입니다.
+        padded = np.concatenate([np.full(radius + 1, -np.inf), inner, np.full(radius + 1, np.inf)])
+        values = features[:, dim]
+        lower = padded[coords[:, axis]]
+        upper = padded[coords[:, axis] + 2 * radius + 1]
+        margin = np.minimum(margin, np.minimum(values - lower, upper - values))
+    return margin
+
+
+def _euclidean_top_k(features, k):
+    """행마다 유클리드 거리로 가장 가까운 k개 (이웃 번호, 제곱 거리) 배열 (k < 점 수)"""
+    n = len(features)
+    neighbours = np.empty((n, k), dtype=np.int64)
+    distances_out = np.empty((n, k))
+    pending = np.ones(n, dtype=bool)
+
+    duplicate_rows, duplicate_neighbours = _duplicate_neighbours(features, k)
+    neighbours[duplicate_rows] = duplicate_neighbours
+    distances_out[duplicate_rows] = 0.0
+    pending[duplicate_rows] = False
+
+    # 값이 한 가지뿐인 특성은 격자에서 뺍니다. (그 방향으로는 칸을 나눌 필요가 없음)
+    dims = np.flatnonzero(features.max(axis=0) - features.min(axis=0) > 1e-9)
+    if len(dims) and pending.any():
+        coords, boundaries = _grid(features, dims, n)
+        shape = coords.max(axis=0) + 1
+        squared = (features * features).sum(axis=1)
+
+        # 칸 번호순으로 점을 모아 두고, 칸 번호 → [시작, 끝) 구간을 만듭니다.
+        cell_keys = np.ravel_multi_index(coords.T, shape)
+        order = np.argsort(cell_keys, kind='stable')
+        keys, starts, counts = np.unique(cell_keys[order], return_index=True, return_counts=True)
+        ranges = {key: (start, start + count) for key, start, count in zip(keys.tolist(), starts.tolist(), counts.tolist())}
+
+        # 주변 3^d칸에서 확인하지 못한 점(칸 경계 가까이 있거나 주변이 성긴 점)은 5^d, 7^d칸으로 넓혀 다시 찾습니다.
+        for radius in range(1, MAX_RADIUS + 1):
+            if not pending.any():
+                break
+            limit = _margins(features, dims, coords, boundaries, radius) ** 2
+            offsets = np.stack(np.meshgrid(*[np.arange(-radius, radius + 1)] * len(dims), indexing='ij'),
+                               axis=-1).reshape(-1, len(dims))
+            for key in np.unique(cell_keys[pending]).tolist():
+                start, end = ranges[key]
+                own = np.flatnonzero(pending[order[start:end]])
+                rows = order[start:end][own]
+                around = np.array(np.unravel_index(key, shape)) + offsets
+                around = around[((around >= 0) & (around < shape)).all(axis=1)]
+                around_keys = [neighbour_key for neighbour_key in np.ravel_multi_index(around.T, shape).tolist()
+                               if neighbour_key in ranges]
+                candidates = np.concatenate([order[slice(*ranges[neighbour_key])] for neighbour_key in around_keys])
+                if len(candidates) <= k:
+                    continue
+                # 후보 안에서 자기 자신의 위치 (자기 칸 구간은 around_keys 순서대로 이어 붙인 위치에 있음)
+                own_offset = sum(ranges[neighbour_key][1] - ranges[neighbour_key][0]
+                                 for neighbour_key in around_keys[:around_keys.index(key)])
+                candidate_features = features[candidates].T.copy()
+
+                # 칸에 점이 많으면 행을 나눠 거리 행렬 크기를 BLOCK_BYTES 안으로 유지합니다.
+                block = max(1, BLOCK_BYTES // (len(candidates) * 8))
+                for chunk_start in range(0, len(rows), block):
+                    chunk = rows[chunk_start:chunk_start + block]
+                    distances = features[chunk] @ candidate_features
+                    distances *= -2
+                    distances += squared[chunk, None]
+                    distances += squared[None, candidates]
+                    np.maximum(distances, 0, out=distances)
+                    distances[np.arange(len(chunk)), own_offset + own[chunk_start:chunk_start + block]] = np.inf
+                    found, found_distances = _nearest(distances, candidates, k)
+                    exact = found_distances[:, -1] <= limit[chunk]
+                    resolved = chunk[exact]
+                    neighbours[resolved] = found[exact]
+                    distances_out[resolved] = found_distances[exact]
+                    pending[resolved] = False
+
+    # 넓혀도 확인하지 못한 점(아주 외딴 점)만 전체 점과 비교합니다.
+    rows = np.flatnonzero(pending)
+    if len(rows):
+        neighbours[rows], distances_out[rows] = _brute_force(features, rows, k)
+    return neighbours, distances_out
+
+
+def top_k_neighbours(features, groups, k=TOP_K, penalty=TOURNAMENT_PENALTY):
+    """행마다 가장 가까운 k개 행 번호를 담은 (행 수, k) int32 배열을 반환하는 함수
+
+    features: (n, d) 특성 행렬, groups: (n,) 정수 대회 번호 (다르면 제곱 거리에 penalty를 더함)
+
+    벌점이 있는 거리의 상위 k개는 "전체에서 벌점 없이 가까운 k개"와 "같은 대회 안에서 가까운 k개"의
+    합집합 안에 있습니다. (다른 대회 레벨이 전체 상위 k개에 없다면, 그보다 가까운 k개가 벌점을 더해도 앞섭니다)
+    그래서 두 유클리드 문제를 풀고 후보 2k개만 벌점을 넣어 다시 고릅니다.
+    """
+    n = len(features)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int32)
+
+    global_neighbours, global_distances = _euclidean_top_k(features, k)
+    global_distances = global_distances + penalty * (groups[global_neighbours] != groups[:, None])
+
+    group_neighbours = np.full((n, k), -1, dtype=np.int64)
+    group_distances = np.full((n, k), np.inf)
+    for group in np.unique(groups).tolist():
+        rows = np.flatnonzero(groups == group)
+        group_k = min(k, len(rows) - 1)
+        if group_k > 0:
+            found, found_distances = _euclidean_top_k(features[rows], group_k)
+            group_neighbours[rows, :group_k] = rows[found]
+            group_distances[rows, :group_k] = found_distances
+
+    candidates = np.hstack([global_neighbours, group_neighbours])
+    distances = np.hstack([global_distances, group_distances])
+    # 두 목록에 모두 있는 레벨은 한 번만 셉니다.
+    order = np.lexsort((distances, candidates), axis=1)
+    candidates = np.take_along_axis(candidates, order, axis=1)
+    distances = np.take_along_axis(distances, order, axis=1)
+    duplicate = np.zeros_like(candidates, dtype=bool)
+    duplicate[:, 1:] = candidates[:, 1:] == candidates[:, :-1]
+    distances[duplicate | (candidates < 0)] = np.inf
+
+    best = np.lexsort((candidates, distances), axis=1)[:, :k]
+    return np.take_along_axis(candidates, best, axis=1).astype(np.int32)
+
+
+class SimilarLevels:
+    """레벨 id → 비슷한 레벨 id 목록을 미리 구해 둔 읽기 전용 표
+
+    columns는 레벨 순서대로의 값 목록 dict ('id', 'tournament_id'와 FEATURES의 각 레코드 필드)입니다.
+    메모리 백엔드는 from_levels(), SQLite 백엔드는 ContentDatabase.level_columns()로 만듭니다.
+    """
+
+    # columns에 필요한 레코드 필드
+    FIELDS = ('id', 'tournament_id', *(field for field, _, _ in FEATURES.values()))
+
+    def __init__(self, columns, k=TOP_K):
+        self.ids = tuple(columns['id'])
+        self._row_by_id = {level_id: row for row, level_id in enumerate(self.ids)}
+        features = feature_matrix({name: columns[field] for name, (field, _, _) in FEATURES.items()})
+        _, groups = np.unique(np.array([tournament_id or '' for tournament_id in columns['tournament_id']], dtype=str),
+                              return_inverse=True)
+        self.neighbours = top_k_neighbours(features, groups, k)
+
+    @classmethod
+    def from_levels(cls, levels, k=TOP_K):
+        return cls({field: [getattr(level, field) for level in levels] for field in cls.FIELDS}, k)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def similar(self, level_id, limit=None):
+        """level_id와 가장 비슷한 레벨 id 튜플 (가까운 순). 모르는 id면 빈 튜플"""
+        row = self._row_by_id.get(level_id)
+        if row is None:
+            return ()
+        ids = self.ids
+        return tuple(ids[neighbour] for neighbour in self.neighbours[row, :limit].tolist())
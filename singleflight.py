@@ -0,0 +1,56 @@
+# singleflight.py
+#
+# 같은 값을 여러 세션 스레드가 동시에 처음 요청할 때 한 스레드만 만들고,
+# 나머지는 그 결과를 기다렸다가 그대로 받게 하는 도우미.
+# (재시작 직후 관람객이 몰리면 세션마다 같은 로고 인코딩, 색인 생성, HTML 조각 렌더링을 반복하는 것을 막음)
+# st.cache_resource/st.cache_data는 Streamlit이 키마다 잠금을 두어 이미 이렇게 동작하므로,
+# 직접 만든 캐시(FragmentCache, AssetRegistry, 저장소 등)에서만 사용합니다.
+
+import threading
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """키별로 진행 중인 계산을 하나만 두는 객체"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, compute):
+        """key의 값을 compute()로 만들어 반환하는 함수
+
+        같은 key로 이미 계산 중인 스레드가 있으면 새로 계산하지 않고 그 결과(또는 예외)를 받습니다.
+        결과를 보관하지는 않으므로, 호출하는 캐시가 compute() 안에서 결과를 저장해야
+        계산이 끝난 직후에 들어온 스레드도 다시 계산하지 않습니다.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = compute()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
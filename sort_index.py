@@ -0,0 +1,144 @@
+# sort_index.py
+#
+# 레벨 목록의 정렬과 숫자 범위 필터를 위한 정렬 색인.
+# 콘텐츠 버전마다 한 번, 열마다 다음을 만들어 둡니다.
+#   - 오름차순/내림차순 순열 (값이 없는 레벨은 항상 맨 뒤, 같은 값은 제목순)
+#   - 레벨별 순위 (같은 값은 같은 순위) → 여러 열로 정렬할 때 정수 튜플만 비교
+#   - 정렬된 값 목록 → bisect로 범위에 드는 레벨을 순열의 한 구간으로 찾음
+# 그래서 위젯이 바뀔 때마다 전체 목록을 다시 정렬하거나 문자열을 숫자로 바꾸지 않습니다.
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+# 열 이름 → 레코드에서 정렬 값을 꺼내는 함수 (None은 값 없음)
+SORT_COLUMNS = {
+    'title': lambda level: level.title.casefold() or None,
+    'difficulty': lambda level: level.difficulty_rating,
+    'bpm': lambda level: level.bpm,
+    'tiles': lambda level: level.tiles,
+    'tournament': lambda level: level.tournament_id or None,
+}
+
+# 범위 필터를 지원하는 숫자 열
+RANGE_COLUMNS = ('difficulty', 'bpm', 'tiles')
+
+# 부분 목록이 전체의 이 비율보다 크면, 부분 목록을 정렬하지 않고 미리 만든 순열을 훑습니다.
+SCAN_RATIO = 0.25
+
+
+class _Column:
+    __slots__ = ('values', 'asc', 'desc', 'rank', 'sorted_values', 'distinct')
+
+    def __init__(self, records, key):
+        self.values = [key(record) for record in records]
+        present = [doc for doc, value in enumerate(self.values) if value is not None]
+        missing = [doc for doc, value in enumerate(self.values) if value is None]
+
+        # 파이썬 정렬은 안정 정렬이라 같은 값끼리는 원래 순서(제목순)가 유지됩니다.
+        present.sort(key=self.values.__getitem__)
+        self.sorted_values = [self.values[doc] for doc in present]
+        self.asc = array('l', present + missing)
+        self.desc = array('l', sorted(present, key=self.values.__getitem__, reverse=True) + missing)
+
+        # 같은 값은 같은 순위. 값이 없는 레벨은 가장 큰 순위(distinct)를 받아 항상 뒤로 갑니다.
+        self.rank = array('l', [0]) * len(records)
+        distinct = -1
+        previous = object()
+        for doc, value in zip(present, self.sorted_values):
+            if value != previous:
+                distinct += 1
+                previous = value
+            self.rank[doc] = distinct
+        self.distinct = distinct + 1
+        for doc in missing:
+            self.rank[doc] = self.distinct
+
+    def sort_key(self, descending):
+        # 내림차순이어도 값이 없는 레벨(순위 distinct)은 맨 뒤에 둡니다.
+        rank, distinct = self.rank, self.distinct
+        if not descending:
+            return rank.__getitem__
+        top = distinct - 1
+        return lambda doc: top - rank[doc] if rank[doc] < distinct else distinct
+
+
+class SortIndex:
+    """열별 정렬 순열과 범위 조회를 제공하는 읽기 전용 색인
+
+    sort()와 filter_ranges()는 레코드 목록을 받아 레코드 목록을 돌려주므로,
+    대회 필터나 검색 결과처럼 이미 걸러진 목록에도 그대로 쓸 수 있습니다.
+    """
+
+    def __init__(self, records, columns=SORT_COLUMNS):
+        self.records = records
+        self._doc_by_id = {record.id: doc for doc, record in enumerate(records)}
+        self._columns = {name: _Column(records, key) for name, key in columns.items()}
+
+    def __len__(self):
+        return len(self.records)
+
+    def _docs(self, records):
+        if records is self.records:
+            return range(len(self.records))
+        return [self._doc_by_id[record.id] for record in records]
+
+    def bounds(self, column):
+        """열의 (최솟값, 최댓값). 값이 있는 레벨이 없으면 None"""
+        values = self._columns[column].sorted_values
+        return (values[0], values[-1]) if values else None
+
+    def sort(self, records, keys):
+        """records를 keys [(열 이름, 내림차순 여부), ...] 순서로 정렬한 새 목록을 반환하는 함수
+
+        모든 키가 같으면 원래 순서(제목순)를 유지합니다.
+        """
+        if not keys:
+            return list(records)
+
+        if len(keys) == 1:
+            column, descending = keys[0]
+            order = self._columns[column].desc if descending else self._columns[column].asc
+            if records is self.records:
+                return [self.records[doc] for doc in order]
+            if len(records) > len(self.records) * SCAN_RATIO:
+                wanted = set(self._docs(records))
+                return [self.records[doc] for doc in order if doc in wanted]
+
+        # 열마다 순위를 한 정수로 합쳐서(순위1 * 크기2 + 순위2 ...) 튜플 비교 없이 한 번에 정렬합니다.
+        docs = list(self._docs(records))
+        combined = [0] * len(docs)
+        for column, descending in keys:
+            col = self._columns[column]
+            key = col.sort_key(descending)
+            size = col.distinct + 1
+            combined = [c * size + key(doc) for c, doc in zip(combined, docs)]
+        n = len(self.records)
+        order = sorted(range(len(docs)), key=lambda i: combined[i] * n + docs[i])
+        return [self.records[docs[i]] for i in order]
+
+    def docs_in_range(self, column, low, high):
+        """low <= 값 <= high인 레벨 번호 구간을 오름차순 순열의 슬라이스로 반환하는 함수"""
+        col = self._columns[column]
+        start = bisect_left(col.sorted_values, low)
+        stop = bisect_right(col.sorted_values, high)
+        return col.asc[start:stop]
+
+    def filter_ranges(self, records, ranges):
+        """ranges {열 이름: (low, high)}를 모두 만족하는 레코드만 원래 순서대로 남기는 함수
+
+        가장 좁은 범위를 bisect로 찾고, 나머지 조건은 그 구간 안에서만 확인합니다.
+        """
+        if not ranges:
+            return records
+
+        slices = sorted(((self.docs_in_range(column, low, high), column) for column, (low, high) in ranges.items()),
+                        key=lambda item: len(item[0]))
+        matched = set(slices[0][0])
+        for _, column in slices[1:]:
+            values = self._columns[column].values
+            low, high = ranges[column]
+            matched = {doc for doc in matched if values[doc] is not None and low <= values[doc] <= high}
+
+        if records is self.records:
+            return [self.records[doc] for doc in sorted(matched)]
+        return [record for record, doc in zip(records, self._docs(records)) if doc in matched]
@@ -0,0 +1,105 @@
+# templates.py
+#
+# 한 번만 컴파일해 두는 HTML 템플릿과, 렌더링된 조각(fragment)을 보관하는 LRU 캐시.
+#
+# 템플릿 문법은 str.format과 같고, 모든 값은 기본적으로 HTML 이스케이프됩니다.
+# 이미 HTML인 값(다른 템플릿의 결과 등)은 {rows:raw}처럼 :raw를 붙여 그대로 넣습니다.
+
+import hashlib
+import html
+import threading
+from collections import OrderedDict
+from string import Formatter
+
+from singleflight import SingleFlight
+
+
+class Template:
+    """자리표시자를 미리 분석해 두고 값만 끼워 넣는 HTML 템플릿"""
+
+    def __init__(self, name, source):
+        self.name = name
+        # (리터럴, 필드 이름, 이스케이프 여부) 목록으로 한 번만 분해합니다.
+        self._parts = []
+        for literal, field, spec, _ in Formatter().parse(source):
+            if field is None:
+                self._parts.append((literal, None, False))
+            else:
+                self._parts.append((literal, field, spec != 'raw'))
+
+    def render(self, **values):
+        out = []
+        for literal, field, escape in self._parts:
+            out.append(literal)
+            if field is None:
+                continue
+            value = values[field]
+            value = '' if value is None else str(value)
+            out.append(html.escape(value) if escape else value)
+        return ''.join(out)
+
+
+class FragmentCache:
+    """렌더링된 HTML 조각을 (템플릿, 레코드 id, 콘텐츠 해시 등) 키로 보관하는 LRU 캐시
+
+    프로세스 전체에서 공유되므로 바뀌지 않은 카드/행/정보 박스는
+    세션이나 rerun과 관계없이 dict 조회 한 번으로 재사용됩니다.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        # 같은 조각을 여러 세션이 동시에 처음 요청하면 한 번만 렌더링합니다.
+        self._flight = SingleFlight()
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            fragment = self._items.get(key)
+            if fragment is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return fragment
+            self.misses += 1
+
+        def render_and_store():
+            fragment = render()
+            with self._lock:
+                self._items[key] = fragment
+                self._items.move_to_end(key)
+                while len(self._items) > self.maxsize:
+                    self._items.popitem(last=False)
+            return fragment
+
+        return self._flight.do(key, render_and_store)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'size': len(self._items),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+def record_key(record):
+    """조각 캐시 키에 쓰는 (레코드 id, 콘텐츠 해시)
+
+    로더가 소스 파일 해시를 content_hash로 넣어 두므로 보통은 그 값을 그대로 사용합니다.
+    """
+    content_hash = getattr(record, 'content_hash', None)
+    if content_hash is None:
+        content_hash = hashlib.sha1(repr(record).encode('utf-8')).hexdigest()[:12]
+    return getattr(record, 'id', None), content_hash
+
+
+# 프로세스 전체에서 공유하는 조각 캐시
+FRAGMENTS = FragmentCache()
@@ -1,56 +1,419 @@
 # ui_components.py (최종 완성 버전)
 
 import streamlit as st
-import base64
+import html
+import os
+from urllib.parse import quote
+from templates import FRAGMENTS, Template, record_key
+from assets import STATIC_DIR, get_asset_registry
+from css_build import compile_css
+from metrics import timed
 
-def inject_local_css(file_name):
-    """로컬 CSS 파일을 읽어와 앱에 주입하는 함수"""
+@st.cache_resource
+def _stylesheet_html(file_name, mtime_ns):
+    # 파일이 바뀌지 않는 한 프로세스당 한 번만 만듭니다. (mtime은 캐시 키로만 사용)
+    # 번들(bundle.py)이나 css_build.py가 같은 원본으로 만든 스타일시트가 있으면 <link>로 걸어
+    # 브라우저 캐시를 쓰고, 없으면 압축한 CSS를 페이지에 인라인합니다.
+    href = get_asset_registry().stylesheet_url(file_name)
+    if href:
+        return f'<link rel="stylesheet" href="{html.escape(href)}">'
+    compiled, digest = compile_css(file_name)
+    return f'<style data-css-hash="{digest}">{compiled}</style>'
+
+def get_stylesheet_html(file_name):
+    """inject_local_css가 넣을 <link>/<style> HTML (파일이 없으면 None)"""
     try:
-        with open(file_name, encoding='utf-8') as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+        return _stylesheet_html(file_name, os.stat(file_name).st_mtime_ns)
     except FileNotFoundError:
+        return None
+
+@timed('css.inject')
+def inject_local_css(file_name):
+    """로컬 CSS 파일을 압축해 앱에 주입하는 함수 (css_build.py, bundle.py 참고)"""
+    style_html = get_stylesheet_html(file_name)
+    if style_html is None:
         st.warning(f"CSS 파일을 찾을 수 없습니다: {file_name}")
+        return
+    st.markdown(style_html, unsafe_allow_html=True)
 
+@timed('assets.base64')
 def get_image_as_base64(file_path):
-    """이미지 파일을 Base64 문자열로 인코딩하는 함수"""
-    try:
-        with open(file_path, "rb") as f:
-            data = f.read()
-        return base64.b64encode(data).decode()
-    except FileNotFoundError:
-        return None
+    """이미지 파일을 Base64 문자열로 인코딩하는 함수 (파일은 프로세스당 한 번만 읽음)"""
+    return get_asset_registry().base64(file_path)
 
-def create_top_nav_bar(logo_base64_data, active_page=""):
-    """상단 네비게이션 바 HTML을 생성하는 함수"""
-    logo_html = f'<a href="/" target="_self"><img src="data:image/png;base64,{logo_base64_data}" alt="AWC 홈"></a>' if logo_base64_data else '<a href="/" target="_self" style="color:white; text-decoration:none; font-weight:bold;">AWC</a>'
-    
-    tournaments_class = "active" if active_page == "Tournaments" else ""
-    levels_class = "active" if active_page == "Levels" else "" # 'Levels' 추가
+@timed('assets.src')
+def get_image_src(file_path):
+    """이미지를 <img src>에 넣을 주소를 반환하는 함수
+
+    작은 파일은 data URI, 큰 파일은 해시가 붙은 정적 파일 URL을 반환합니다. (assets.py 참고)
+    """
+    return get_asset_registry().src(file_path)
 
-    nav_bar_html = f"""
+def highlight_text(text, spans):
+    """검색어와 매칭된 구간을 <mark>로 감싼 HTML을 반환하는 함수 (나머지 부분은 이스케이프)"""
+    text = str(text)
+    parts = []
+    last = 0
+    for start, end in spans:
+        parts.append(html.escape(text[last:start]))
+        parts.append(f"<mark>{html.escape(text[start:end])}</mark>")
+        last = end
+    parts.append(html.escape(text[last:]))
+    return "".join(parts)
+
+# --- HTML 템플릿 (모듈을 불러올 때 한 번만 컴파일) ---
+
+NAV_LOGO_IMAGE = Template("nav_logo_image", '<a href="/" target="_self"><img src="{logo_src}" alt="AWC 홈"></a>')
+NAV_LOGO_TEXT = '<a href="/" target="_self" style="color:white; text-decoration:none; font-weight:bold;">AWC</a>'
+
+NAV_BAR = Template("nav_bar", """
     <div class="top-nav-container">
-        <div class="nav-logo">{logo_html}</div>
+        <div class="nav-logo">{logo_html:raw}</div>
         <div class="nav-menu-items">
             <a href="/Tournaments" target="_self" class="{tournaments_class}">대회 정보</a>
             <a href="/Levels" target="_self" class="{levels_class}">레벨 목록</a>
+            <a href="/Players" target="_self" class="{players_class}">선수 정보</a>
+            <a href="/News" target="_self" class="{news_class}">뉴스/공지</a>
         </div>
     </div>
-    """
-    st.markdown(nav_bar_html, unsafe_allow_html=True)
-
-def create_tournament_card(tournament_data, is_highlighted=False):
-    """대회 카드 HTML을 생성하는 헬퍼 함수"""
-    bg_class = tournament_data.get('bg_image_class', '')
-    highlight_class = "highlighted-card" if is_highlighted else ""
-    title = tournament_data.get('title')
+    """)
 
-    card_html = f"""
-    <a href="/Tournaments?id={tournament_data.get('id', '')}" target="_self" class="card-link-wrapper">
-        <div class="custom-styled-card {bg_class} {highlight_class}">
+TOURNAMENT_CARD = Template("tournament_card", """
+    <a href="/Tournaments?id={id_param}" target="_self" class="card-link-wrapper">
+        <div class="custom-styled-card {bg_class} {highlight_class}" style="{bg_style}">
             <div class="card-content">
                 <h3>{title}</h3>
+                {stats_html:raw}
             </div>
         </div>
     </a>
+    """)
+
+CARD_STATS = Template("card_stats", '<p class="card-stats">{summary}</p>')
+
+TOURNAMENT_STATS = Template("tournament_stats", (
+    '<div class="tournament-stats">'
+    '<div class="stat"><span class="stat-label">레벨 수</span><span class="stat-value">{level_count}</span></div>'
+    '<div class="stat"><span class="stat-label">난이도 (최저 / 중앙 / 최고)</span>'
+    '<span class="stat-value">{difficulty_min} / {difficulty_median} / {difficulty_max}</span></div>'
+    '<div class="stat"><span class="stat-label">BPM 범위</span><span class="stat-value">{bpm_range}</span></div>'
+    '<div class="stat"><span class="stat-label">타일 수 (합계 / 평균)</span>'
+    '<span class="stat-value">{tiles_total} / {tiles_average}</span></div>'
+    '</div>'
+))
+
+DETAIL_TITLE = Template("detail_title", "<h1 class='detail-title'>{title}</h1>")
+
+DETAIL_BUTTON_LINK = Template("detail_button_link", '<a href="{url}" target="{target}" class="detail-button-link">{label}</a>')
+
+# 레벨 목록 행은 한 페이지 분량을 이어 붙이므로 들여쓰기 없이 한 줄로 둡니다.
+LEVEL_ROW = Template("level_row", (
+    '<a href="/Levels?id={id_param}" target="_self" class="level-row"><div class="row-content">'
+    '<div class="cell cell-title">{title:raw}</div>'
+    '<div class="cell cell-artist">{artist:raw}</div>'
+    '<div class="cell cell-creator">{creator:raw}</div>'
+    '<div class="cell cell-tournament">{minititle}</div>'
+    '<div class="cell cell-difficulty">{difficulty_rating}</div>'
+    '</div></a>'
+))
+
+LEVEL_TABLE_HEADER_HTML = (
+    '<div class="header-row"><div class="row-content">'
+    '<div class="cell cell-title">제목</div>'
+    '<div class="cell cell-artist">아티스트</div>'
+    '<div class="cell cell-creator">제작자</div>'
+    '<div class="cell cell-minititle">대회</div>'
+    '<div class="cell cell-difficulty">난이도</div>'
+    '</div></div>'
+)
+
+LEVEL_INFO_BOX = Template("level_info_box", """
+            <div class="level-info-box">
+                <h3>레벨 정보</h3>
+                <p><strong>아티스트:</strong> {artist}</p>
+                <p>{detail_artist}</p>
+                <p><strong>제작자:</strong> {creator}</p>
+                <p>({detail_creator})</p>
+                <p><strong>난이도:</strong> {difficulty_rating}</p>
+                <p><strong>BPM:</strong> {bpm}</p>
+                <p><strong>타일 수:</strong> {tiles}</p>
+                <a href="{download_url}" target="_blank" class="download-button">레벨 다운로드</a>
+            </div>
+            """)
+
+# --- 뉴스/선수, 대회 설명 (본문 HTML은 content_docs.py/records.py에서 이미 정리된 것) ---
+
+RICH_CONTENT = Template("rich_content", '<div class="description-content">{html:raw}</div>')
+
+NEWS_ITEM = Template("news_item", (
+    '<a href="/News?id={id_param}" target="_self" class="news-item">'
+    '<h3>{title}</h3><p class="news-meta">{meta}</p><p>{summary}</p></a>'
+))
+
+NEWS_META = Template("news_meta", '<p class="news-meta">{meta}</p>')
+
+PLAYER_CARD = Template("player_card", (
+    '<a href="/Players?id={id_param}" target="_self" class="player-card">'
+    '{image_html:raw}<h3>{nickname}</h3><p>{subtitle}</p></a>'
+))
+
+PLAYER_IMAGE = Template("player_image", '<img src="{src}" alt="{alt}" loading="lazy">')
+
+# --- 유튜브 임베드 ---
+
+# AWC_YOUTUBE_EAGER=1 이면 파사드 없이 처음부터 youtube.com 플레이어를 불러옵니다.
+YOUTUBE_EAGER = os.environ.get("AWC_YOUTUBE_EAGER", "") == "1"
+
+# build_images.py --posters 로 내려받아 두는 영상 썸네일 위치 (없으면 플레이스홀더 배경)
+YOUTUBE_POSTER_DIR = STATIC_DIR / "images" / "posters"
+
+VIDEO_EMBED = Template("video_embed", """
+                <div class="video-container">
+                    <iframe src="https://www.youtube.com/embed/{video_id}" frameborder="0" allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture" allowfullscreen></iframe>
+                </div>
+                """)
+
+# 클릭하기 전까지는 포스터와 재생 버튼만 있는 가벼운 문서(srcdoc)를 보여주고,
+# 클릭하면 iframe 자체가 youtube.com/embed 로 이동해 그때 플레이어를 불러옵니다. (자바스크립트 불필요)
+VIDEO_FACADE = Template("video_facade", """
+                <div class="video-container">
+                    <iframe srcdoc="{srcdoc}" title="{title}" frameborder="0" loading="lazy" allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture" allowfullscreen></iframe>
+                </div>
+                """)
+
+VIDEO_FACADE_DOC = Template("video_facade_doc", (
+    "<style>*{{margin:0;padding:0;overflow:hidden}}html,body{{height:100%;background:#1E1E2E}}"
+    "a{{position:relative;display:block;height:100%;background:{background:raw} center/cover no-repeat}}"
+    "span{{position:absolute;top:50%;left:50%;transform:translate(-50%,-50%);width:68px;height:48px;"
+    "border-radius:12px;background:rgba(0,0,0,.7);color:#fff;font:28px/48px sans-serif;text-align:center}}"
+    "a:hover span{{background:#f00}}</style>"
+    '<a href="https://www.youtube.com/embed/{video_id}?autoplay=1" aria-label="영상 재생"><span>▶</span></a>'
+))
+
+VIDEO_PLACEHOLDER_BACKGROUND = "linear-gradient(135deg,#2A2A45,#1A1A2E)"
+
+def _css_url(url):
+    """<style> 안에 넣을 url("...") 값 (HTML 이스케이프 대신 CSS 문자열 규칙으로 이스케이프)
+
+    <style> 내용은 HTML 엔티티를 풀지 않으므로, 따옴표/역슬래시/줄바꿈과 </style>을 닫을 수 있는 '<', '>'만
+    CSS 이스케이프로 바꿉니다. (srcdoc 속성 자체의 HTML 이스케이프는 VIDEO_FACADE가 한 번만 합니다)
+    """
+    escaped = ''.join(f'\\{ord(ch):x} ' if ch in '"\\<>\n\r\f' else ch for ch in str(url))
+    return f'url("{escaped}")'
+
+def _id_param(record):
+    # 공백이나 유니코드가 들어간 id(예: "Dimensionalized System")도 안전한 URL이 되도록 인코딩
+    return quote(str(record.id), safe='')
+
+def create_top_nav_bar(logo_src, active_page=""):
+    """상단 네비게이션 바를 표시하는 함수 (logo_src는 get_image_src의 결과)"""
+    st.markdown(create_top_nav_bar_html(logo_src, active_page), unsafe_allow_html=True)
+
+def _clear_query_params():
+    st.query_params.clear()
+
+def create_back_button(label):
+    """상세 페이지의 '목록으로 돌아가기' 버튼을 표시하는 함수
+
+    상세 화면에서 목록 화면으로 바뀌므로 페이지 전체가 다시 그려져야 합니다. 쿼리 파라미터는 on_click
+    콜백에서 지워, 버튼 클릭 rerun 한 번에 바로 목록이 그려집니다. (st.rerun()으로 두 번 실행하지 않음)
+    """
+    st.button(label, on_click=_clear_query_params)
+
+@timed('html.nav_bar')
+def create_top_nav_bar_html(logo_src, active_page=""):
+    """상단 네비게이션 바 HTML을 생성하는 함수"""
+    def render():
+        logo_html = NAV_LOGO_IMAGE.render(logo_src=logo_src) if logo_src else NAV_LOGO_TEXT
+        return NAV_BAR.render(
+            logo_html=logo_html,
+            tournaments_class="active" if active_page == "Tournaments" else "",
+            levels_class="active" if active_page == "Levels" else "", # 'Levels' 추가
+            players_class="active" if active_page == "Players" else "",
+            news_class="active" if active_page == "News" else "",
+        )
+
+    return FRAGMENTS.get_or_render(("nav_bar", active_page, logo_src), render)
+
+# 카드가 화면에 표시되는 대략적인 최대 너비 (CSS px). 배경 이미지 변형을 고를 때 사용합니다.
+HIGHLIGHTED_CARD_WIDTH = 1200
+GRID_CARD_WIDTH = 420
+
+def _stat_number(value, digits=0):
+    # 집계 값 표시 (값이 없으면 N/A, 소수점 아래 0은 생략)
+    if value is None:
+        return 'N/A'
+    return f'{round(value, digits):,.{digits}f}'.rstrip('0').rstrip('.') if digits else f'{round(value):,}'
+
+def _stat_range(low, high, digits=0):
+    if low is None:
+        return 'N/A'
+    low, high = _stat_number(low, digits), _stat_number(high, digits)
+    return low if low == high else f'{low}–{high}'
+
+@timed('html.tournament_card')
+def create_tournament_card(tournament_data, is_highlighted=False, stats=None):
+    """대회 카드 HTML을 생성하는 헬퍼 함수 (stats는 level_stats.TournamentStats, 있으면 요약 한 줄 표시)"""
+    bg_class = tournament_data.bg_image_class
+    display_width = HIGHLIGHTED_CARD_WIDTH if is_highlighted else GRID_CARD_WIDTH
+
+    def render():
+        # 빌드된 배경 변형이 있으면 인라인 스타일이 style.css의 원격 이미지보다 우선합니다.
+        bg_style = get_asset_registry().background_image_css(bg_class, display_width) if bg_class else None
+        return TOURNAMENT_CARD.render(
+            id_param=_id_param(tournament_data),
+            bg_class=bg_class,
+            highlight_class="highlighted-card" if is_highlighted else "",
+            bg_style=bg_style or "",
+            title=tournament_data.title,
+            stats_html=create_card_stats(stats) if stats else "",
+        )
+
+    return FRAGMENTS.get_or_render(("tournament_card", *record_key(tournament_data), is_highlighted, stats), render)
+
+def create_card_stats(stats):
+    """대회 카드에 넣을 레벨 집계 요약 HTML (레벨 수, 난이도 범위)"""
+    summary = f"레벨 {stats.level_count:,}개"
+    if stats.difficulty_min is not None:
+        summary += f" · 난이도 {_stat_range(stats.difficulty_min, stats.difficulty_max, 1)}"
+    return CARD_STATS.render(summary=summary)
+
+@timed('html.tournament_stats')
+def create_tournament_stats(stats):
+    """대회 상세 페이지의 레벨 집계 HTML을 생성하는 함수 (stats는 level_stats.TournamentStats)"""
+    def render():
+        return TOURNAMENT_STATS.render(
+            level_count=_stat_number(stats.level_count),
+            difficulty_min=_stat_number(stats.difficulty_min, 2),
+            difficulty_median=_stat_number(stats.difficulty_median, 2),
+            difficulty_max=_stat_number(stats.difficulty_max, 2),
+            bpm_range=_stat_range(stats.bpm_min, stats.bpm_max, 2),
+            tiles_total=_stat_number(stats.tiles_total),
+            tiles_average=_stat_number(stats.tiles_average, 1),
+        )
+
+    return FRAGMENTS.get_or_render(("tournament_stats", stats), render)
+
+def create_detail_title(title):
+    """상세 페이지 제목 HTML을 생성하는 함수"""
+    return DETAIL_TITLE.render(title=title)
+
+def create_detail_button_link(url, label, new_tab=True):
+    """상세 페이지의 바로가기 버튼 HTML을 생성하는 함수"""
+    return DETAIL_BUTTON_LINK.render(url=url, label=label, target="_blank" if new_tab else "_self")
+
+@timed('html.video_embed')
+def create_video_embed(video_id, title="영상", eager=None):
+    """유튜브 영상 임베드 HTML을 생성하는 함수
+
+    기본값은 클릭해야 플레이어를 불러오는 파사드이고, eager=True(또는 AWC_YOUTUBE_EAGER=1)이면
+    예전처럼 처음부터 iframe 플레이어를 넣습니다.
     """
-    return card_html
\ No newline at end of file
+    video_id = quote(str(video_id), safe='')
+    eager = YOUTUBE_EAGER if eager is None else eager
+    if eager:
+        return VIDEO_EMBED.render(video_id=video_id)
+
+    poster_file = YOUTUBE_POSTER_DIR / f"{video_id}.jpg"
+    poster_src = get_asset_registry().static_url(poster_file) if poster_file.exists() else None
+
+    def render():
+        background = _css_url(poster_src) if poster_src else VIDEO_PLACEHOLDER_BACKGROUND
+        srcdoc = VIDEO_FACADE_DOC.render(video_id=video_id, background=background)
+        return VIDEO_FACADE.render(srcdoc=srcdoc, title=title)
+
+    return FRAGMENTS.get_or_render(("video_facade", video_id, poster_src, title), render)
+
+def create_level_row(level, format_cell=None):
+    """레벨 목록의 한 행 HTML을 생성하는 함수
+
+    format_cell(level, field)을 넘기면 제목/아티스트/제작자 셀에 그 결과(HTML)를 넣습니다.
+    (검색어 강조처럼 검색어마다 달라지는 행은 캐시하지 않습니다.)
+    """
+    def render(cell):
+        return LEVEL_ROW.render(
+            id_param=_id_param(level),
+            title=cell(level, 'title'),
+            artist=cell(level, 'artist'),
+            creator=cell(level, 'creator'),
+            minititle=level.minititle or 'N/A',
+            difficulty_rating=level.difficulty_label or 'N/A',
+        )
+
+    if format_cell is not None:
+        return render(format_cell)
+    return FRAGMENTS.get_or_render(("level_row", *record_key(level)), lambda: render(_escaped_cell))
+
+def _escaped_cell(level, field):
+    return html.escape(str(getattr(level, field) or 'N/A'))
+
+@timed('html.level_table')
+def create_level_table(levels, format_cell=None):
+    """헤더와 모든 행을 하나의 HTML 문자열로 생성하는 함수
+
+    행마다 st.markdown을 호출하면 행 수만큼 델타 메시지가 전송되므로,
+    한 페이지 분량을 한 번에 만들어 한 번만 전송합니다.
+    (들여쓰기나 빈 줄이 있으면 마크다운이 코드 블록으로 해석하므로 한 줄로 이어 붙입니다.)
+    """
+    rows = "".join(create_level_row(level, format_cell) for level in levels)
+    return f'<div class="level-list-table">{LEVEL_TABLE_HEADER_HTML}{rows}</div>'
+
+@timed('html.level_info_box')
+def create_level_info_box(level):
+    """레벨 상세 페이지 오른쪽 정보 박스 HTML을 생성하는 함수"""
+    def render():
+        return LEVEL_INFO_BOX.render(
+            artist=level.artist or 'N/A',
+            detail_artist=level.detail_artist,
+            creator=level.creator or 'N/A',
+            detail_creator=level.detail_creator or 'N/A',
+            difficulty_rating=level.difficulty_label or 'N/A',
+            bpm='N/A' if level.bpm is None else level.bpm,
+            tiles='N/A' if level.tiles is None else level.tiles,
+            download_url=level.download_url or '#',
+        )
+
+    return FRAGMENTS.get_or_render(("level_info_box", *record_key(level)), render)
+
+def _news_meta(post):
+    return " · ".join(part for part in (post.date, post.author) if part)
+
+def _player_subtitle(player):
+    return " · ".join(part for part in (player.name, player.team, player.country) if part)
+
+def create_rich_content(html_text):
+    """정리된 본문 HTML(뉴스/선수 본문, 대회 설명)을 감싸는 HTML을 생성하는 함수"""
+    return RICH_CONTENT.render(html=html_text)
+
+def show_rich_content(html_text):
+    """정리된 본문 HTML을 표시하는 함수
+
+    st.markdown은 HTML 안의 빈 줄이나 들여쓴 줄(예: <pre> 코드 블록)을 다시 Markdown으로 해석하므로
+    이미 만들어 둔 HTML을 그대로 넣는 st.html을 사용합니다.
+    """
+    if html_text:
+        st.html(create_rich_content(html_text))
+
+@timed('html.news_item')
+def create_news_item(post):
+    """뉴스 목록의 항목 HTML을 생성하는 함수"""
+    def render():
+        return NEWS_ITEM.render(id_param=_id_param(post), title=post.title, meta=_news_meta(post),
+                                summary=post.summary)
+
+    return FRAGMENTS.get_or_render(("news_item", *record_key(post)), render)
+
+def create_news_meta(post):
+    """뉴스 상세 페이지의 날짜/작성자 줄 HTML을 생성하는 함수"""
+    return NEWS_META.render(meta=_news_meta(post))
+
+@timed('html.player_card')
+def create_player_card(player):
+    """선수 목록의 카드 HTML을 생성하는 함수"""
+    def render():
+        image_html = (PLAYER_IMAGE.render(src=player.profile_image_url, alt=player.nickname)
+                      if player.profile_image_url else "")
+        return PLAYER_CARD.render(id_param=_id_param(player), image_html=image_html,
+                                  nickname=player.nickname, subtitle=_player_subtitle(player))
+
+    return FRAGMENTS.get_or_render(("player_card", *record_key(player)), render)
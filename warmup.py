@@ -0,0 +1,115 @@
+# warmup.py
+#
+# 서버 시작 직후 첫 관람객이 치르던 비용을 트래픽을 받기 전에 미리 치르는 예열 단계.
+#   - 콘텐츠: 저장소(스냅샷 + 변경분 파싱) 또는 SQLite DB 동기화, 조회/검색/정렬 색인, 비슷한 레벨 표,
+#     대회별 레벨 집계, 뉴스/선수 렌더링
+#   - 에셋: 로고 이미지 읽기/Base64 인코딩, 스타일시트(글꼴 포함) 압축
+#   - HTML 조각: 네비게이션 바, 대회 카드/집계, 뉴스/선수 카드, 레벨 목록 첫 페이지의 행
+# 앱이 쓰는 것과 같은 캐시(st.cache_resource, FragmentCache, AssetRegistry)를 채우므로
+# 예열이 끝난 뒤의 첫 rerun은 캐시 적중만으로 그려집니다.
+#
+# serve.py로 띄우면 ASGI lifespan 시작 단계에서 실행되어, 예열이 끝나야 서버가 요청을 받기 시작하고
+# /readyz 가 200을 돌려줍니다. (로드 밸런서/오케스트레이터의 준비 상태 검사용)
+# streamlit run app.py 로 띄우면 app.py와 각 페이지가 부르는 start_warm_up()이 첫 세션에서 한 번만
+# 백그라운드 스레드로 예열을 시작합니다. (첫 세션은 자기에게 필요한 캐시만 기다림)
+# 예열 중에 세션이 먼저 들어와도 같은 캐시를 기다리므로 같은 작업을 두 번 하지 않습니다. (singleflight.py)
+
+import logging
+import threading
+import time
+
+import streamlit as st
+
+from dataLoad import (USE_CONTENT_DB, load_catalog, load_news, load_players, load_similar_levels, load_tournament_stats,
+                      load_tournaments)
+from ui_components import (create_level_table, create_news_item, create_player_card, create_top_nav_bar_html,
+                           create_tournament_card, create_tournament_stats, get_image_src, get_stylesheet_html)
+
+logger = logging.getLogger(__name__)
+
+STYLESHEET_FILE = 'style.css'
+
+# 네비게이션 바의 active_page 값 (홈은 '')
+NAV_PAGES = ('', 'Tournaments', 'Levels', 'News', 'Players')
+
+# 레벨 목록(전체, 대회별) 첫 페이지로 미리 렌더링해 둘 행 수 (가장 큰 페이지 크기)
+WARM_LEVEL_ROWS = 100
+
+_ready = threading.Event()
+
+
+def is_ready():
+    """예열이 끝났는지 여부"""
+    return _ready.is_set()
+
+
+def _warm_levels(catalog):
+    # 검색 없이 처음 여는 목록과 대회 필터를 고른 목록의 첫 페이지 (검색어 강조가 없는 캐시 대상 행)
+    tournament_ids = [None, *(t.id for t in catalog.tournaments)]
+    if USE_CONTENT_DB:
+        for column in ('difficulty', 'bpm', 'tiles'):
+            catalog.bounds(column)
+        pages = [catalog.query_levels(tid, '', {}, [], 1, WARM_LEVEL_ROWS)[0] for tid in tournament_ids]
+    else:
+        catalog.search_index
+        catalog.sort_index
+        pages = [catalog.levels[:WARM_LEVEL_ROWS]]
+        pages += [catalog.levels_for_tournament(tid)[:WARM_LEVEL_ROWS] for tid in tournament_ids[1:]]
+    for levels in pages:
+        create_level_table(levels)
+
+
+def warm_up():
+    """콘텐츠, 에셋, HTML 조각 캐시를 채우고 준비 상태로 바꾸는 함수 (걸린 초를 반환)"""
+    # app.py가 이 모듈을 불러오므로 경로 상수는 여기서 가져옵니다.
+    from app import LOGO_IMAGE_FILE, SMALL_LOGO_IMAGE_FILE
+
+    started = time.perf_counter()
+
+    catalog = load_catalog()
+    load_similar_levels()
+    tournaments = load_tournaments()
+    tournament_stats = load_tournament_stats()
+    news = load_news()
+    players = load_players()
+
+    get_stylesheet_html(STYLESHEET_FILE)
+    get_image_src(LOGO_IMAGE_FILE)
+    small_logo_src = get_image_src(SMALL_LOGO_IMAGE_FILE)
+
+    for page in NAV_PAGES:
+        create_top_nav_bar_html(small_logo_src, page)
+    if tournaments:
+        create_tournament_card(tournaments[0], is_highlighted=True, stats=tournament_stats.get(tournaments[0].id))
+    for tournament in tournaments:
+        stats = tournament_stats.get(tournament.id)
+        create_tournament_card(tournament, stats=stats)
+        if stats:
+            create_tournament_stats(stats)
+    for post in news:
+        create_news_item(post)
+    for player in players:
+        create_player_card(player)
+    _warm_levels(catalog)
+
+    elapsed = time.perf_counter() - started
+    _ready.set()
+    logger.info('예열 완료: 대회 %d개, 뉴스 %d개, 선수 %d개 (%.2fs)', len(tournaments), len(news), len(players), elapsed)
+    return elapsed
+
+
+def _warm_up_in_background():
+    try:
+        warm_up()
+    except Exception:
+        logger.exception('예열 실패 (캐시는 첫 요청에서 채워집니다)')
+
+
+@st.cache_resource
+def start_warm_up():
+    """예열을 프로세스당 한 번만 백그라운드 스레드로 시작하는 함수 (streamlit run app.py 용)
+
+    serve.py로 띄워 이미 예열이 끝났으면 아무것도 하지 않습니다.
+    """
+    if not is_ready():
+        threading.Thread(target=_warm_up_in_background, name='warmup', daemon=True).start()